@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark cold startup of the slide-agent CLI.
+
+Prints the slowest imports from ``python -X importtime`` and the wall-clock
+time of repeated cold ``--help`` invocations.
+
+Usage: python bench_cli_startup.py [runs]
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+
+def import_profile(module: str = "slide_agent.cli", top: int = 15) -> list[str]:
+    """Return the slowest imports (cumulative) for a cold import of ``module``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|", 2)
+        rows.append((int(cumulative_us), name.strip()))
+
+    rows.sort(reverse=True)
+    return [f"{us / 1000:8.1f} ms  {name}" for us, name in rows[:top]]
+
+
+def wall_clock(args: list[str], runs: int) -> list[float]:
+    """Run ``python args`` ``runs`` times and return the durations in seconds."""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], capture_output=True, check=False)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    print("📦 Slowest imports (cumulative):")
+    for row in import_profile():
+        print(f"  {row}")
+
+    baseline = wall_clock(["-c", "pass"], runs)
+    cli_help = wall_clock(["-m", "slide_agent.cli", "--help"], runs)
+
+    print(f"\n⏱️  Wall clock over {runs} runs:")
+    print(f"  python -c pass             median {statistics.median(baseline):.3f} s")
+    print(f"  slide-agent --help         median {statistics.median(cli_help):.3f} s")
+
+
+if __name__ == "__main__":
+    main()
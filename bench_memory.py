@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Measure peak memory per in-flight agent run with the offline fake LLM.
+
+Usage: python bench_memory.py [concurrency] [slide_count]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Runs must overlap, so every fake LLM call takes a little time
+os.environ.setdefault("LLM__PROVIDER", "fake")
+os.environ.setdefault("LLM__FAKE_LATENCY", "0.05")
+
+from slide_agent.agent_graph import run_agent_async  # noqa: E402
+from slide_agent.models import TopicRequest  # noqa: E402
+
+
+async def run_many(count: int, slide_count: int, output_dir: Path) -> None:
+    """Run ``count`` agent runs concurrently in one event loop."""
+    await asyncio.gather(
+        *(
+            run_agent_async(
+                TopicRequest(topic=f"Memory {i}", slide_count=slide_count),
+                str(output_dir / f"deck-{i}"),
+            )
+            for i in range(count)
+        )
+    )
+
+
+def peak_bytes(count: int, slide_count: int) -> int:
+    """Return the traced peak memory of ``count`` concurrent runs."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        asyncio.run(run_many(count, slide_count, Path(tmp)))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return peak - baseline
+
+
+def main() -> None:
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    slide_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    # Compile the graph and load templates before measuring
+    peak_bytes(1, slide_count)
+
+    single = peak_bytes(1, slide_count)
+    many = peak_bytes(concurrency, slide_count)
+    per_run = (many - single) / max(concurrency - 1, 1)
+
+    print(f"🧠 Peak memory of {slide_count}-slide runs (fake LLM):")
+    print(f"  {'1 run':<28} {single / 1024:10.1f} KiB")
+    print(f"  {f'{concurrency} runs in flight':<28} {many / 1024:10.1f} KiB")
+    print(f"  {'per additional run':<28} {per_run / 1024:10.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
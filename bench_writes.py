@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark aiofiles against plain buffered writes for many small files.
+
+Usage: python bench_writes.py [file_count] [file_size_bytes]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiofiles
+
+
+async def write_aiofiles(paths: list[Path], data: bytes) -> None:
+    """Write every file concurrently through aiofiles."""
+
+    async def write_one(path: Path) -> None:
+        async with aiofiles.open(path, "wb") as f:
+            await f.write(data)
+
+    await asyncio.gather(*(write_one(path) for path in paths))
+
+
+def write_buffered(paths: list[Path], data: bytes) -> None:
+    """Write every file sequentially with plain buffered I/O."""
+    for path in paths:
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+async def write_buffered_in_thread(paths: list[Path], data: bytes) -> None:
+    """Write every file with buffered I/O in a single worker thread."""
+    await asyncio.to_thread(write_buffered, paths, data)
+
+
+def measure(label: str, count: int, run) -> None:
+    """Time one strategy in a fresh directory."""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(tmp) / f"file-{i}.json" for i in range(count)]
+        start = time.perf_counter()
+        run(paths)
+        elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed * 1000:8.1f} ms  ({count / elapsed:,.0f} files/s)")
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 2048
+    data = b"x" * size
+
+    print(f"📝 Writing {count} files of {size} bytes:")
+    measure("aiofiles (gather)", count, lambda p: asyncio.run(write_aiofiles(p, data)))
+    measure("buffered (sequential)", count, lambda p: write_buffered(p, data))
+    measure(
+        "buffered (one thread)",
+        count,
+        lambda p: asyncio.run(write_buffered_in_thread(p, data)),
+    )
+
+
+if __name__ == "__main__":
+    main()
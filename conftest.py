@@ -0,0 +1,60 @@
+"""Shared pytest fixtures."""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from slide_agent import agent_graph
+
+STUB_OUTLINE = {
+    "slides": [
+        {
+            "title": "Async Intro",
+            "slide_type": "title",
+            "content_summary": "Introduction to the topic",
+            "key_points": ["Overview"],
+        },
+        {
+            "title": "Details",
+            "slide_type": "bullets",
+            "content_summary": "The important details",
+            "key_points": ["One", "Two"],
+        },
+    ]
+}
+
+
+class StubLLM:
+    """Minimal async chat model answering planner and writer prompts."""
+
+    def __init__(self, with_tools: bool = False):
+        self.with_tools = with_tools
+
+    def bind_tools(self, tools, tool_choice=None):
+        return StubLLM(with_tools=True)
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(0)
+        if self.with_tools:
+            tool_call = {
+                "name": "create_slide_outline",
+                "args": STUB_OUTLINE,
+                "id": "1",
+            }
+            return AIMessage(content="", tool_calls=[tool_call])
+        return AIMessage(content="- Generated point")
+
+
+@pytest.fixture(autouse=True)
+def run_history(tmp_path, monkeypatch):
+    """Record the runs of each test into its own history, not into slides/."""
+    path = tmp_path / ".history.sqlite"
+    monkeypatch.setenv("HISTORY__PATH", str(path))
+    return path
+
+
+@pytest.fixture
+def stub_llm(monkeypatch):
+    """Answer every LLM call of the agent graph with ``StubLLM``."""
+    monkeypatch.setattr(agent_graph, "get_llm", lambda *args, **kwargs: StubLLM())
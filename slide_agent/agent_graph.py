@@ -1,100 +1,584 @@
 """LangGraph agent workflow for Slidev slide generation."""
 
+import asyncio
+import contextlib
+import functools
+import math
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextvars import ContextVar
+from pathlib import Path
 from typing import Any
 
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import Runnable
 from langgraph.graph import END, START, StateGraph
 
-from slide_agent.config import setup_tracing
-from slide_agent.llm import get_llm
+from slide_agent import metrics
+from slide_agent.config import Settings, get_settings, setup_tracing
+from slide_agent.history import get_run_history
+from slide_agent.llm import get_llm, resolve_route
 from slide_agent.models import (
     AgentState,
     SlideDeck,
     SlideSpec,
     SlideType,
     TopicRequest,
-    create_slide_outline,
+)
+from slide_agent.retrieval import Passage, RetrievalIndex, get_retrieval_index
+from slide_agent.spans import active_recorder, recording, span, traced
+from slide_agent.streaming import OutlineStreamParser
+from slide_agent.tools import create_section_skeleton, create_slide_outline
+from slide_agent.translation import (
+    DeckTranslation,
+    parse_translation,
+    translation_messages,
 )
 from slide_agent.writers import FilesystemWriter
 
+_SLIDE_TYPE_GUIDELINES = """
+    Slide type guidelines:
+    - "title": Opening slide with topic introduction
+    - "bullets": Key concepts, benefits, explanations with bullet points
+    - "code": Programming examples, syntax demonstrations
+    - "comparison": Before/after, pros/cons, alternatives
+    - "quote": Summary, conclusion, or inspirational content
+    """
 
-def planner_node(state: AgentState) -> dict[str, Any]:
-    """Plan the slide structure based on the topic request using function calling."""
-    llm = get_llm()
-
-    # Bind the tool to the LLM with structured output
-    llm_with_tools = llm.bind_tools(
-        [create_slide_outline], tool_choice="create_slide_outline"
-    )
 
+def _planner_messages(request: TopicRequest) -> list[BaseMessage]:
+    """Build the planner prompt for a topic request."""
     system_prompt = f"""
     You are an expert presentation planner. Create a detailed outline for a slide presentation.
 
     IMPORTANT GUIDELINES:
-    - LANGUAGE: {state.request.language} - ALL TITLES AND CONTENT MUST BE IN THIS LANGUAGE!
+    - LANGUAGE: {request.language} - ALL TITLES AND CONTENT MUST BE IN THIS LANGUAGE!
     - Start with a title slide
     - Include practical examples relevant to the audience
     - Use code slides for technical topics when appropriate
     - End with summary/conclusion
     - Maximum 5 key points per slide
     - Each slide should be focused and concise
+    {_SLIDE_TYPE_GUIDELINES}"""
 
-    Slide type guidelines:
-    - "title": Opening slide with topic introduction
-    - "bullets": Key concepts, benefits, explanations with bullet points
-    - "code": Programming examples, syntax demonstrations
-    - "comparison": Before/after, pros/cons, alternatives
-    - "quote": Summary, conclusion, or inspirational content
+    user_prompt = f"""Create a {request.slide_count}-slide presentation outline about: {request.topic}
+
+    Audience: {request.audience}
+    Additional context: {request.additional_context or 'None'}
+
+    Use the create_slide_outline tool to structure your response."""
+
+    return [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
+
+
+def _outline_from_response(
+    response: AIMessage, request: TopicRequest
+) -> list[dict[str, Any]]:
+    """Convert the planner's tool call into the outline used by the pipeline."""
+    if not response.tool_calls:
+        # Fallback if no tool call was made
+        return _get_fallback_outline(request)
+
+    tool_call = response.tool_calls[0]
+    # Execute the tool to get the validated outline
+    tool_result = create_slide_outline.invoke(tool_call["args"])
+
+    # Convert to the expected format for the rest of the pipeline
+    return [_outline_entry(slide) for slide in tool_result.get("slides", [])]
+
+
+def _planned_outline(
+    response: AIMessage | None, request: TopicRequest
+) -> list[dict[str, Any]]:
+    """Validate the planner response, or fall back when it is missing or invalid.
+
+    Failed LLM calls leave no response; they are already counted as
+    ``llm.planner`` failures by ``_llm_call``.
     """
+    if response is not None:
+        try:
+            return _outline_from_response(response, request)
+        except Exception as e:
+            print(f"Invalid outline: {e}")
+            metrics.FAILURES.inc(stage="planner", cause=type(e).__name__)
+    return _get_fallback_outline(request)
+
 
-    user_prompt = f"""Create a {state.request.slide_count}-slide presentation outline about: {state.request.topic}
+def _outline_entry(slide: dict[str, Any]) -> dict[str, Any]:
+    """Convert a validated tool slide into an outline entry."""
+    return {
+        "title": slide.get("title", ""),
+        "slide_type": slide.get("slide_type", "bullets"),
+        "content_summary": slide.get("content_summary", ""),
+        "content_points": slide.get("key_points", []),
+        "notes": slide.get("notes", ""),
+    }
 
-    Audience: {state.request.audience}
-    Additional context: {state.request.additional_context or 'None'}
+
+def _planner_result(outline: list[dict[str, Any]]) -> dict[str, Any]:
+    """Build the state update returned by the planner nodes."""
+    # The raw planner response stays out of the state, the outline has it all
+    return {
+        "outline": outline,
+        "metadata": {"planned_slides": len(outline), "used_function_calling": True},
+    }
+
+
+def _planner_llm() -> Runnable[Any, Any]:
+    """Get the LLM bound to the outline tool."""
+    # Bind the tool to the LLM with structured output
+    return get_llm("planner", settings=_settings()).bind_tools(
+        [create_slide_outline], tool_choice="create_slide_outline"
+    )
+
+
+class _LLMCall:
+    """Bookkeeping of one LLM call: route, token usage and cost."""
+
+    def __init__(self, node: str, slide_type: str, llm_span: Any) -> None:
+        self.node = node
+        self.slide_type = slide_type
+        self.route = resolve_route(node, slide_type or None, _settings())
+        self.span = llm_span
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cost = 0.0
+        self.cache_hit = False
+
+    def record(self, response: Any) -> None:
+        """Account the token usage of the response and its cost."""
+        metadata = getattr(response, "response_metadata", None) or {}
+        self.cache_hit = bool(metadata.get("cache_hit"))
+        if self.span is not None and self.cache_hit:
+            self.span.set(cache_hit=True)
+        usage = getattr(response, "usage_metadata", None)
+        if not usage:
+            return
+        self.input_tokens = usage.get("input_tokens", 0)
+        self.output_tokens = usage.get("output_tokens", 0)
+        self.cost = (
+            self.input_tokens * self.route.input_cost_per_1k
+            + self.output_tokens * self.route.output_cost_per_1k
+        ) / 1000
+
+        model = self.route.model
+        metrics.LLM_TOKENS.inc(self.input_tokens, node=self.node, kind="input")
+        metrics.LLM_TOKENS.inc(self.output_tokens, node=self.node, kind="output")
+        metrics.LLM_COST.inc(self.cost, node=self.node, model=model)
+        if self.span is not None:
+            self.span.set(
+                input_tokens=self.input_tokens,
+                output_tokens=self.output_tokens,
+                cost_usd=self.cost,
+            )
+
+
+# Per-run LLM statistics by route, shared by all tasks of a run
+_route_stats: ContextVar[dict[str, dict[str, Any]] | None] = ContextVar(
+    "slide_agent_route_stats", default=None
+)
+
+
+class _Deadline:
+    """Latency budget of a run and the slides still being written after it."""
+
+    def __init__(self, seconds: float) -> None:
+        self.expires_at = time.monotonic() + seconds
+        # Slide number -> task writing the slide that replaces its placeholder
+        self.pending: dict[int, asyncio.Task[SlideSpec]] = {}
+
+    def remaining(self) -> float:
+        """Seconds left until the deck has to be written."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+
+_run_deadline: ContextVar[_Deadline | None] = ContextVar(
+    "slide_agent_run_deadline", default=None
+)
+
+# Wall time per graph node of the current run
+_node_seconds: ContextVar[dict[str, float] | None] = ContextVar(
+    "slide_agent_node_seconds", default=None
+)
+
+# Settings of the current run, read from the environment once per run
+_run_settings: ContextVar[Settings | None] = ContextVar(
+    "slide_agent_run_settings", default=None
+)
+
+# Background backfills by output path, see ``wait_for_backfill``
+_backfill_tasks: dict[str, asyncio.Task[dict[str, Any]]] = {}
+
+
+def _settings() -> Settings:
+    """Return the settings of the current run, or read them outside a run."""
+    return _run_settings.get() or get_settings()
+
+
+@contextlib.contextmanager
+def _llm_call(node: str, slide_type: str = "", **attributes: Any) -> Iterator[_LLMCall]:
+    """Trace an LLM call of a graph node and record its latency and cost."""
+    start = time.perf_counter()
+    with span("llm.invoke", role=node, **attributes) as llm_span:
+        call = _LLMCall(node, slide_type, llm_span)
+        if llm_span is not None:
+            llm_span.set(model=call.route.model)
+        try:
+            yield call
+        except Exception as e:
+            metrics.FAILURES.inc(stage=f"llm.{node}", cause=type(e).__name__)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.LLM_LATENCY.observe(
+                elapsed, node=node, slide_type=slide_type, model=call.route.model
+            )
+            _add_route_stats(call, elapsed)
+
+
+def _add_route_stats(call: _LLMCall, elapsed: float) -> None:
+    """Add a finished call to the statistics of the current run."""
+    stats = _route_stats.get()
+    if stats is None:
+        return
+    key = f"{call.node}:{call.slide_type}" if call.slide_type else call.node
+    route = stats.setdefault(
+        key,
+        {
+            "model": call.route.model,
+            "calls": 0,
+            "cache_hits": 0,
+            "latency_seconds": 0.0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cost_usd": 0.0,
+        },
+    )
+    route["calls"] += 1
+    route["cache_hits"] += call.cache_hit
+    route["latency_seconds"] += elapsed
+    route["input_tokens"] += call.input_tokens
+    route["output_tokens"] += call.output_tokens
+    route["cost_usd"] += call.cost
+
+
+def planner_node(state: AgentState) -> dict[str, Any]:
+    """Plan the slide structure; runs ``planner_node_async`` in a new event loop."""
+    return asyncio.run(planner_node_async(state))
+
+
+@traced("node.planner")
+async def planner_node_async(state: AgentState) -> dict[str, Any]:
+    """Plan the slide structure based on the topic request using function calling.
+
+    Decks of ``agent.hierarchical_planning_from`` slides or more are planned
+    section by section, see ``_hierarchical_planner``.
+    """
+    agent_settings = _settings().agent
+    if state.request.slide_count >= agent_settings.hierarchical_planning_from:
+        return await _hierarchical_planner(state)
+    # Under a deadline slides are written by the slide writer, which enforces it.
+    # Streamed calls bypass the response cache, so cached runs plan in one call.
+    if (
+        agent_settings.speculative_writing
+        and _run_deadline.get() is None
+        and not _settings().cache.enabled
+    ):
+        return await _speculative_planner(state)
+
+    response = None
+    try:
+        with _llm_call("planner") as call:
+            response = await _planner_llm().ainvoke(_planner_messages(state.request))
+            call.record(response)
+    except Exception as e:
+        print(f"Function calling failed: {e}")
+    outline = _planned_outline(response, state.request)
+
+    return _planner_result(outline)
+
+
+def _discard(task: asyncio.Task[Any]) -> None:
+    """Cancel a speculative task and retrieve its result once it is done.
+
+    A task may still fail while it is being cancelled; retrieving the
+    exception keeps asyncio from logging it as never retrieved.
+    """
+    task.cancel()
+    task.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+
+async def _speculative_planner(state: AgentState) -> dict[str, Any]:
+    """Plan with a streamed tool call and write slides as soon as they appear.
+
+    Every slide entry completed in the streamed arguments is dispatched to
+    the writer right away, so planning and writing overlap. Once the outline
+    is final, speculative slides whose entry matches the validated outline
+    are kept, the others are cancelled and written again.
+    """
+    semaphore = asyncio.Semaphore(_settings().agent.max_parallel_slides)
+    parser = OutlineStreamParser()
+    speculative: list[tuple[dict[str, Any], asyncio.Task[SlideSpec]]] = []
+
+    response = None
+    try:
+        with _llm_call("planner", streamed=True) as call:
+            async for chunk in _planner_llm().astream(_planner_messages(state.request)):
+                response = chunk if response is None else response + chunk
+                for call_chunk in chunk.tool_call_chunks:
+                    if call_chunk.get("index", 0) != 0:
+                        continue
+                    for slide in parser.feed(call_chunk.get("args") or ""):
+                        validated = create_slide_outline.invoke({"slides": [slide]})
+                        entry = _outline_entry(validated["slides"][0])
+                        task = asyncio.create_task(
+                            _write_slide(semaphore, entry, state.request)
+                        )
+                        speculative.append((entry, task))
+            call.record(response)
+    except Exception as e:
+        print(f"Function calling failed: {e}")
+        # A partial stream is no outline, fall back like a failed call
+        response = None
+    outline = _planned_outline(response, state.request)
+
+    tasks = []
+    kept = 0
+    for index, entry in enumerate(outline):
+        if index < len(speculative) and speculative[index][0] == entry:
+            tasks.append(speculative[index][1])
+            kept += 1
+        else:
+            if index < len(speculative):
+                _discard(speculative[index][1])
+            tasks.append(
+                asyncio.create_task(_write_slide(semaphore, entry, state.request))
+            )
+    for _, task in speculative[len(outline) :]:
+        _discard(task)
+
+    result = _planner_result(outline)
+    try:
+        result["slides"] = list(await asyncio.gather(*tasks))
+    except BaseException:
+        # Stop the other slides instead of leaving them running unobserved
+        for task in tasks:
+            _discard(task)
+        raise
+    result["metadata"]["speculative_slides"] = kept
+    return result
+
+
+def _skeleton_messages(request: TopicRequest, section_count: int) -> list[BaseMessage]:
+    """Build the prompt splitting a large deck into sections."""
+    topic = request.topic
+    system_prompt = f"""
+    You are an expert presentation planner. Split a long presentation into sections.
+
+    IMPORTANT GUIDELINES:
+    - LANGUAGE: {request.language} - ALL TITLES AND SUMMARIES MUST BE IN THIS LANGUAGE!
+    - About {section_count} sections that build on each other
+    - The first section opens with the title slide, the last one ends with the summary
+    - The slide counts of all sections add up to exactly {request.slide_count}
+    """
+
+    user_prompt = f"""Split a {request.slide_count}-slide presentation about: {topic}
+    into sections.
+
+    Audience: {request.audience}
+    Additional context: {request.additional_context or 'None'}
+
+    Use the create_section_skeleton tool to structure your response."""
+
+    return [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
+
+
+def _section_messages(
+    request: TopicRequest, sections: list[dict[str, Any]], index: int
+) -> list[BaseMessage]:
+    """Build the planner prompt for one section of a large deck."""
+    section = sections[index]
+    slide_count, topic = section["slide_count"], request.topic
+    position = []
+    if index == 0:
+        position.append("- This is the first section: start with the title slide")
+    if index == len(sections) - 1:
+        position.append("- This is the last section: end with summary/conclusion")
+    if not position:
+        position.append("- Do not add title or summary slides")
+    overview = "\n".join(
+        f"    {number}. {other['title']}: {other['summary']}"
+        for number, other in enumerate(sections, 1)
+    )
+
+    system_prompt = f"""
+    You are an expert presentation planner. Create a detailed outline for one
+    section of a longer slide presentation.
+
+    IMPORTANT GUIDELINES:
+    - LANGUAGE: {request.language} - ALL TITLES AND CONTENT MUST BE IN THIS LANGUAGE!
+    {chr(10).join(position)}
+    - Cover only this section, the other sections are planned separately
+    - Include practical examples relevant to the audience
+    - Use code slides for technical topics when appropriate
+    - Maximum 5 key points per slide
+    - Each slide should be focused and concise
+    {_SLIDE_TYPE_GUIDELINES}"""
+
+    user_prompt = f"""Create a {slide_count}-slide presentation outline about: {topic}
+    Section {index + 1} of {len(sections)}: {section['title']} - {section['summary']}
+
+    All sections:
+{overview}
+
+    Audience: {request.audience}
+    Additional context: {request.additional_context or 'None'}
 
     Use the create_slide_outline tool to structure your response."""
 
+    return [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
+
+
+async def _hierarchical_planner(state: AgentState) -> dict[str, Any]:
+    """Plan a large deck as a section skeleton and parallel section outlines.
+
+    A single outline call for many slides is slow and often truncated. The
+    skeleton call only names the sections and their slide counts; the
+    sections are then outlined concurrently and merged in order.
+    """
+    request = state.request
+    agent_settings = _settings().agent
+    section_count = math.ceil(request.slide_count / agent_settings.slides_per_section)
+
+    sections: list[dict[str, Any]] = []
+    response = None
     try:
-        response = llm_with_tools.invoke(
-            [SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)]
+        with _llm_call("planner", phase="skeleton") as call:
+            llm = get_llm("planner", settings=_settings()).bind_tools(
+                [create_section_skeleton], tool_choice="create_section_skeleton"
+            )
+            response = await llm.ainvoke(_skeleton_messages(request, section_count))
+            call.record(response)
+    except Exception as e:
+        print(f"Section planning failed: {e}")
+    if response is not None and response.tool_calls:
+        try:
+            skeleton = create_section_skeleton.invoke(response.tool_calls[0]["args"])
+            sections = skeleton["sections"]
+        except Exception as e:
+            print(f"Invalid section skeleton: {e}")
+            metrics.FAILURES.inc(stage="planner", cause=type(e).__name__)
+
+    sections = _balance_sections(sections, request, section_count)
+    semaphore = asyncio.Semaphore(agent_settings.max_parallel_slides)
+    section_outlines = await asyncio.gather(
+        *(
+            _plan_section(semaphore, request, sections, index)
+            for index in range(len(sections))
         )
+    )
 
-        # Extract the tool call result
-        if response.tool_calls:
-            tool_call = response.tool_calls[0]
-            # Execute the tool to get the validated outline
-            tool_result = create_slide_outline.invoke(tool_call["args"])
-
-            # Convert to the expected format for the rest of the pipeline
-            outline = []
-            for slide in tool_result.get("slides", []):
-                slide_dict = {
-                    "title": slide.get("title", ""),
-                    "slide_type": slide.get("slide_type", "bullets"),
-                    "content_summary": slide.get("content_summary", ""),
-                    "content_points": slide.get("key_points", []),
-                    "notes": slide.get("notes", ""),
-                }
-                outline.append(slide_dict)
-        else:
-            # Fallback if no tool call was made
-            outline = _get_fallback_outline(state.request)
+    result = _planner_result(_merge_sections(section_outlines))
+    result["metadata"]["planned_sections"] = [
+        {"title": section["title"], "slide_count": section["slide_count"]}
+        for section in sections
+    ]
+    return result
+
+
+def _balance_sections(
+    sections: list[dict[str, Any]], request: TopicRequest, section_count: int
+) -> list[dict[str, Any]]:
+    """Make the section slide counts add up to the requested slide count.
+
+    Counts are scaled proportionally (largest remainder); without a usable
+    skeleton the deck is split into ``section_count`` equal parts.
+    """
+    total_slides = request.slide_count
+    if not sections:
+        sections = [
+            {"title": f"{request.topic} ({number})", "summary": "", "slide_count": 1}
+            for number in range(1, section_count + 1)
+        ]
+    sections = sections[:total_slides]
+
+    weights = [section["slide_count"] for section in sections]
+    exact = [weight * total_slides / sum(weights) for weight in weights]
+    counts = [max(1, int(value)) for value in exact]
+    while sum(counts) < total_slides:
+        index = max(range(len(counts)), key=lambda i: exact[i] - counts[i])
+        counts[index] += 1
+    while sum(counts) > total_slides:
+        index = max(range(len(counts)), key=lambda i: counts[i] - exact[i])
+        if counts[index] == 1:
+            index = counts.index(max(counts))
+        counts[index] -= 1
+
+    return [
+        {**section, "slide_count": count} for section, count in zip(sections, counts)
+    ]
 
+
+async def _plan_section(
+    semaphore: asyncio.Semaphore,
+    request: TopicRequest,
+    sections: list[dict[str, Any]],
+    index: int,
+) -> list[dict[str, Any]]:
+    """Outline one section with exactly its planned number of slides."""
+    section = sections[index]
+    entries: list[dict[str, Any]] = []
+    response = None
+    try:
+        async with semaphore:
+            with _llm_call(
+                "planner", phase="section", section=section["title"]
+            ) as call:
+                response = await _planner_llm().ainvoke(
+                    _section_messages(request, sections, index)
+                )
+                call.record(response)
     except Exception as e:
-        print(f"Function calling failed: {e}")
-        # Use fallback outline on any error
-        outline = _get_fallback_outline(state.request)
+        print(f"Planning section {section['title']!r} failed: {e}")
+    if response is not None and response.tool_calls:
+        try:
+            entries = _outline_from_response(response, request)
+        except Exception as e:
+            print(f"Invalid outline for section {section['title']!r}: {e}")
+            metrics.FAILURES.inc(stage="planner.section", cause=type(e).__name__)
+
+    entries = entries[: section["slide_count"]]
+    # Fill up short or failed sections so the deck keeps its slide count
+    for number in range(len(entries) + 1, section["slide_count"] + 1):
+        entries.append(
+            {
+                "title": (
+                    section["title"]
+                    if number == 1
+                    else f"{section['title']} ({number})"
+                ),
+                "slide_type": "bullets",
+                "content_summary": section["summary"],
+                "content_points": [section["summary"] or section["title"]],
+                "notes": "",
+            }
+        )
+    return [{**entry, "section": section["title"]} for entry in entries]
 
-    return {
-        "outline": outline,
-        "metadata": {
-            "planner_response": getattr(
-                response, "content", "Generated using function calling"
-            ),
-            "planned_slides": len(outline),
-            "used_function_calling": True,
-        },
-    }
+
+def _merge_sections(
+    section_outlines: list[list[dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """Concatenate the section outlines and number the slides of the deck."""
+    outline = [entry for entries in section_outlines for entry in entries]
+    for number, entry in enumerate(outline, 1):
+        entry["number"] = number
+        # Only the opening slide of the deck is a title slide
+        if number == 1:
+            entry["slide_type"] = "title"
+        elif entry["slide_type"] == "title":
+            entry["slide_type"] = "bullets"
+    return outline
 
 
 def _get_fallback_outline(request: TopicRequest) -> list[dict[str, Any]]:
@@ -185,100 +669,232 @@ def _get_fallback_outline(request: TopicRequest) -> list[dict[str, Any]]:
         ]
 
 
+def _retrieval_index() -> RetrievalIndex | None:
+    """Return the course material index when RAG citations are enabled."""
+    workflow = _settings().workflow
+    if not workflow.enable_rag_citations:
+        return None
+    return get_retrieval_index(workflow.rag_source_dir, workflow.rag_index_dir)
+
+
+def _grounding_passages(
+    slide_data: dict[str, Any], request: TopicRequest
+) -> list[Passage]:
+    """Retrieve the course material passages that best match a slide."""
+    index = _retrieval_index()
+    if index is None:
+        return []
+    query = " ".join(
+        [slide_data["title"], *slide_data.get("content_points", []), request.topic]
+    )
+    with span("retrieval.search", slide=slide_data["title"]):
+        return index.search(query, _settings().workflow.rag_passages_per_slide)
+
+
+def _slide_writer_messages(
+    slide_data: dict[str, Any],
+    request: TopicRequest,
+    passages: Sequence[Passage] = (),
+) -> list[BaseMessage]:
+    """Build the writer prompt for a single outline entry."""
+    slide_type = SlideType(slide_data["slide_type"])
+
+    prompt = f"""
+    Create slide content for a {slide_type.value} slide.
+    Title: {slide_data["title"]}
+    Content points: {slide_data["content_points"]}
+
+    Topic context: {request.topic}
+    Audience: {request.audience}
+    LANGUAGE: {request.language} - ALL CONTENT MUST BE IN THIS LANGUAGE!
+
+    IMPORTANT CONTENT LIMITS:
+    - Maximum 10 lines per slide total
+    - Maximum 5 bullet points per slide
+    - Each bullet point: maximum 1 line of text
+    - NO nested bullet points (no sub-bullets with indentation)
+    - Keep explanations concise and focused
+    - Avoid lengthy paragraphs
+    - Use clear, simple language
+
+    For code slides:
+    - Include only essential code snippets (max 10 lines)
+    - CRITICAL: Format code blocks correctly. NEVER concatenate language with code!
+    - Use ONLY these exact language names: python, javascript, java, cpp, c, sql, bash, html, css, json, yaml, xml
+    - ALWAYS use this exact format: ```python<newline>def function():<newline>    pass<newline>```
+    - NEVER write: ```pythondef or ```python# or ```pythonimport
+    - ALWAYS write: ```python<newline>def or ```python<newline># or ```python<newline>import
+    For title slides:
+    - Use simple, single-level bullet points only
+    - NO nested or indented sub-bullets
+    - Maximum 5 simple bullet points
+    - Each bullet should be one clear, short statement
+    - Focus on overview, importance, and what audience will learn
+    For bullet slides: Focus on key concepts only
+    For comparison slides: Keep comparisons brief and clear
+    For quote slides:
+    - Create an inspiring summary or conclusion
+    - Use format: Clear statements without quotation marks
+    - End with a memorable phrase or call-to-action
+    - NO code blocks, NO complex formatting
+    - Focus on key takeaways and future outlook
+
+    Generate appropriate content for this slide type.
+    Keep it concise, engaging, and within the limits above.
+    """
+    if passages:
+        excerpts = "\n\n".join(
+            f"[{number}] {passage.citation}:\n{passage.text}"
+            for number, passage in enumerate(passages, 1)
+        )
+        prompt += f"""
+    Base the slide on these excerpts from the course material and do not
+    contradict them:
+
+{excerpts}
+    """
+
+    return [
+        SystemMessage(content=prompt),
+        HumanMessage(content=f"Generate content for: {slide_data['title']}"),
+    ]
+
+
+def _slide_from_response(
+    slide_data: dict[str, Any],
+    response: AIMessage,
+    request: TopicRequest,
+    passages: Sequence[Passage] = (),
+) -> SlideSpec:
+    """Create the slide specification from the writer's response."""
+    notes = f"Generated for topic: {request.topic}"
+    if passages:
+        sources = dict.fromkeys(passage.citation for passage in passages)
+        notes += "\nSources: " + "; ".join(sources)
+    return SlideSpec(
+        title=slide_data["title"],
+        slide_type=SlideType(slide_data["slide_type"]),
+        content=response.content,
+        notes=notes[:1000],
+    )
+
+
 def slide_writer_node(state: AgentState) -> dict[str, Any]:
-    """Generate individual slides based on the outline."""
+    """Generate the slides; runs ``slide_writer_node_async`` in a new event loop."""
+    return asyncio.run(slide_writer_node_async(state))
+
+
+@traced("node.slide_writer")
+async def slide_writer_node_async(state: AgentState) -> dict[str, Any]:
+    """Generate all slides of the outline concurrently."""
     if not state.outline:
         return {"error": "No outline available for slide generation"}
 
-    llm = get_llm()
+    if state.slides and len(state.slides) == len(state.outline):
+        # Already written speculatively while the planner was streaming
+        return {}
+
+    semaphore = asyncio.Semaphore(_settings().agent.max_parallel_slides)
+    deadline = _run_deadline.get()
+    if deadline is not None:
+        return await _write_slides_until(deadline, semaphore, state)
+
+    slides = await asyncio.gather(
+        *(_write_slide(semaphore, data, state.request) for data in state.outline)
+    )
+
+    return {"slides": list(slides)}
+
+
+async def _write_slides_until(
+    deadline: _Deadline, semaphore: asyncio.Semaphore, state: AgentState
+) -> dict[str, Any]:
+    """Write the slides that finish before the deadline, placeholders for the rest.
+
+    Slides still being written keep running in ``deadline.pending``; slides
+    that failed are written once more in the background.
+    """
+    assert state.outline is not None
+    tasks = [
+        asyncio.create_task(_write_slide(semaphore, data, state.request))
+        for data in state.outline
+    ]
+    await asyncio.wait(tasks, timeout=deadline.remaining())
+
     slides = []
+    for number, (slide_data, task) in enumerate(zip(state.outline, tasks), 1):
+        if task.done() and not task.cancelled() and task.exception() is None:
+            slides.append(task.result())
+            continue
+        if task.done():
+            error = None if task.cancelled() else task.exception()
+            print(f"Slide {number} failed, retrying in the background: {error!r}")
+            cause = type(error).__name__ if error else "CancelledError"
+            metrics.FAILURES.inc(stage="slide_writer", cause=cause)
+            task = asyncio.create_task(
+                _write_slide(semaphore, slide_data, state.request)
+            )
+        deadline.pending[number] = task
+        slides.append(_placeholder_slide(slide_data, state.request))
 
-    for slide_data in state.outline:
-        slide_type = SlideType(slide_data["slide_type"])
-
-        prompt = f"""
-        Create slide content for a {slide_type.value} slide.
-        Title: {slide_data["title"]}
-        Content points: {slide_data["content_points"]}
-
-        Topic context: {state.request.topic}
-        Audience: {state.request.audience}
-        LANGUAGE: {state.request.language} - ALL CONTENT MUST BE IN THIS LANGUAGE!
-
-        IMPORTANT CONTENT LIMITS:
-        - Maximum 10 lines per slide total
-        - Maximum 5 bullet points per slide
-        - Each bullet point: maximum 1 line of text
-        - NO nested bullet points (no sub-bullets with indentation)
-        - Keep explanations concise and focused
-        - Avoid lengthy paragraphs
-        - Use clear, simple language
-
-        For code slides:
-        - Include only essential code snippets (max 10 lines)
-        - CRITICAL: Format code blocks correctly. NEVER concatenate language with code!
-        - Use ONLY these exact language names: python, javascript, java, cpp, c, sql, bash, html, css, json, yaml, xml
-        - ALWAYS use this exact format: ```python<newline>def function():<newline>    pass<newline>```
-        - NEVER write: ```pythondef or ```python# or ```pythonimport
-        - ALWAYS write: ```python<newline>def or ```python<newline># or ```python<newline>import
-        For title slides:
-        - Use simple, single-level bullet points only
-        - NO nested or indented sub-bullets
-        - Maximum 5 simple bullet points
-        - Each bullet should be one clear, short statement
-        - Focus on overview, importance, and what audience will learn
-        For bullet slides: Focus on key concepts only
-        For comparison slides: Keep comparisons brief and clear
-        For quote slides:
-        - Create an inspiring summary or conclusion
-        - Use format: Clear statements without quotation marks
-        - End with a memorable phrase or call-to-action
-        - NO code blocks, NO complex formatting
-        - Focus on key takeaways and future outlook
-
-        Generate appropriate content for this slide type.
-        Keep it concise, engaging, and within the limits above.
-        """
-
-        response = llm.invoke(
-            [
-                SystemMessage(content=prompt),
-                HumanMessage(content=f"Generate content for: {slide_data['title']}"),
-            ]
-        )
+    return {
+        "slides": slides,
+        "metadata": {"placeholder_slides": sorted(deadline.pending)},
+    }
 
-        slide = SlideSpec(
-            title=slide_data["title"],
-            slide_type=slide_type,
-            content=response.content,
-            notes=f"Generated for topic: {state.request.topic}",
-        )
-        slides.append(slide)
 
-    return {"slides": slides}
+async def _write_slide(
+    semaphore: asyncio.Semaphore,
+    slide_data: dict[str, Any],
+    request: TopicRequest,
+) -> SlideSpec:
+    """Generate one slide with the model routed for its type."""
+    llm = get_llm("slide_writer", slide_data["slide_type"], _settings())
+    passages = _grounding_passages(slide_data, request)
+    async with semaphore:
+        with _llm_call(
+            "slide_writer", slide_data["slide_type"], slide=slide_data["title"]
+        ) as call:
+            response = await llm.ainvoke(
+                _slide_writer_messages(slide_data, request, passages)
+            )
+            call.record(response)
+    return _slide_from_response(slide_data, response, request, passages)
 
 
-def reviewer_node(state: AgentState) -> dict[str, Any]:
-    """Review and finalize the slide deck."""
-    if not state.slides:
-        return {"error": "No slides available for review"}
+def _placeholder_slide(slide_data: dict[str, Any], request: TopicRequest) -> SlideSpec:
+    """Stand in for a slide that missed the deadline, built from its outline entry."""
+    points = slide_data.get("content_points") or [slide_data["title"]]
+    return SlideSpec(
+        title=slide_data["title"],
+        slide_type=SlideType(slide_data["slide_type"]),
+        content="\n".join(f"- {point}" for point in points)[:4000],
+        notes=f"Placeholder for topic: {request.topic}",
+    )
 
-    llm = get_llm()
 
-    # Create the final deck
-    deck = SlideDeck(
+def _build_deck(state: AgentState) -> SlideDeck:
+    """Assemble the final deck from the generated slides."""
+    metadata = {
+        "generated_by": "slidev-agent",
+        "topic": state.request.topic,
+        "audience": state.request.audience,
+        "slide_count": len(state.slides),
+        "language": state.request.language,
+    }
+    if state.metadata.get("placeholder_slides"):
+        metadata["placeholder_slides"] = state.metadata["placeholder_slides"]
+    return SlideDeck(
         title=f"Presentation: {state.request.topic}",
         subtitle=f"For {state.request.audience} audience",
         theme=state.request.theme,
         slides=state.slides,
-        metadata={
-            "generated_by": "slidev-agent",
-            "topic": state.request.topic,
-            "slide_count": len(state.slides),
-            "language": state.request.language,
-        },
+        metadata=metadata,
     )
 
+
+def _review_messages(deck: SlideDeck) -> list[BaseMessage]:
+    """Build the reviewer prompt for a deck."""
     # Simple quality check
     review_prompt = f"""
     Review this slide deck outline:
@@ -289,51 +905,117 @@ def reviewer_node(state: AgentState) -> dict[str, Any]:
     Rate the quality and provide brief feedback.
     """
 
-    review = llm.invoke(
-        [
-            SystemMessage(content=review_prompt),
-            HumanMessage(content="Please review this presentation structure."),
-        ]
-    )
+    return [
+        SystemMessage(content=review_prompt),
+        HumanMessage(content="Please review this presentation structure."),
+    ]
+
 
+def _review_result(deck: SlideDeck, review: AIMessage) -> dict[str, Any]:
+    """Build the state update returned by the reviewer nodes."""
     return {
-        "deck": deck,
         "metadata": {
-            **state.metadata,
             "review_feedback": review.content,
             "final_slide_count": len(deck.slides),
         },
     }
 
 
+def reviewer_node(state: AgentState) -> dict[str, Any]:
+    """Review the deck; runs ``reviewer_node_async`` in a new event loop."""
+    return asyncio.run(reviewer_node_async(state))
+
+
+@traced("node.reviewer")
+async def reviewer_node_async(state: AgentState) -> dict[str, Any]:
+    """Review and finalize the slide deck.
+
+    Under a deadline the review is skipped once the deadline has passed.
+    """
+    if not state.slides:
+        return {"error": "No slides available for review"}
+
+    deck = _build_deck(state)
+    deadline = _run_deadline.get()
+    skipped = {"review_skipped": True, "final_slide_count": len(deck.slides)}
+    if deadline is not None and not deadline.remaining():
+        return {"metadata": skipped}
+    try:
+        with _llm_call("reviewer") as call:
+            review = await asyncio.wait_for(
+                get_llm("reviewer", settings=_settings()).ainvoke(
+                    _review_messages(deck)
+                ),
+                deadline.remaining() if deadline is not None else None,
+            )
+            call.record(review)
+    except TimeoutError:
+        return {"metadata": skipped}
+
+    return _review_result(deck, review)
+
+
+def _writer_result(result: dict[str, Any]) -> dict[str, Any]:
+    """Build the state update returned by the filesystem writer nodes."""
+    return {
+        "metadata": {
+            "filesystem_result": result,
+            "slides_written": True,
+            "output_path": result["output_path"],
+        }
+    }
+
+
 def filesystem_writer_node(state: AgentState) -> dict[str, Any]:
-    """Write the slide deck to filesystem."""
-    if not state.deck:
-        return {"error": "No deck available for writing"}
+    """Write the deck; runs ``filesystem_writer_node_async`` in a new event loop."""
+    return asyncio.run(filesystem_writer_node_async(state))
 
-    writer = FilesystemWriter()
+
+@traced("node.filesystem_writer")
+async def filesystem_writer_node_async(state: AgentState) -> dict[str, Any]:
+    """Write the slide deck to the filesystem on the running loop."""
+    if not state.slides:
+        return {"error": "No slides available for writing"}
+
+    writer = FilesystemWriter(workspace=state.metadata.get("workspace"))
 
     # Determine output directory from metadata or use default
     output_dir = state.metadata.get("output_dir")
 
     try:
-        # Write deck synchronously for now
-        result = writer.write_deck_sync(state.deck, output_dir)
-
+        result = await writer.write_deck(
+            _build_deck(state), output_dir, outline=state.outline
+        )
+        return _writer_result(result)
+    except Exception as e:
+        metrics.FAILURES.inc(stage="write", cause=type(e).__name__)
         return {
-            "metadata": {
-                **state.metadata,
-                "filesystem_result": result,
-                "slides_written": True,
-                "output_path": result["output_path"],
-            }
+            "error": f"Failed to write slides: {str(e)}",
+            "metadata": {"error_cause": type(e).__name__},
         }
-    except Exception as e:
-        return {"error": f"Failed to write slides: {str(e)}"}
+
+
+def _timed_node(name: str, node: Callable[..., Any]) -> Callable[..., Any]:
+    """Record the wall time of a graph node for the run history."""
+
+    @functools.wraps(node)
+    async def timed(state: AgentState) -> Any:
+        start = time.perf_counter()
+        try:
+            return await node(state)
+        finally:
+            seconds = _node_seconds.get()
+            if seconds is not None:
+                seconds[name] = seconds.get(name, 0.0) + time.perf_counter() - start
+
+    return timed
 
 
 def create_agent_graph() -> StateGraph:
-    """Create and configure the LangGraph workflow."""
+    """Create and configure the LangGraph workflow.
+
+    The graph uses the async nodes and must be run with ``ainvoke``.
+    """
     # Setup tracing
     setup_tracing()
 
@@ -341,10 +1023,15 @@ def create_agent_graph() -> StateGraph:
     workflow = StateGraph(AgentState)
 
     # Add nodes
-    workflow.add_node("planner", planner_node)
-    workflow.add_node("slide_writer", slide_writer_node)
-    workflow.add_node("reviewer", reviewer_node)
-    workflow.add_node("filesystem_writer", filesystem_writer_node)
+    workflow.add_node("planner", _timed_node("planner", planner_node_async))
+    workflow.add_node(
+        "slide_writer", _timed_node("slide_writer", slide_writer_node_async)
+    )
+    workflow.add_node("reviewer", _timed_node("reviewer", reviewer_node_async))
+    workflow.add_node(
+        "filesystem_writer",
+        _timed_node("filesystem_writer", filesystem_writer_node_async),
+    )
 
     # Define the flow
     workflow.add_edge(START, "planner")
@@ -356,26 +1043,330 @@ def create_agent_graph() -> StateGraph:
     return workflow.compile()
 
 
-def run_agent(topic_request: TopicRequest, output_dir: str = None) -> AgentState:
-    """Run the slide generation agent workflow."""
-    graph = create_agent_graph()
+async def translate_deck_async(deck: SlideDeck, language: str) -> SlideDeck:
+    """Translate a generated deck into ``language``, leaving code untouched.
+
+    The texts of ``workflow.translation_batch_slides`` slides go into one
+    JSON request, so a translation costs a few calls instead of a full run.
+    """
+    settings = _settings()
+    translation = DeckTranslation(deck)
+    source_language = deck.metadata.get("language") or "en"
+    llm = get_llm("translator", settings=settings)
+    semaphore = asyncio.Semaphore(settings.agent.max_parallel_slides)
+
+    async def translate(batch: dict[str, str]) -> dict[str, str]:
+        async with semaphore:
+            with _llm_call("translator", language=language, texts=len(batch)) as call:
+                response = await llm.ainvoke(
+                    translation_messages(batch, source_language, language)
+                )
+                call.record(response)
+        return parse_translation(str(response.content), batch)
+
+    batches = translation.batches(settings.workflow.translation_batch_slides)
+    results = await asyncio.gather(*(translate(batch) for batch in batches))
+    return translation.apply(
+        {key: text for result in results for key, text in result.items()}, language
+    )
+
+
+async def _write_translations(
+    deck: SlideDeck,
+    languages: list[str],
+    output_path: str,
+    workspace: bool | None = None,
+) -> tuple[dict[str, str], dict[str, str]]:
+    """Translate the deck and write ``<output_path>-<language>`` for each language.
+
+    Returns the written directories and the errors by language; a failed
+    translation never fails the run, whose deck is already on disk.
+    """
+    writer = FilesystemWriter(workspace=workspace)
+    base = Path(output_path)
+
+    async def write(language: str) -> tuple[str, str | None, str | None]:
+        try:
+            translated = await translate_deck_async(deck, language)
+            target = base.with_name(f"{base.name}-{language}")
+            result = await writer.write_deck(translated, str(target))
+        except Exception as e:
+            print(f"Translation to {language} failed: {e}")
+            metrics.FAILURES.inc(stage="translation", cause=type(e).__name__)
+            return language, None, str(e)
+        return language, result["output_path"], None
+
+    results = await asyncio.gather(*(write(language) for language in languages))
+    written = {language: path for language, path, _ in results if path is not None}
+    errors = {language: error for language, _, error in results if error is not None}
+    return written, errors
+
+
+def _set_translations(
+    state: AgentState, translations: tuple[dict[str, str], dict[str, str]]
+) -> None:
+    """Store the result of ``_write_translations`` in the run metadata."""
+    written, errors = translations
+    state.metadata["translations"] = written
+    if errors:
+        state.metadata["translation_errors"] = errors
+    else:
+        state.metadata.pop("translation_errors", None)
+
+
+async def _backfill(
+    state: AgentState,
+    pending: dict[int, asyncio.Task[SlideSpec]],
+    languages: list[str],
+    workspace: bool | None,
+) -> dict[str, Any]:
+    """Replace the placeholders of a written deck once their slides are done.
+
+    The deck (and its translations) is written again and ``state`` is
+    updated in place. Slides that fail again stay placeholders.
+    """
+    numbers = sorted(pending)
+    results = await asyncio.gather(
+        *(pending[number] for number in numbers), return_exceptions=True
+    )
+    slides = list(state.slides)
+    filled, failed = [], []
+    for number, result in zip(numbers, results):
+        if isinstance(result, BaseException):
+            metrics.FAILURES.inc(stage="backfill", cause=type(result).__name__)
+            failed.append(number)
+        else:
+            slides[number - 1] = result
+            filled.append(number)
+
+    output_path = state.metadata["output_path"]
+    with span("backfill", slides=len(filled)):
+        written_slides, written_deck = state.slides, state.deck
+        state.slides = slides
+        state.metadata["placeholder_slides"] = failed
+        state.deck = _build_deck(state)
+        if filled:
+            writer = FilesystemWriter(workspace=workspace)
+            try:
+                await writer.write_deck(state.deck, output_path, outline=state.outline)
+            except Exception as e:
+                # The deadline deck stays on disk and describes the state
+                print(f"Failed to rewrite the backfilled deck: {e}")
+                metrics.FAILURES.inc(stage="backfill", cause=type(e).__name__)
+                state.slides, state.deck = written_slides, written_deck
+                state.metadata["placeholder_slides"] = numbers
+                return {
+                    "output_path": output_path,
+                    "filled": [],
+                    "failed": numbers,
+                    "error": str(e),
+                }
+            if languages:
+                _set_translations(
+                    state,
+                    await _write_translations(
+                        state.deck, languages, output_path, workspace
+                    ),
+                )
+    return {"output_path": output_path, "filled": filled, "failed": failed}
+
+
+def _start_backfill(
+    state: AgentState,
+    pending: dict[int, asyncio.Task[SlideSpec]],
+    languages: list[str],
+    workspace: bool | None,
+) -> None:
+    """Backfill the placeholders of a written deck in a background task."""
+    output_path = state.metadata["output_path"]
+    task = asyncio.create_task(_backfill(state, pending, languages, workspace))
+    _backfill_tasks[output_path] = task
+
+    def forget(done: asyncio.Task[dict[str, Any]]) -> None:
+        # A newer run may already be backfilling the same deck
+        if _backfill_tasks.get(output_path) is done:
+            del _backfill_tasks[output_path]
+
+    task.add_done_callback(forget)
+
+
+async def wait_for_backfill(
+    output_path: str | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Wait for the background backfills of deadline runs.
+
+    Waits for all of them or only for the one rewriting ``output_path`` and
+    returns their reports by output path. The event loop must keep running
+    until then, otherwise the unfinished slides are lost.
+    """
+    tasks = {
+        path: task
+        for path, task in _backfill_tasks.items()
+        if output_path in (None, path)
+    }
+    reports = await asyncio.gather(*tasks.values())
+    return dict(zip(tasks, reports))
+
+
+@functools.cache
+def _get_agent_graph() -> StateGraph:
+    """Compile the workflow once and share it between runs."""
+    return create_agent_graph()
+
 
+async def run_agent_async(
+    topic_request: TopicRequest,
+    output_dir: str | None = None,
+    workspace: bool | None = None,
+    trace_dir: str | None = None,
+    languages: list[str] | None = None,
+    deadline: float | None = None,
+) -> AgentState:
+    """Run the slide generation agent workflow on the current event loop.
+
+    Many runs can execute concurrently in one event loop. ``workspace`` is
+    passed on to ``FilesystemWriter``. With ``trace_dir`` (or the
+    ``tracing.local_dir`` setting) the run's spans are written there as
+    Chrome trace and OpenTelemetry JSON.
+
+    The deck is generated once in the request's language and translated into
+    each of ``languages`` (default: ``workflow.languages`` when
+    ``workflow.enable_multilang`` is set), one output directory per language.
+
+    With a ``deadline`` in seconds (default: ``agent.deadline_seconds``) the
+    deck is written once it expires: slides not done by then, or failed, are
+    placeholders built from the outline. They are written in the background
+    and the deck is rewritten when they finish, see ``wait_for_backfill``.
+    """
     initial_state = AgentState(
         request=topic_request,
         metadata={
             "session_id": "simple-run",
             "output_dir": output_dir,
+            "workspace": workspace,
         },
     )
 
-    result = graph.invoke(initial_state)
+    settings = get_settings()
+    trace_dir = trace_dir or settings.tracing.local_dir
+    if deadline is None:
+        deadline = settings.agent.deadline_seconds
+    run_deadline = _Deadline(deadline) if deadline is not None else None
+    if languages is None and settings.workflow.enable_multilang:
+        languages = settings.workflow.languages
+    languages = [
+        language
+        for language in dict.fromkeys(languages or [])
+        if language != topic_request.language
+    ]
+    recorder = None
+    route_stats: dict[str, dict[str, Any]] = {}
+    node_seconds: dict[str, float] = {}
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        stack.callback(_route_stats.reset, _route_stats.set(route_stats))
+        stack.callback(_node_seconds.reset, _node_seconds.set(node_seconds))
+        stack.callback(_run_deadline.reset, _run_deadline.set(run_deadline))
+        stack.callback(_run_settings.reset, _run_settings.set(settings))
+        # Callers that already record (e.g. around many runs) keep their spans
+        if trace_dir and active_recorder() is None:
+            recorder = stack.enter_context(recording())
+        with span("run", topic=topic_request.topic):
+            index = _retrieval_index()
+            if index is not None:
+                # Pick up changed course material before any slide is written,
+                # speculative ones included; only changed files are read
+                await asyncio.to_thread(index.update)
+            result = await _get_agent_graph().ainvoke(initial_state)
+            state = AgentState(
+                request=result.get("request", topic_request),
+                outline=result.get("outline"),
+                slides=result.get("slides", []),
+                error=result.get("error"),
+                metadata=result.get("metadata", {}),
+            )
+            # The deck is only assembled for the caller, never kept in the graph
+            if state.slides and not state.error:
+                state.deck = _build_deck(state)
+            if languages and state.deck:
+                _set_translations(
+                    state,
+                    await _write_translations(
+                        state.deck, languages, state.metadata["output_path"], workspace
+                    ),
+                )
 
-    # Convert the result dict back to AgentState
-    return AgentState(
-        request=result.get("request", topic_request),
-        outline=result.get("outline"),
-        slides=result.get("slides"),
-        deck=result.get("deck"),
-        error=result.get("error"),
-        metadata=result.get("metadata", {}),
-    )
+    if run_deadline is not None and run_deadline.pending:
+        if state.deck and state.metadata.get("slides_written"):
+            _start_backfill(state, run_deadline.pending, languages, workspace)
+        else:
+            for task in run_deadline.pending.values():
+                task.cancel()
+
+    state.metadata["llm_routes"] = route_stats
+    state.metadata["node_seconds"] = node_seconds
+    if settings.history.enabled:
+        # The SQLite commit may wait for other writers; keep the loop free
+        await asyncio.to_thread(
+            _record_history, state, time.perf_counter() - start, settings
+        )
+    if state.deck is None:
+        metrics.DECKS_GENERATED.inc(status="error")
+    else:
+        metrics.DECKS_GENERATED.inc(status="ok")
+        metrics.SLIDES_PER_DECK.observe(len(state.deck.slides))
+    if recorder is not None and trace_dir:
+        name = f"run-{time.strftime('%Y%m%d-%H%M%S')}-{recorder.trace_id[:8]}"
+        state.metadata["trace_files"] = recorder.write(trace_dir, name)
+
+    return state
+
+
+def _record_history(state: AgentState, duration: float, settings: Settings) -> None:
+    """Add a finished run to the run history; a failure never fails the run."""
+    try:
+        get_run_history(settings.history.path).record(
+            state.request,
+            duration,
+            state.metadata["node_seconds"],
+            state.metadata["llm_routes"],
+            settings.llm.provider,
+            error=state.error or (None if state.deck else "No deck generated"),
+            slides=len(state.deck.slides) if state.deck else 0,
+        )
+    except Exception as e:
+        print(f"Failed to record the run history: {e}")
+        metrics.FAILURES.inc(stage="history", cause=type(e).__name__)
+
+
+def run_agent(
+    topic_request: TopicRequest,
+    output_dir: str | None = None,
+    workspace: bool | None = None,
+    trace_dir: str | None = None,
+    languages: list[str] | None = None,
+    deadline: float | None = None,
+    on_written: Callable[[AgentState], None] | None = None,
+) -> AgentState:
+    """Run the slide generation agent workflow.
+
+    Under a ``deadline`` the deck is on disk once it expires; this call
+    returns after the placeholders have been backfilled, with
+    ``metadata["backfill"]`` reporting the filled and failed slides.
+    ``on_written`` is called with the state as soon as the deck is written,
+    before waiting for the backfill.
+    """
+
+    async def run() -> AgentState:
+        state = await run_agent_async(
+            topic_request, output_dir, workspace, trace_dir, languages, deadline
+        )
+        if on_written is not None:
+            on_written(state)
+        output_path = state.metadata.get("output_path")
+        if output_path in _backfill_tasks:
+            reports = await wait_for_backfill(output_path)
+            state.metadata["backfill"] = reports[output_path]
+        return state
+
+    return asyncio.run(run())
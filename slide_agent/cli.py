@@ -1,31 +1,135 @@
-"""CLI Interface for Slidev Agent."""
+"""CLI Interface for Slidev Agent.
 
+Heavy dependencies (LangGraph, LangChain, Jinja, the models) are imported
+inside the commands so that ``--help`` and argument errors stay fast.
+"""
+
+import contextlib
+import os
+from pathlib import Path
+from typing import Any
 
 import typer
 from rich.console import Console
-from rich.traceback import install
-
-from slide_agent.agent_graph import run_agent
-from slide_agent.models import TopicRequest
-
-# Install rich traceback handler
-install()
 
 console = Console()
 app = typer.Typer()
+assets_app = typer.Typer(help="Manage the content-addressed asset store.")
+app.add_typer(assets_app, name="assets")
+
+
+@app.callback()  # type: ignore[misc]
+def setup(
+    ctx: typer.Context,
+    metrics_json: Path | None = typer.Option(
+        None, help="Write a JSON snapshot of the run's metrics to this file"
+    ),
+    metrics_prom: Path | None = typer.Option(
+        None, help="Write the run's metrics in Prometheus text format to this file"
+    ),
+    metrics_port: int | None = typer.Option(
+        None, help="Serve Prometheus metrics on this port while the command runs"
+    ),
+) -> None:
+    """Generate and render Slidev presentations with AI agents."""
+    # Only runs once a command is actually invoked, not for --help
+    from rich.traceback import install
+
+    install()
+
+    if metrics_json or metrics_prom or metrics_port:
+        from slide_agent.metrics import REGISTRY
+
+        if metrics_port:
+            ctx.call_on_close(REGISTRY.serve(metrics_port).shutdown)
+
+        def export_metrics() -> None:
+            if metrics_json:
+                REGISTRY.write_json(metrics_json)
+            if metrics_prom:
+                REGISTRY.write_prometheus(metrics_prom)
+
+        ctx.call_on_close(export_metrics)
+
+
+def _profiling(profile_dir: Path | None, name: str) -> Any:
+    """Profile the enclosed command into ``profile_dir``, if given."""
+    if profile_dir is None:
+        return contextlib.nullcontext()
+
+    from slide_agent.profiling import profiled
+
+    return profiled(profile_dir, name)
+
+
+def _print_profile(profile: Any) -> None:
+    """Report where the profile of a command was written."""
+    if profile is None:
+        return
+    console.print(
+        f"🔬 Profile ({profile.wall_time:.2f} s, peak "
+        f"{profile.peak_memory / 2**20:.1f} MiB): {profile.files['pstats']}"
+    )
+
+
+def _split_languages(languages: str | None) -> list[str] | None:
+    """Parse the comma-separated ``--languages`` option."""
+    if languages is None:
+        return None
+    return [language.strip() for language in languages.split(",") if language.strip()]
 
 
 @app.command()  # type: ignore[misc]
-def main(
+def generate(
     topic: str = typer.Argument(..., help="Topic for slide generation"),
     audience: str = typer.Option("general", help="Target audience"),
     language: str = typer.Option("de", help="Language for the presentation"),
     slide_count: int = typer.Option(10, help="Number of slides to generate"),
     theme: str = typer.Option("the-unnamed", help="Slidev theme to use"),
     additional_context: str | None = typer.Option(None, help="Additional context"),
-    output_dir: str = typer.Option("slides", help="Output directory"),
+    output_dir: str | None = typer.Option(
+        None, help="Output directory (default: slides/<deck-slug>)"
+    ),
+    workspace: bool | None = typer.Option(
+        None,
+        "--workspace/--no-workspace",
+        help="Write the deck into a shared npm workspace (default: auto-detect)",
+    ),
+    trace_dir: str | None = typer.Option(
+        None, help="Write local span traces (Chrome trace / OTel JSON) here"
+    ),
+    profile: Path | None = typer.Option(
+        None, help="Write CPU and memory profiles of the run to this directory"
+    ),
+    fake_llm: bool = typer.Option(
+        False, help="Use the offline fake LLM instead of OpenAI"
+    ),
+    languages: str | None = typer.Option(
+        None,
+        help="Comma-separated languages to translate the deck into, e.g. en,fr",
+    ),
+    cache: bool | None = typer.Option(
+        None,
+        "--cache/--no-cache",
+        help="Answer identical LLM calls from the response cache (default: settings)",
+    ),
+    deadline: float | None = typer.Option(
+        None,
+        min=0.1,
+        help="Write the deck after this many seconds with placeholders for "
+        "unfinished slides, then backfill them",
+    ),
 ) -> None:
     """Generate slides for a given topic using AI agents."""
+    from slide_agent.agent_graph import run_agent
+    from slide_agent.models import AgentState, TopicRequest
+
+    # Settings are read from the environment on every access
+    if fake_llm:
+        os.environ["LLM__PROVIDER"] = "fake"
+    if cache is not None:
+        os.environ["CACHE__ENABLED"] = str(cache).lower()
+
     console.print(f"🚀 Generating slides for topic: [bold blue]{topic}[/bold blue]")
     console.print(
         f"📊 Settings: {slide_count} slides, {audience} audience, {language} language"
@@ -44,8 +148,30 @@ def main(
 
         # Run the agent workflow
         console.print("🤖 Running agent workflow...")
-        with console.status("[bold green]Processing..."):
-            result = run_agent(request, output_dir)
+        with _profiling(profile, "generate") as profile_result:
+            with console.status("[bold green]Processing...") as status:
+
+                def deck_written(state: AgentState) -> None:
+                    # Show the deck at the deadline, not after the backfill
+                    placeholders = state.metadata.get("placeholder_slides")
+                    if placeholders and state.metadata.get("slides_written"):
+                        console.print(
+                            "⏱️  Deadline: deck written to [bold green]"
+                            f"{state.metadata['output_path']}[/bold green] with "
+                            f"{len(placeholders)} placeholder slides"
+                        )
+                        status.update("[bold green]Backfilling placeholder slides...")
+
+                result = run_agent(
+                    request,
+                    output_dir,
+                    workspace,
+                    trace_dir,
+                    _split_languages(languages),
+                    deadline,
+                    on_written=deck_written,
+                )
+        _print_profile(profile_result)
 
         # Display results
         if result.error:
@@ -89,12 +215,41 @@ def main(
 
                     size_kb = fs_result.get("size_bytes", 0) / 1024
                     console.print(f"💾 Size: {size_kb:.1f} KB")
+
+                backfill = result.metadata.get("backfill")
+                if backfill:
+                    console.print(
+                        f"⏱️  Deadline: {len(backfill['filled'])} placeholder slides "
+                        "backfilled"
+                    )
+                    if backfill["failed"]:
+                        failed = ", ".join(map(str, backfill["failed"]))
+                        console.print(f"⚠️  Still placeholders: slides {failed}")
+
+                for lang, path in result.metadata.get("translations", {}).items():
+                    console.print(f"🌐 Translation ({lang}): {path}")
+
+                trace_files = result.metadata.get("trace_files")
+                if trace_files:
+                    console.print(f"🔎 Trace: {trace_files['chrome']}")
+
+                routes = result.metadata.get("llm_routes")
+                if routes:
+                    console.print("\n⏱️  LLM routes:")
+                    for name, route in sorted(routes.items()):
+                        console.print(
+                            f"  {name} ({route['model']}): {route['calls']} calls "
+                            f"({route['cache_hits']} cached), "
+                            f"{route['latency_seconds']:.1f} s, "
+                            f"${route['cost_usd']:.4f}"
+                        )
         else:
             console.print("⚠️  No deck generated")
 
         if not result.metadata.get("slides_written"):
             console.print(
-                f"\n💾 Output directory: {output_dir} (no files written due to error)"
+                f"\n💾 Output directory: {output_dir or 'slides'}"
+                " (no files written due to error)"
             )
 
     except Exception as e:
@@ -102,5 +257,572 @@ def main(
         raise typer.Exit(1)
 
 
+@app.command("render-many")  # type: ignore[misc]
+def render_many_command(
+    specs: list[Path] = typer.Argument(
+        ..., help="Deck directories (with deck.json) or deck JSON files"
+    ),
+    workers: int | None = typer.Option(
+        None, help="Number of worker processes (default: CPU count)"
+    ),
+    chunksize: int | None = typer.Option(None, help="Decks per dispatched task"),
+    output_dir: str = typer.Option(
+        "slides", help="Output directory for decks loaded from JSON files"
+    ),
+    profile: Path | None = typer.Option(
+        None, help="Write CPU and memory profiles to this directory (use --workers 1)"
+    ),
+) -> None:
+    """Re-render many stored decks in parallel without calling the LLM."""
+    from slide_agent.generators import render_many
+    from slide_agent.models import SlideDeck
+    from slide_agent.writers import FilesystemWriter, load_deck_artifact
+
+    writer = FilesystemWriter(output_dir)
+    decks = []
+    targets: list[tuple[str | None, list[dict[str, Any]] | None]] = []
+
+    try:
+        for spec in specs:
+            if spec.is_dir():
+                deck, outline = load_deck_artifact(spec)
+                targets.append((str(spec), outline))
+            else:
+                deck = SlideDeck.model_validate_json(spec.read_text())
+                targets.append((None, None))
+            decks.append(deck)
+    except Exception as e:
+        console.print(f"❌ Failed to load decks: {e}")
+        raise typer.Exit(1)
+
+    console.print(f"🚀 Rendering {len(decks)} decks...")
+    with _profiling(profile, "render-many") as profile_result:
+        for index, markdown in render_many(decks, workers=workers, chunksize=chunksize):
+            deck_dir, outline = targets[index]
+            result = writer.write_deck_sync(
+                decks[index], deck_dir, markdown_content=markdown, outline=outline
+            )
+            console.print(f"  ✅ {decks[index].title} → {result['output_path']}")
+
+    console.print(f"📄 Decks rendered: {len(decks)}")
+    _print_profile(profile_result)
+
+
+@app.command()  # type: ignore[misc]
+def export(
+    specs: list[Path] = typer.Argument(
+        ..., help="Deck directories (with deck.json) or deck JSON files"
+    ),
+    archive: Path = typer.Option(..., "--out", help="Archive file (.zip, .tar.gz)"),
+    archive_format: str | None = typer.Option(
+        None, "--format", help="zip or tar.gz (default: from the file name)"
+    ),
+    workers: int | None = typer.Option(
+        None, help="Number of worker processes (default: CPU count)"
+    ),
+    profile: Path | None = typer.Option(
+        None, help="Write CPU and memory profiles to this directory (use --workers 1)"
+    ),
+) -> None:
+    """Export many decks into one zip or tar.gz archive without deck folders."""
+    from slide_agent.models import SlideDeck
+    from slide_agent.writers import deck_assets, export_decks, load_deck_artifact
+
+    decks = []
+    outlines = []
+    names: list[str | None] = []
+    assets: list[dict[str, str | Path | bytes] | None] = []
+    try:
+        for spec in specs:
+            if spec.is_dir():
+                deck, outline = load_deck_artifact(spec)
+                names.append(spec.resolve().name)
+                assets.append(dict(deck_assets(spec)))
+            else:
+                deck = SlideDeck.model_validate_json(spec.read_text())
+                outline = None
+                names.append(None)
+                assets.append(None)
+            decks.append(deck)
+            outlines.append(outline)
+    except Exception as e:
+        console.print(f"❌ Failed to load decks: {e}")
+        raise typer.Exit(1)
+
+    try:
+        with _profiling(profile, "export") as profile_result:
+            result = export_decks(
+                decks,
+                archive,
+                format=archive_format,
+                outlines=outlines,
+                names=names,
+                workers=workers,
+                assets=assets,
+            )
+    except ValueError as e:
+        console.print(f"❌ {e}")
+        raise typer.Exit(1)
+
+    console.print(
+        f"📦 Exported {len(result['decks'])} decks ({result['file_count']} files) "
+        f"→ {archive}"
+    )
+    _print_profile(profile_result)
+
+
+@app.command()  # type: ignore[misc]
+def warm(
+    topics_file: Path = typer.Argument(
+        ..., help="YAML file with topics, languages and audiences"
+    ),
+    concurrency: int = typer.Option(2, min=1, help="Requests generated at a time"),
+    spend_cap: float | None = typer.Option(
+        None, help="Start no further requests once this estimated USD is spent"
+    ),
+    report: Path | None = typer.Option(None, help="Write the coverage report as JSON"),
+    fake_llm: bool = typer.Option(
+        False, help="Use the offline fake LLM instead of OpenAI"
+    ),
+) -> None:
+    """Pre-generate outlines and slides of known requests into the LLM cache."""
+    import asyncio
+    import json
+
+    from slide_agent.warming import load_warm_requests, warm_cache
+
+    os.environ["CACHE__ENABLED"] = "true"
+    if fake_llm:
+        os.environ["LLM__PROVIDER"] = "fake"
+
+    try:
+        requests = load_warm_requests(topics_file)
+    except Exception as e:
+        console.print(f"❌ Failed to read {topics_file}: {e}")
+        raise typer.Exit(1)
+
+    console.print(
+        f"🔥 Warming the cache with {len(requests)} requests "
+        f"({concurrency} at a time)"
+    )
+    icons = {"warmed": "✅", "cached": "♻️ ", "skipped": "⏭️ ", "failed": "❌"}
+
+    def progress(result: dict[str, Any]) -> None:
+        console.print(
+            f"  {icons[result['status']]} {result['topic']} "
+            f"({result['language']}, {result['audience']}): {result['status']}"
+        )
+
+    summary = asyncio.run(
+        warm_cache(requests, concurrency, spend_cap, on_result=progress)
+    )
+
+    console.print(
+        f"📊 Coverage {summary['coverage']:.0%}: {summary['warmed']} warmed, "
+        f"{summary['cached']} already cached, {summary['skipped']} skipped, "
+        f"{summary['failed']} failed (${summary['spend_usd']:.4f})"
+    )
+    if report:
+        report.write_text(json.dumps(summary, indent=2, ensure_ascii=False))
+        console.print(f"📄 Report: {report}")
+    if summary["failed"]:
+        raise typer.Exit(1)
+
+
+@app.command()  # type: ignore[misc]
+def loadtest(
+    requests: int = typer.Option(20, min=1, help="Number of decks to generate"),
+    rate: float = typer.Option(2.0, min=0.01, help="Mean arrivals per second"),
+    concurrency: int = typer.Option(
+        4, min=1, help="Concurrent runs (async) or worker threads (threads)"
+    ),
+    deck_sizes: str = typer.Option(
+        "10", help="Slide counts with weights, e.g. 6:3,12:1"
+    ),
+    mode: str = typer.Option("async", help="async (one event loop) or threads"),
+    latency: float = typer.Option(0.2, min=0.0, help="Fake LLM response time"),
+    jitter: float = typer.Option(0.1, min=0.0, help="Random extra response time"),
+    error_rate: float = typer.Option(
+        0.0, min=0.0, max=1.0, help="Share of failing fake LLM calls"
+    ),
+    seed: int = typer.Option(0, help="Seed of arrivals and deck sizes"),
+    trace_memory: bool = typer.Option(
+        False, help="Also report the tracemalloc peak (slower)"
+    ),
+    report: Path | None = typer.Option(None, help="Write the report as JSON"),
+) -> None:
+    """Generate decks against the fake LLM at a given arrival rate and report."""
+    import asyncio
+    import json
+
+    from slide_agent.loadtest import parse_deck_sizes, run_load_test
+
+    # Load tests never call the real API
+    os.environ["LLM__PROVIDER"] = "fake"
+    os.environ["LLM__FAKE_LATENCY"] = str(latency)
+    os.environ["LLM__FAKE_LATENCY_JITTER"] = str(jitter)
+    os.environ["LLM__FAKE_ERROR_RATE"] = str(error_rate)
+
+    try:
+        sizes = parse_deck_sizes(deck_sizes)
+    except ValueError as e:
+        console.print(f"❌ {e}")
+        raise typer.Exit(1)
+
+    console.print(
+        f"🏋️  Load test: {requests} decks at {rate}/s, {concurrency} {mode} slots"
+    )
+    try:
+        summary = asyncio.run(
+            run_load_test(requests, rate, concurrency, sizes, mode, seed, trace_memory)
+        )
+    except ValueError as e:
+        console.print(f"❌ {e}")
+        raise typer.Exit(1)
+
+    latencies = summary["latency_seconds"]
+    console.print(
+        f"📊 {summary['succeeded']}/{summary['requests']} ok in "
+        f"{summary['duration_seconds']:.1f} s: "
+        f"{summary['throughput_rps']:.2f} decks/s, "
+        f"error rate {summary['error_rate']:.1%}"
+    )
+    if latencies["p50"] is not None:
+        console.print(
+            f"⏱️  Latency p50 {latencies['p50']:.2f} s, p95 {latencies['p95']:.2f} s, "
+            f"p99 {latencies['p99']:.2f} s"
+        )
+    console.print(f"💾 Peak RSS: {summary['peak_rss_bytes'] / 2**20:.1f} MiB")
+    if report:
+        report.write_text(json.dumps(summary, indent=2))
+        console.print(f"📄 Report: {report}")
+    else:
+        console.print_json(json.dumps(summary))
+
+
+@app.command()  # type: ignore[misc]
+def estimate(
+    slide_count: int = typer.Option(10, help="Number of slides to estimate"),
+    topic: str = typer.Option("Estimate", help="Topic of the planned deck"),
+    audience: str = typer.Option("general", help="Target audience"),
+    language: str = typer.Option("de", help="Language for the presentation"),
+    history: Path | None = typer.Option(
+        None, help="Run history database (default: HISTORY__PATH)"
+    ),
+    fake_llm: bool = typer.Option(
+        False, help="Estimate runs against the offline fake LLM"
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print the estimate as JSON"),
+) -> None:
+    """Predict latency, tokens and cost of a deck from the run history."""
+    import json
+
+    from slide_agent.history import estimate_request
+    from slide_agent.models import TopicRequest
+
+    if fake_llm:
+        os.environ["LLM__PROVIDER"] = "fake"
+
+    request = TopicRequest(
+        topic=topic, audience=audience, language=language, slide_count=slide_count
+    )
+    try:
+        result = estimate_request(request, str(history) if history else None)
+    except ValueError as e:
+        console.print(f"❌ {e}")
+        raise typer.Exit(1)
+
+    if as_json:
+        console.print_json(json.dumps(result))
+        return
+
+    console.print(
+        f"🔮 {slide_count} slides ({result['planning']} planning, "
+        f"from {result['runs']} runs): ~{result['latency_seconds']:.1f} s "
+        f"(p90 {result['latency_p90_seconds']:.1f} s), "
+        f"{result['input_tokens'] + result['output_tokens']:.0f} tokens, "
+        f"${result['cost_usd']:.4f}"
+    )
+    for node, seconds in result["nodes"].items():
+        console.print(f"  ⏱️  {node}: {seconds:.1f} s")
+    for name, route in result["routes"].items():
+        console.print(
+            f"  {name} ({route['model']}): {route['calls']:.1f} calls, "
+            f"{route['input_tokens']:.0f} in / {route['output_tokens']:.0f} out, "
+            f"${route['cost_usd']:.4f}"
+        )
+
+
+@app.command("rag-index")  # type: ignore[misc]
+def rag_index(
+    source_dir: Path | None = typer.Argument(
+        None, help="Course material directory (default: WORKFLOW__RAG_SOURCE_DIR)"
+    ),
+    index_dir: Path | None = typer.Option(
+        None, help="Index directory (default: WORKFLOW__RAG_INDEX_DIR)"
+    ),
+    query: str | None = typer.Option(None, help="Search the index after updating"),
+    k: int = typer.Option(3, help="Number of passages to show for --query"),
+) -> None:
+    """Build or update the BM25 index over local course material."""
+    import time
+
+    from slide_agent.config import get_settings
+    from slide_agent.retrieval import RetrievalIndex
+
+    workflow = get_settings().workflow
+    with RetrievalIndex(
+        source_dir or workflow.rag_source_dir, index_dir or workflow.rag_index_dir
+    ) as index:
+        start_time = time.perf_counter()
+        stats = index.update()
+        console.print(
+            f"📚 Index updated in {time.perf_counter() - start_time:.2f} s: "
+            + ", ".join(f"{count} {name}" for name, count in stats.items())
+        )
+        if query is None:
+            return
+        start_time = time.perf_counter()
+        passages = index.search(query, k)
+        console.print(
+            f"🔎 {len(passages)} passages in "
+            f"{(time.perf_counter() - start_time) * 1000:.2f} ms"
+        )
+        for passage in passages:
+            console.print(f"  {passage.score:.2f} {passage.citation}")
+
+
+@app.command()  # type: ignore[misc]
+def render(
+    deck_dir: Path = typer.Argument(..., help="Deck directory containing deck.json"),
+    theme: str | None = typer.Option(None, help="Switch the deck to another theme"),
+) -> None:
+    """Rebuild slides.md from a stored deck artifact without network access."""
+    from slide_agent.writers import FilesystemWriter
+
+    try:
+        result = FilesystemWriter().render_deck_dir(deck_dir, theme=theme)
+    except Exception as e:
+        console.print(f"❌ Failed to render deck: {e}")
+        raise typer.Exit(1)
+
+    console.print(
+        f"✅ Rendered {result['slide_count']} slides → {result['slides_file']}"
+    )
+
+
+@app.command()  # type: ignore[misc]
+def watch(
+    paths: list[Path] | None = typer.Argument(
+        None, help="Deck directories or folders of decks (default: slides)"
+    ),
+    interval: float = typer.Option(0.05, help="Polling interval in seconds"),
+) -> None:
+    """Re-render slides.md whenever a deck.json or a slide template changes."""
+    from slide_agent.watch import DeckWatcher
+
+    watcher = DeckWatcher(paths or [Path("slides")])
+    deck_count = watcher.start()
+    console.print(
+        f"👀 Watching {deck_count} decks and {watcher.templates_dir} (Ctrl+C to stop)"
+    )
+
+    def report(result: dict[str, Any]) -> None:
+        if "error" in result:
+            console.print(f"❌ {result['deck_dir']}: {result['error']}")
+        elif result["written"]:
+            console.print(
+                f"🔄 {result['slides_file']} "
+                f"({result['slide_count']} slides, {result['seconds'] * 1000:.0f} ms)"
+            )
+
+    try:
+        watcher.watch(interval, on_render=report)
+    except KeyboardInterrupt:
+        console.print("👋 Stopped watching")
+
+
+@app.command()  # type: ignore[misc]
+def build(
+    decks_root: Path = typer.Argument(Path("slides"), help="Directory with decks"),
+    output_dir: Path = typer.Option(Path("dist"), "--out", help="Site directory"),
+    base: str = typer.Option("/", help="Base URL the site is served from"),
+    deck: list[str] | None = typer.Option(
+        None, help="Only build these decks (repeatable)"
+    ),
+    workers: int | None = typer.Option(None, help="Parallel builds"),
+    build_command: str | None = typer.Option(
+        None, help="Build command run in each deck ({base}, {name}, {deck})"
+    ),
+    install_command: str | None = typer.Option(None, help="Dependency install command"),
+    no_install: bool = typer.Option(False, help="Skip dependency installation"),
+    force: bool = typer.Option(False, help="Rebuild decks even if unchanged"),
+) -> None:
+    """Build changed decks in parallel and assemble the static site."""
+    from slide_agent.site import SiteBuilder
+    from slide_agent.site.builder import DEFAULT_BUILD_COMMAND, DEFAULT_INSTALL_COMMAND
+
+    builder = SiteBuilder(
+        decks_root,
+        output_dir,
+        base_url=base,
+        build_command=build_command or DEFAULT_BUILD_COMMAND,
+        install_command=(
+            None if no_install else install_command or DEFAULT_INSTALL_COMMAND
+        ),
+        workers=workers,
+    )
+
+    console.print(f"🔧 Building decks in [bold blue]{decks_root}[/bold blue]...")
+    try:
+        result = builder.build(only=deck or None, force=force)
+    except Exception as e:
+        console.print(f"❌ Build failed: {e}")
+        raise typer.Exit(1)
+
+    for name in result["skipped_names"]:
+        console.print(f"  ⏭️  Skipping {name} (not URL-safe)")
+    for name in result["built"]:
+        console.print(f"  ✅ Built {name}")
+    for name, error in result["failed"].items():
+        console.print(f"  ❌ {name}: {error}")
+
+    console.print(
+        f"📦 {len(result['built'])} built, {len(result['unchanged'])} unchanged, "
+        f"{result['files_copied']} files copied → {result['output_dir']}"
+    )
+    if result["failed"]:
+        raise typer.Exit(1)
+
+
+@app.command()  # type: ignore[misc]
+def catalog(
+    decks_root: Path = typer.Argument(Path("slides"), help="Directory with decks"),
+    topic: str | None = typer.Option(None, help="Filter by topic"),
+    language: str | None = typer.Option(None, help="Filter by language"),
+    theme: str | None = typer.Option(None, help="Filter by theme"),
+    query: str | None = typer.Option(None, help="Search title, subtitle and topic"),
+    limit: int | None = typer.Option(None, help="Maximum number of decks"),
+) -> None:
+    """List and search decks from the incrementally refreshed catalog."""
+    from slide_agent.site import DeckCatalog
+    from slide_agent.site.catalog import CATALOG_NAME
+
+    with DeckCatalog(decks_root / CATALOG_NAME) as deck_catalog:
+        deck_catalog.refresh(decks_root)
+        decks = deck_catalog.search(
+            topic=topic,
+            language=language,
+            theme=theme,
+            query=query,
+            decks_root=decks_root,
+            limit=limit,
+        )
+
+    for deck in decks:
+        console.print(
+            f"  {deck['name']}: [bold]{deck['title']}[/bold] "
+            f"({deck['language'] or '?'}, {deck['theme']}, "
+            f"{deck['slide_count']} slides)"
+        )
+    console.print(f"📋 {len(decks)} decks")
+
+
+@app.command()  # type: ignore[misc]
+def index(
+    decks_root: Path = typer.Argument(Path("slides"), help="Directory with decks"),
+    output_dir: Path = typer.Option(Path("dist"), "--out", help="Site directory"),
+    all_decks: bool = typer.Option(
+        False, "--all", help="List decks even if they are not built into the site"
+    ),
+) -> None:
+    """Generate the site index page from the deck catalog."""
+    from slide_agent.site import write_site_index
+
+    result = write_site_index(
+        decks_root,
+        output_dir / "index.html",
+        site_dir=None if all_decks else output_dir,
+    )
+
+    status = "written" if result["written"] else "unchanged"
+    console.print(
+        f"📝 Index with {result['deck_count']} decks {status}: {result['index_file']}"
+    )
+
+
+@app.command()  # type: ignore[misc]
+def optimize(
+    site_dir: Path = typer.Argument(Path("dist"), help="Built site directory"),
+    base: str = typer.Option("/", help="Base URL the site is served from"),
+    workers: int | None = typer.Option(None, help="Parallel workers"),
+    no_brotli: bool = typer.Option(False, help="Only precompress with gzip"),
+    force: bool = typer.Option(False, help="Process files even if unchanged"),
+) -> None:
+    """Fingerprint and precompress the built site and write cache headers."""
+    from slide_agent.site import SitePostprocessor
+
+    postprocessor = SitePostprocessor(
+        site_dir, base_url=base, workers=workers, use_brotli=not no_brotli
+    )
+    try:
+        result = postprocessor.run(force=force)
+    except FileNotFoundError as e:
+        console.print(f"❌ {e}")
+        raise typer.Exit(1)
+
+    if not result["brotli"] and not no_brotli:
+        console.print("⚠️  brotli not installed, precompressing with gzip only")
+    saved = result["bytes"] - result["gzip_bytes"]
+    console.print(
+        f"🗜️  {result['processed']} processed, {result['unchanged']} unchanged, "
+        f"{result['fingerprinted']} fingerprinted, {result['compressed']} "
+        f"compressed (gzip saves {saved / 1024:.0f} KiB"
+        + (
+            f", brotli {(result['bytes'] - result['br_bytes']) / 1024:.0f} KiB"
+            if result["brotli"]
+            else ""
+        )
+        + f") → {result['manifest']}"
+    )
+
+
+@assets_app.command("add")  # type: ignore[misc]
+def assets_add(
+    deck_dir: Path = typer.Argument(..., help="Deck directory"),
+    files: list[Path] = typer.Argument(..., help="Asset files to add"),
+    store: Path | None = typer.Option(
+        None, help="Asset store (default: .assets next to the deck)"
+    ),
+) -> None:
+    """Add files to a deck's assets/ via the shared asset store."""
+    from slide_agent.writers import ASSET_STORE_NAME, AssetStore
+
+    asset_store = AssetStore(store or deck_dir.parent / ASSET_STORE_NAME)
+    for file in files:
+        linked = asset_store.add_to_deck(file, deck_dir / "assets" / file.name)
+        console.print(
+            f"🖼️  {file.name} -> {linked['digest'][:12]} ({linked['mode']}, "
+            f"{asset_store.refcount(linked['digest'])} refs)"
+        )
+
+
+@assets_app.command("gc")  # type: ignore[misc]
+def assets_gc(
+    decks_root: Path = typer.Argument(Path("slides"), help="Directory with decks"),
+    store: Path | None = typer.Option(
+        None, help="Asset store (default: <decks_root>/.assets)"
+    ),
+) -> None:
+    """Delete stored assets that no deck references anymore."""
+    from slide_agent.writers import ASSET_STORE_NAME, AssetStore
+
+    result = AssetStore(store or decks_root / ASSET_STORE_NAME).gc()
+    console.print(
+        f"🧹 Removed {result['removed_blobs']} blobs "
+        f"({result['freed_bytes']} bytes), {result['live_blobs']} still in use"
+    )
+
+
 if __name__ == "__main__":
     app()
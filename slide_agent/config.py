@@ -5,10 +5,15 @@ import os
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
+from slide_agent.config_schemas import AgentWorkflowConfig
+
 
 class LLMConfig(BaseModel):
     """Configuration for LLM integration."""
 
+    provider: str = Field(
+        default="openai", description="Chat model provider: 'openai' or 'fake'"
+    )
     model: str = Field(default="gpt-4o", description="OpenAI model to use")
     temperature: float = Field(
         default=0.7, ge=0.0, le=2.0, description="Temperature for generation"
@@ -17,6 +22,20 @@ class LLMConfig(BaseModel):
         default=None, description="Maximum tokens to generate"
     )
     timeout: int = Field(default=60, description="Request timeout in seconds")
+    fake_latency: float = Field(
+        default=0.0, ge=0.0, description="Simulated response time of the fake LLM"
+    )
+    fake_latency_jitter: float = Field(
+        default=0.0,
+        ge=0.0,
+        description="Maximum random extra response time of the fake LLM",
+    )
+    fake_error_rate: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Share of fake LLM calls that fail with FakeLLMError",
+    )
 
 
 class TracingConfig(BaseModel):
@@ -27,6 +46,32 @@ class TracingConfig(BaseModel):
     session_id: str | None = Field(
         default=None, description="Session ID for grouping traces"
     )
+    local_dir: str | None = Field(
+        default=None,
+        description="Directory for local span traces (Chrome trace / OTel JSON)",
+    )
+
+
+class CacheConfig(BaseModel):
+    """Configuration for the persistent LLM response cache."""
+
+    enabled: bool = Field(
+        default=False, description="Answer identical LLM calls from the cache"
+    )
+    path: str = Field(
+        default="slides/.llm-cache.sqlite", description="SQLite file of the cache"
+    )
+
+
+class HistoryConfig(BaseModel):
+    """Configuration for the local run history used by estimates."""
+
+    enabled: bool = Field(
+        default=True, description="Record every run's timings and tokens"
+    )
+    path: str = Field(
+        default="slides/.history.sqlite", description="SQLite file of the history"
+    )
 
 
 class AgentConfig(BaseModel):
@@ -41,6 +86,31 @@ class AgentConfig(BaseModel):
     output_format: str = Field(
         default="markdown", description="Output format for slides"
     )
+    max_parallel_slides: int = Field(
+        default=5, ge=1, description="Maximum slides generated concurrently per run"
+    )
+    speculative_writing: bool = Field(
+        default=False,
+        description=(
+            "Stream the planner outline and write slides as they arrive; "
+            "off while the LLM cache is enabled"
+        ),
+    )
+    hierarchical_planning_from: int = Field(
+        default=16,
+        ge=1,
+        description="Plan decks with this many slides section by section",
+    )
+    slides_per_section: int = Field(
+        default=6, ge=2, description="Target slide count of a planned section"
+    )
+    deadline_seconds: float | None = Field(
+        default=None,
+        gt=0,
+        description=(
+            "Seconds until the deck is written, unfinished slides as placeholders"
+        ),
+    )
 
 
 class Settings(BaseSettings):
@@ -71,6 +141,9 @@ class Settings(BaseSettings):
     llm: LLMConfig = Field(default_factory=LLMConfig)
     tracing: TracingConfig = Field(default_factory=TracingConfig)
     agent: AgentConfig = Field(default_factory=AgentConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    history: HistoryConfig = Field(default_factory=HistoryConfig)
+    workflow: AgentWorkflowConfig = Field(default_factory=AgentWorkflowConfig)
 
     model_config = {
         "env_file": ".env",
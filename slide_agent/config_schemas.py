@@ -2,7 +2,24 @@
 
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from slide_agent.models import SlideType
+
+
+class LLMRoute(BaseModel):
+    """Model settings for one route, e.g. a slide type.
+
+    Unset fields fall back to the role temperature and ``LLMConfig``.
+    """
+
+    model: str | None = Field(default=None)
+    temperature: float | None = Field(default=None, ge=0.0, le=2.0)
+    max_tokens: int | None = Field(default=None, ge=1)
+
+    # Prices in USD per 1000 tokens, used for cost reporting
+    input_cost_per_1k: float = Field(default=0.0, ge=0.0)
+    output_cost_per_1k: float = Field(default=0.0, ge=0.0)
 
 
 class SlideGenerationConfig(BaseModel):
@@ -18,6 +35,23 @@ class SlideGenerationConfig(BaseModel):
     planner_temperature: float = Field(default=0.7, ge=0.0, le=2.0)
     writer_temperature: float = Field(default=0.8, ge=0.0, le=2.0)
     reviewer_temperature: float = Field(default=0.3, ge=0.0, le=2.0)
+    translator_temperature: float = Field(default=0.2, ge=0.0, le=2.0)
+
+    # Model routing for the slide writer, keyed by slide type (e.g. "title")
+    slide_type_routes: dict[str, LLMRoute] = Field(default_factory=dict)
+
+    @field_validator("slide_type_routes")
+    @classmethod
+    def validate_slide_types(cls, routes: dict[str, LLMRoute]) -> dict[str, LLMRoute]:
+        """Reject routes for unknown slide types, e.g. a misspelled key."""
+        known = [slide_type.value for slide_type in SlideType]
+        unknown = sorted(set(routes) - set(known))
+        if unknown:
+            raise ValueError(
+                f"Unknown slide types {', '.join(unknown)} "
+                f"(expected one of {', '.join(known)})"
+            )
+        return routes
 
     # Quality settings
     enable_review: bool = Field(default=True)
@@ -45,6 +79,15 @@ class AgentWorkflowConfig(BaseModel):
     enable_rag_citations: bool = Field(default=False)
     enable_multilang: bool = Field(default=False)
 
+    # Languages the generated deck is translated into (with enable_multilang)
+    languages: list[str] = Field(default_factory=list)
+    translation_batch_slides: int = Field(default=8, ge=1, le=50)
+
+    # Local BM25 retrieval over course material (with enable_rag_citations)
+    rag_source_dir: str = Field(default="docs")
+    rag_index_dir: str = Field(default="slides/.rag-index")
+    rag_passages_per_slide: int = Field(default=3, ge=1, le=10)
+
 
 def load_config_from_dict(config_dict: dict[str, Any]) -> AgentWorkflowConfig:
     """Load configuration from dictionary (from YAML/JSON)."""
@@ -0,0 +1,221 @@
+"""Offline chat model with deterministic answers for profiling and tests."""
+
+import asyncio
+import json
+import random
+import re
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_SLIDE_REQUEST = re.compile(r"Create a (\d+)-slide presentation outline about: (.+)")
+_SECTION_REQUEST = re.compile(r"Split a (\d+)-slide presentation about: (.+)")
+_SECTION_SIZE = 6
+_SLIDE_TYPES = ["bullets", "code", "comparison", "bullets"]
+_TRANSLATION_REQUEST = re.compile(
+    r"texts from \S+ to (\S+)\..*Translate this JSON object:\n(\{.*\})", re.DOTALL
+)
+_STREAM_CHUNK_SIZE = 24
+
+
+class FakeLLMError(RuntimeError):
+    """Error injected by ``FakeChatModel`` to simulate failing API calls."""
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers the agent's prompts without network access.
+
+    The planner gets well-formed ``create_section_skeleton`` and
+    ``create_slide_outline`` tool calls with the requested number of slides,
+    writers get short markdown content and translators get the texts back
+    prefixed with the target language.
+    ``latency`` simulates the response time of a real model, plus a random
+    share of up to ``latency_jitter``; when streaming it is spread evenly
+    over the chunks. A share of ``error_rate`` calls fails with
+    ``FakeLLMError`` after that time, as a timed-out or rejected call would.
+    """
+
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    error_rate: float = 0.0
+    tool_name: str | None = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "slidev-fake"
+
+    def bind_tools(self, tools: Any, tool_choice: Any = None, **kwargs: Any) -> Any:
+        """Answer with a tool call to the first bound tool."""
+        tool = tools[0]
+        name = tool["name"] if isinstance(tool, dict) else tool.name
+        return self.model_copy(update={"tool_name": name})
+
+    def _response_time(self) -> float:
+        """Draw the simulated response time of one call."""
+        return self.latency + random.uniform(0.0, self.latency_jitter)
+
+    def _maybe_fail(self) -> None:
+        """Fail the call with probability ``error_rate``."""
+        if self.error_rate and random.random() < self.error_rate:
+            raise FakeLLMError("Injected fake LLM error")
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        delay = self._response_time()
+        if delay:
+            time.sleep(delay)
+        self._maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        delay = self._response_time()
+        if delay:
+            await asyncio.sleep(delay)
+        self._maybe_fail()
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._respond(messages)
+        if message.tool_calls:
+            tool_call = message.tool_calls[0]
+            text = json.dumps(tool_call["args"])
+        else:
+            text = str(message.content)
+        pieces = [
+            text[i : i + _STREAM_CHUNK_SIZE]
+            for i in range(0, len(text), _STREAM_CHUNK_SIZE)
+        ] or [""]
+
+        delay = self._response_time()
+        for index, piece in enumerate(pieces):
+            if delay:
+                await asyncio.sleep(delay / len(pieces))
+            if index == 0:
+                self._maybe_fail()
+            last = index == len(pieces) - 1
+            if message.tool_calls:
+                chunk = AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": tool_call["name"] if index == 0 else None,
+                            "args": piece,
+                            "id": tool_call["id"] if index == 0 else None,
+                            "index": 0,
+                        }
+                    ],
+                )
+            else:
+                chunk = AIMessageChunk(content=piece)
+            if last:
+                chunk.usage_metadata = message.usage_metadata
+            yield ChatGenerationChunk(message=chunk)
+
+    def _respond(self, messages: list[BaseMessage]) -> AIMessage:
+        """Build a deterministic answer for the given prompt."""
+        prompt = "\n".join(str(message.content) for message in messages)
+
+        if self.tool_name:
+            if self.tool_name == "create_section_skeleton":
+                args = {"sections": self._sections(prompt)}
+            else:
+                args = {"slides": self._outline(prompt)}
+            message = AIMessage(
+                content="",
+                tool_calls=[{"name": self.tool_name, "args": args, "id": "fake-0"}],
+            )
+        elif match := _TRANSLATION_REQUEST.search(prompt):
+            language, texts = match.group(1), json.loads(match.group(2))
+            message = AIMessage(
+                content=json.dumps(
+                    {key: f"[{language}] {text}" for key, text in texts.items()}
+                )
+            )
+        elif "code slide" in prompt:
+            message = AIMessage(
+                content="```python\ndef example():\n    return 42\n```\n\n"
+                "- Returns a constant"
+            )
+        else:
+            message = AIMessage(
+                content="- First key point\n- Second key point\n- Third key point"
+            )
+
+        output = str(message.content) or str(message.tool_calls)
+        message.usage_metadata = {
+            "input_tokens": len(prompt) // 4,
+            "output_tokens": len(output) // 4,
+            "total_tokens": (len(prompt) + len(output)) // 4,
+        }
+        return message
+
+    @staticmethod
+    def _outline(prompt: str) -> list[dict[str, Any]]:
+        """Create an outline with the slide count and topic asked for."""
+        match = _SLIDE_REQUEST.search(prompt)
+        count = int(match.group(1)) if match else 5
+        topic = match.group(2).strip() if match else "Topic"
+
+        slides = [
+            {
+                "title": topic,
+                "slide_type": "title",
+                "content_summary": f"Introduction to {topic}",
+                "key_points": ["Overview"],
+            }
+        ]
+        for i in range(1, count - 1):
+            slides.append(
+                {
+                    "title": f"{topic}: Part {i}",
+                    "slide_type": _SLIDE_TYPES[i % len(_SLIDE_TYPES)],
+                    "content_summary": f"Aspect {i} of {topic}",
+                    "key_points": [f"Point {i}.1", f"Point {i}.2"],
+                }
+            )
+        slides.append(
+            {
+                "title": "Summary",
+                "slide_type": "quote",
+                "content_summary": "Key takeaways",
+                "key_points": ["Takeaways"],
+            }
+        )
+        return slides[:count]
+
+    @staticmethod
+    def _sections(prompt: str) -> list[dict[str, Any]]:
+        """Split the requested slide count into sections of six slides."""
+        match = _SECTION_REQUEST.search(prompt)
+        count = int(match.group(1)) if match else 12
+        topic = match.group(2).strip() if match else "Topic"
+
+        return [
+            {
+                "title": f"{topic}: Section {number}",
+                "summary": f"Part {number} of {topic}",
+                "slide_count": min(_SECTION_SIZE, count - start),
+            }
+            for number, start in enumerate(range(0, count, _SECTION_SIZE), 1)
+        ]
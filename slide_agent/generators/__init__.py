@@ -1,5 +1,6 @@
 """Slide generators module."""
 
+from .bulk_renderer import render_many
 from .slide_generator import SlideGenerator
 
-__all__ = ["SlideGenerator"]
+__all__ = ["SlideGenerator", "render_many"]
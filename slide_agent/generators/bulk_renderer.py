@@ -0,0 +1,65 @@
+"""Bulk rendering of many slide decks across a process pool."""
+
+import multiprocessing
+import os
+from collections.abc import Iterable, Iterator, Sized
+from pathlib import Path
+
+from slide_agent.generators.slide_generator import SlideGenerator
+from slide_agent.models import SlideDeck
+
+# Generator owned by the current worker process, created once per process
+_worker_generator: SlideGenerator | None = None
+
+
+def _init_worker(templates_dir: str | None) -> None:
+    """Create the per-process Jinja environment once when a worker starts."""
+    global _worker_generator
+    _worker_generator = SlideGenerator(Path(templates_dir) if templates_dir else None)
+
+
+def _render_task(task: tuple[int, SlideDeck]) -> tuple[int, str]:
+    """Render a single deck inside a worker process."""
+    index, deck = task
+    assert _worker_generator is not None, "worker was not initialized"
+    return index, _worker_generator.generate_deck_markdown(deck)
+
+
+def _default_chunksize(decks: Iterable[SlideDeck], workers: int) -> int:
+    """Pick a chunk size that gives every worker a few chunks to balance load."""
+    if isinstance(decks, Sized):
+        return max(1, len(decks) // (workers * 4))
+    return 8
+
+
+def render_many(
+    decks: Iterable[SlideDeck],
+    workers: int | None = None,
+    chunksize: int | None = None,
+    templates_dir: Path | None = None,
+) -> Iterator[tuple[int, str]]:
+    """Render many decks to Slidev markdown in parallel.
+
+    Yields ``(index, markdown)`` tuples in completion order, where ``index`` is
+    the position of the deck in ``decks``. Decks are dispatched to the workers
+    in chunks of ``chunksize`` to keep inter-process overhead low.
+    """
+    workers = workers or os.cpu_count() or 1
+    templates = str(templates_dir) if templates_dir else None
+
+    if workers == 1:
+        # Avoid process startup and pickling costs for the single-core case.
+        # Rendering cleans slide content in place, so work on copies like the
+        # pool does after unpickling.
+        _init_worker(templates)
+        for index, deck in enumerate(decks):
+            yield _render_task((index, deck.model_copy(deep=True)))
+        return
+
+    if chunksize is None:
+        chunksize = _default_chunksize(decks, workers)
+
+    with multiprocessing.Pool(
+        processes=workers, initializer=_init_worker, initargs=(templates,)
+    ) as pool:
+        yield from pool.imap_unordered(_render_task, enumerate(decks), chunksize)
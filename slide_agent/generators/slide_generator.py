@@ -2,12 +2,29 @@
 
 import os
 import re
+import time
 from pathlib import Path
 from typing import Any
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
+from slide_agent import metrics
 from slide_agent.models import SlideDeck, SlideSpec, SlideType
+from slide_agent.spans import span, traced
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "templates"
+FRONTMATTER_TEMPLATE = "deck_frontmatter.md.j2"
+
+# Template used for each slide type
+SLIDE_TEMPLATES = {
+    SlideType.TITLE: "title_slide.md.j2",
+    SlideType.BULLETS: "bullets_slide.md.j2",
+    SlideType.CODE: "code_slide.md.j2",
+    SlideType.COMPARISON: "comparison_slide.md.j2",
+    SlideType.QUOTE: "quote_slide.md.j2",
+    SlideType.DIAGRAM: "bullets_slide.md.j2",  # Fallback for now
+    SlideType.IMAGE: "bullets_slide.md.j2",  # Fallback for now
+}
 
 
 class SlideGenerator:
@@ -16,7 +33,7 @@ class SlideGenerator:
     def __init__(self, templates_dir: Path | None = None):
         """Initialize the slide generator with Jinja environment."""
         if templates_dir is None:
-            templates_dir = Path(__file__).parent.parent / "templates"
+            templates_dir = TEMPLATES_DIR
 
         self.env = Environment(
             loader=FileSystemLoader(str(templates_dir)),
@@ -68,7 +85,7 @@ class SlideGenerator:
         # But NOT followed by newline (which indicates properly formatted code)
         pattern = r"```(" + "|".join(languages) + r")(?=[a-zA-Z_<.{[#-])"
 
-        def replace_match(match):
+        def replace_match(match: re.Match[str]) -> str:
             lang = match.group(1)
             return f"```{lang}\n"
 
@@ -132,7 +149,7 @@ class SlideGenerator:
 
     def generate_frontmatter(self, deck: SlideDeck) -> str:
         """Generate the Slidev frontmatter."""
-        template = self.env.get_template("deck_frontmatter.md.j2")
+        template = self.env.get_template(FRONTMATTER_TEMPLATE)
 
         # Prepare frontmatter data
         data = {
@@ -158,17 +175,7 @@ class SlideGenerator:
         slide.content = self._limit_slide_lines(slide.content, max_lines=10)
 
         # Determine template based on slide type
-        template_map = {
-            SlideType.TITLE: "title_slide.md.j2",
-            SlideType.BULLETS: "bullets_slide.md.j2",
-            SlideType.CODE: "code_slide.md.j2",
-            SlideType.COMPARISON: "comparison_slide.md.j2",
-            SlideType.QUOTE: "quote_slide.md.j2",
-            SlideType.DIAGRAM: "bullets_slide.md.j2",  # Fallback for now
-            SlideType.IMAGE: "bullets_slide.md.j2",  # Fallback for now
-        }
-
-        template_name = template_map.get(slide.slide_type, "bullets_slide.md.j2")
+        template_name = SLIDE_TEMPLATES.get(slide.slide_type, "bullets_slide.md.j2")
         template = self.env.get_template(template_name)
 
         # Prepare slide data
@@ -417,6 +424,7 @@ class SlideGenerator:
             "additional_content": None,
         }
 
+    @traced("render.deck")
     def generate_deck_markdown(self, deck: SlideDeck) -> str:
         """Generate complete Slidev markdown for the deck."""
         parts = []
@@ -430,7 +438,12 @@ class SlideGenerator:
             is_first = i == 0
 
             # Add slide content
-            slide_content = self.generate_slide(slide, is_first)
+            start = time.perf_counter()
+            with span("render.slide", slide_type=slide.slide_type.value):
+                slide_content = self.generate_slide(slide, is_first)
+            metrics.RENDER_LATENCY.observe(
+                time.perf_counter() - start, slide_type=slide.slide_type.value
+            )
 
             # Check if slide content already starts with frontmatter
             if i > 0 and not slide_content.strip().startswith("---"):
@@ -0,0 +1,372 @@
+"""SQLite history of agent runs and estimates of new runs derived from it."""
+
+import functools
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from slide_agent.config import Settings, get_settings
+from slide_agent.models import SlideType, TopicRequest
+
+HISTORY_NAME = ".history.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    topic TEXT NOT NULL,
+    audience TEXT,
+    language TEXT,
+    theme TEXT,
+    slide_count INTEGER NOT NULL,
+    provider TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    slides INTEGER NOT NULL DEFAULT 0,
+    duration_seconds REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS node_timings (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    node TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (run_id, node)
+);
+CREATE TABLE IF NOT EXISTS llm_routes (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    node TEXT NOT NULL,
+    slide_type TEXT NOT NULL DEFAULT '',
+    model TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    cache_hits INTEGER NOT NULL,
+    latency_seconds REAL NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    cost_usd REAL NOT NULL,
+    PRIMARY KEY (run_id, node, slide_type)
+);
+CREATE INDEX IF NOT EXISTS runs_provider ON runs (provider, status);
+"""
+
+# LLM roles whose calls are part of generating the deck itself
+_ESTIMATED_NODES = ("planner", "slide_writer", "reviewer")
+
+
+def _fit(points: Sequence[tuple[float, float]]) -> tuple[float, float]:
+    """Least-squares line ``(intercept, slope)`` through ``(x, y)`` points.
+
+    With fewer than two distinct ``x`` the slope is 0 and the intercept the
+    mean, so a history of equally sized decks still gives an estimate.
+    """
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if not spread:
+        return mean_y, 0.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+    return mean_y - slope * mean_x, slope
+
+
+def _predict(points: Sequence[tuple[float, float]], x: float) -> float:
+    """Predict ``y`` at ``x`` from a linear fit, never below zero."""
+    intercept, slope = _fit(points)
+    return max(0.0, intercept + slope * x)
+
+
+def _per_call(
+    rows: Sequence[tuple[float, sqlite3.Row]], column: str
+) -> list[tuple[float, float]]:
+    """Points of ``column`` per uncached call against the slide count.
+
+    Cached calls cost no tokens and almost no time, so routes served
+    entirely from the cache are left out unless there is nothing else.
+    """
+    points = [
+        (x, row[column] / (row["calls"] - row["cache_hits"]))
+        for x, row in rows
+        if row["calls"] > row["cache_hits"]
+    ]
+    return points or [(x, row[column] / max(1, row["calls"])) for x, row in rows]
+
+
+def _expected_calls(
+    route_rows: dict[tuple[str, str], list[tuple[float, sqlite3.Row]]],
+    runs: int,
+    count: int,
+) -> dict[tuple[str, str], float]:
+    """Expected LLM calls per ``(node, slide_type)`` route for ``count`` slides.
+
+    The writer is called once per slide: as many title slides per deck as
+    in the history, the other slides split by the past slide type shares.
+    Calls of the other nodes are fitted against the slide count, e.g. the
+    section planner calls of large decks.
+    """
+    writer_calls = {
+        slide_type: sum(row["calls"] for _, row in rows)
+        for (node, slide_type), rows in route_rows.items()
+        if node == "slide_writer"
+    }
+    titles = min(float(count), writer_calls.pop(SlideType.TITLE.value, 0) / runs)
+    other_calls = sum(writer_calls.values())
+
+    expected = {}
+    if titles:
+        expected[("slide_writer", SlideType.TITLE.value)] = titles
+    for slide_type, calls in writer_calls.items():
+        expected[("slide_writer", slide_type)] = (count - titles) * calls / other_calls
+    for (node, slide_type), rows in route_rows.items():
+        if node != "slide_writer":
+            points = [(x, float(row["calls"])) for x, row in rows]
+            expected[(node, slide_type)] = _predict(points, count)
+    return expected
+
+
+class RunHistory:
+    """Local record of runs: request, timings per graph node, tokens per route.
+
+    Every run adds one row to ``runs``, the wall time of each graph node to
+    ``node_timings`` and the per-route LLM statistics (as in
+    ``metadata["llm_routes"]``) to ``llm_routes``. ``estimate`` predicts a
+    new request from the successful runs of the same provider.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def record(
+        self,
+        request: TopicRequest,
+        duration: float,
+        nodes: dict[str, float],
+        routes: dict[str, dict[str, Any]],
+        provider: str,
+        error: str | None = None,
+        slides: int = 0,
+    ) -> int:
+        """Store a finished run and return its id."""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            run_id = self._conn.execute(
+                "INSERT INTO runs (started_at, topic, audience, language, theme, "
+                "slide_count, provider, status, error, slides, duration_seconds) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time() - duration,
+                    request.topic,
+                    request.audience,
+                    request.language,
+                    request.theme,
+                    request.slide_count,
+                    provider,
+                    "error" if error else "ok",
+                    error,
+                    slides,
+                    duration,
+                ),
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO node_timings (run_id, node, seconds) VALUES (?, ?, ?)",
+                [(run_id, node, seconds) for node, seconds in nodes.items()],
+            )
+            self._conn.executemany(
+                "INSERT INTO llm_routes (run_id, node, slide_type, model, calls, "
+                "cache_hits, latency_seconds, input_tokens, output_tokens, cost_usd) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        *(key.split(":", 1) if ":" in key else (key, "")),
+                        route["model"],
+                        route["calls"],
+                        route["cache_hits"],
+                        route["latency_seconds"],
+                        route["input_tokens"],
+                        route["output_tokens"],
+                        route["cost_usd"],
+                    )
+                    for key, route in routes.items()
+                ],
+            )
+        assert run_id is not None
+        return run_id
+
+    def runs(
+        self, provider: str | None = None, limit: int = 20
+    ) -> list[dict[str, Any]]:
+        """Return the latest runs, newest first."""
+        query = "SELECT * FROM runs"
+        params: tuple[Any, ...] = ()
+        if provider:
+            query += " WHERE provider = ?"
+            params = (provider,)
+        query += " ORDER BY id DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, (*params, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def estimate(
+        self, request: TopicRequest, settings: Settings | None = None
+    ) -> dict[str, Any]:
+        """Predict latency, tokens and cost of ``request`` from past runs.
+
+        Only successful runs of the configured LLM provider count, and of
+        those preferably runs that were not answered entirely from the LLM
+        cache and runs planned the same way (flat or by sections).
+        Node times and per-call token counts are fitted linearly against the
+        slide count. Slides are split into types like the history: as many
+        title slides per deck as before, the rest in the past proportions.
+        Models and prices are those the current routing would use, so
+        re-routing a slide type is reflected before the first run.
+        ``latency_p90_seconds`` adds the 90th percentile of how much past
+        runs took longer than predicted, as a margin for scheduling.
+        """
+        from slide_agent.llm import resolve_route
+
+        settings = settings or get_settings()
+        provider = settings.llm.provider
+        count = request.slide_count
+        threshold = settings.agent.hierarchical_planning_from
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, slide_count, id IN ("
+                "SELECT run_id FROM llm_routes GROUP BY run_id "
+                "HAVING SUM(calls) = SUM(cache_hits)) AS cached "
+                "FROM runs WHERE provider = ? AND status = 'ok'",
+                (provider,),
+            ).fetchall()
+            if not rows:
+                raise ValueError(f"No successful {provider!r} runs in {self.path}")
+            # Runs served entirely from the LLM cache (e.g. by warm) take almost
+            # no time, so they only count when there is nothing else
+            runs = {
+                row["id"]: row["slide_count"]
+                for row in [row for row in rows if not row["cached"]] or rows
+            }
+            same_planning = {
+                run_id: slide_count
+                for run_id, slide_count in runs.items()
+                if (slide_count >= threshold) == (count >= threshold)
+            }
+            runs = same_planning or runs
+            marks = ",".join("?" * len(runs))
+            timings = self._conn.execute(
+                "SELECT run_id, node, seconds FROM node_timings "
+                f"WHERE run_id IN ({marks})",
+                tuple(runs),
+            ).fetchall()
+            durations = self._conn.execute(
+                "SELECT slide_count, duration_seconds FROM runs "
+                f"WHERE id IN ({marks})",
+                tuple(runs),
+            ).fetchall()
+            routes = self._conn.execute(
+                "SELECT * FROM llm_routes "
+                f"WHERE run_id IN ({marks}) AND node IN (?, ?, ?)",
+                (*runs, *_ESTIMATED_NODES),
+            ).fetchall()
+
+        # Wall time per graph node; slides are written in parallel, so the
+        # node time is what counts, not the sum of the call latencies
+        node_points: dict[str, list[tuple[float, float]]] = defaultdict(list)
+        for row in timings:
+            node_points[row["node"]].append((runs[row["run_id"]], row["seconds"]))
+        nodes = {node: _predict(points, count) for node, points in node_points.items()}
+        latency = sum(nodes.values())
+        residuals = sorted(
+            row["duration_seconds"]
+            - sum(
+                _predict(points, row["slide_count"]) for points in node_points.values()
+            )
+            for row in durations
+        )
+        margin = max(0.0, residuals[min(len(residuals) - 1, int(0.9 * len(residuals)))])
+
+        route_rows: dict[tuple[str, str], list[tuple[float, sqlite3.Row]]] = (
+            defaultdict(list)
+        )
+        for row in routes:
+            route_rows[(row["node"], row["slide_type"])].append(
+                (runs[row["run_id"]], row)
+            )
+
+        estimate_routes: dict[str, dict[str, Any]] = {}
+        for (node, slide_type), calls in sorted(
+            _expected_calls(route_rows, len(runs), count).items()
+        ):
+            route = resolve_route(node, slide_type or None, settings)
+            rows = route_rows[(node, slide_type)]
+            input_tokens = calls * _predict(_per_call(rows, "input_tokens"), count)
+            output_tokens = calls * _predict(_per_call(rows, "output_tokens"), count)
+            key = f"{node}:{slide_type}" if slide_type else node
+            estimate_routes[key] = {
+                "model": route.model,
+                "calls": calls,
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cost_usd": (
+                    input_tokens * route.input_cost_per_1k
+                    + output_tokens * route.output_cost_per_1k
+                )
+                / 1000,
+                "call_latency_seconds": _predict(
+                    _per_call(rows, "latency_seconds"), count
+                ),
+            }
+
+        models: dict[str, dict[str, float]] = defaultdict(
+            lambda: {
+                "calls": 0.0,
+                "input_tokens": 0.0,
+                "output_tokens": 0.0,
+                "cost_usd": 0.0,
+            }
+        )
+        for route_estimate in estimate_routes.values():
+            totals = models[route_estimate["model"]]
+            for field in totals:
+                totals[field] += route_estimate[field]
+
+        return {
+            "slide_count": count,
+            "provider": provider,
+            "runs": len(runs),
+            "planning": "hierarchical" if count >= threshold else "flat",
+            "latency_seconds": latency,
+            "latency_p90_seconds": latency + margin,
+            "nodes": nodes,
+            "input_tokens": sum(r["input_tokens"] for r in estimate_routes.values()),
+            "output_tokens": sum(r["output_tokens"] for r in estimate_routes.values()),
+            "cost_usd": sum(r["cost_usd"] for r in estimate_routes.values()),
+            "routes": estimate_routes,
+            "models": dict(models),
+        }
+
+
+@functools.cache
+def get_run_history(path: str) -> RunHistory:
+    """Return the shared history for ``path``, opened once per process."""
+    return RunHistory(path)
+
+
+def estimate_request(request: TopicRequest, path: str | None = None) -> dict[str, Any]:
+    """Estimate ``request`` from the configured (or given) run history."""
+    settings = get_settings()
+    return get_run_history(path or settings.history.path).estimate(request, settings)
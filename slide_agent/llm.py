@@ -1,23 +1,90 @@
 """LLM integration for Slidev Agent."""
 
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 
-from slide_agent.config import get_settings
+from slide_agent.config import Settings, get_settings
+from slide_agent.config_schemas import LLMRoute
+from slide_agent.llm_cache import get_response_cache
+from slide_agent.models import SlideType
 
 
-def get_llm() -> ChatOpenAI:
-    """Get configured ChatOpenAI instance."""
-    settings = get_settings()
+def resolve_route(
+    role: str | None = None,
+    slide_type: SlideType | str | None = None,
+    settings: Settings | None = None,
+) -> LLMRoute:
+    """Resolve model, temperature and prices for a graph role and slide type.
+
+    Slide writer calls use the route configured for their slide type in
+    ``workflow.slide_generation.slide_type_routes``. Unset values fall back
+    to the role temperature of ``SlideGenerationConfig`` and to ``LLMConfig``.
+    """
+    settings = settings or get_settings()
+    generation = settings.workflow.slide_generation
+
+    route = LLMRoute()
+    if role == "slide_writer" and slide_type is not None:
+        route = generation.slide_type_routes.get(
+            SlideType(slide_type).value, LLMRoute()
+        )
+
+    role_temperature = {
+        "planner": generation.planner_temperature,
+        "slide_writer": generation.writer_temperature,
+        "reviewer": generation.reviewer_temperature,
+        "translator": generation.translator_temperature,
+    }.get(role or "", settings.llm.temperature)
+
+    return route.model_copy(
+        update={
+            "model": route.model or settings.llm.model,
+            "temperature": (
+                route.temperature if route.temperature is not None else role_temperature
+            ),
+            "max_tokens": route.max_tokens or settings.llm.max_tokens,
+        }
+    )
+
+
+def get_llm(
+    role: str | None = None,
+    slide_type: SlideType | str | None = None,
+    settings: Settings | None = None,
+) -> BaseChatModel:
+    """Get the chat model routed for a graph role and slide type.
+
+    With ``llm.provider = "fake"`` an offline model answers instead of OpenAI,
+    which makes profiling and load tests reproducible. With ``cache.enabled``
+    identical calls are answered from the persistent response cache.
+    ``settings`` saves re-reading the environment when the caller has them.
+    """
+    settings = settings or get_settings()
+    cache = get_response_cache(settings.cache.path) if settings.cache.enabled else None
+
+    if settings.llm.provider == "fake":
+        from slide_agent.fake_llm import FakeChatModel
+
+        return FakeChatModel(
+            latency=settings.llm.fake_latency,
+            latency_jitter=settings.llm.fake_latency_jitter,
+            error_rate=settings.llm.fake_error_rate,
+            cache=cache,
+        )
 
     if not settings.openai_api_key:
         raise ValueError(
             "OpenAI API key not found. Please set OPENAI_API_KEY in .env file or environment."
         )
 
+    route = resolve_route(role, slide_type, settings)
+    # resolve_route falls back to the configured model
+    assert route.model is not None
     return ChatOpenAI(
-        model=settings.llm.model,
-        temperature=settings.llm.temperature,
-        max_tokens=settings.llm.max_tokens,
+        model=route.model,
+        temperature=route.temperature,
+        max_tokens=route.max_tokens,
         timeout=settings.llm.timeout,
         api_key=settings.openai_api_key,
+        cache=cache,
     )
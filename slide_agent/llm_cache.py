@@ -0,0 +1,142 @@
+"""Persistent SQLite cache for chat model responses."""
+
+import asyncio
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import AIMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from slide_agent import metrics
+
+LLM_CACHE_NAME = ".llm-cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    llm_string_hash TEXT NOT NULL,
+    messages TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class ResponseCache(BaseCache):
+    """LangChain cache storing chat responses in SQLite.
+
+    Entries are keyed by a hash of the serialized prompt and the model's
+    invocation parameters (model, temperature, bound tools), so only an
+    identical call is answered from the cache. Cached answers are returned
+    without token usage and flagged with ``response_metadata["cache_hit"]``,
+    so they cost nothing in the run statistics. WAL mode lets several
+    processes share one cache file.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        """Hash a prompt and model configuration into the cache key."""
+        return hashlib.sha256(f"{llm_string}\0{prompt}".encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        """Return the cached generations of an identical call, if any."""
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT messages FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE responses SET hits = hits + 1 WHERE key = ?", (key,)
+                )
+
+        metrics.CACHE_LOOKUPS.inc(cache="llm", result="miss" if row is None else "hit")
+        if row is None:
+            return None
+
+        generations: list[Generation] = []
+        for message in messages_from_dict(json.loads(row[0])):
+            if isinstance(message, AIMessage):
+                message.usage_metadata = None
+            message.response_metadata = {
+                **message.response_metadata,
+                "cache_hit": True,
+            }
+            generations.append(ChatGeneration(message=message))
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the generations of a successful call."""
+        messages = [
+            message_to_dict(generation.message)
+            for generation in return_val
+            if isinstance(generation, ChatGeneration)
+        ]
+        if not messages:
+            return
+        llm_string_hash = hashlib.sha256(llm_string.encode()).hexdigest()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, llm_string_hash, messages, created_at) VALUES (?, ?, ?, ?)",
+                (
+                    self._key(prompt, llm_string),
+                    llm_string_hash,
+                    json.dumps(messages, ensure_ascii=False),
+                    time.time(),
+                ),
+            )
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    # Another writer can hold the database for up to the busy timeout, so the
+    # queries run in a thread instead of blocking the event loop
+    async def alookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        return await asyncio.to_thread(self.lookup, prompt, llm_string)
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        await asyncio.to_thread(self.update, prompt, llm_string, return_val)
+
+    async def aclear(self, **kwargs: Any) -> None:
+        await asyncio.to_thread(self.clear, **kwargs)
+
+    def stats(self) -> dict[str, int]:
+        """Return the number of entries and the hits they served."""
+        with self._lock:
+            entries, hits = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM responses"
+            ).fetchone()
+        return {"entries": entries, "hits": hits}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+@functools.cache
+def get_response_cache(path: str) -> ResponseCache:
+    """Return the shared cache for ``path``, opened once per process."""
+    return ResponseCache(path)
@@ -0,0 +1,214 @@
+"""Load tests: drive concurrent deck generation with Poisson arrivals."""
+
+import asyncio
+import math
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from slide_agent.config import get_settings
+from slide_agent.models import TopicRequest
+
+MODES = ("async", "threads")
+
+
+def parse_deck_sizes(spec: str) -> dict[int, float]:
+    """Parse a deck size distribution such as ``"6:3,12:1"`` into weights.
+
+    Every entry is ``slide_count[:weight]``; the weight defaults to 1, so
+    ``"6,12"`` draws both sizes equally often.
+    """
+    sizes: dict[int, float] = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        count, _, weight = entry.partition(":")
+        sizes[int(count)] = float(weight) if weight else 1.0
+    if not sizes or any(count < 1 for count in sizes) or sum(sizes.values()) <= 0:
+        raise ValueError(f"Invalid deck size distribution: {spec!r}")
+    return sizes
+
+
+def percentile(values: Sequence[float], q: float) -> float | None:
+    """Return the nearest-rank ``q``-th percentile of ``values``."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _summary(values: Sequence[float]) -> dict[str, float | None]:
+    """Mean, p50, p95, p99 and max of a list of durations."""
+    return {
+        "mean": sum(values) / len(values) if values else None,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else None,
+    }
+
+
+def _peak_rss_bytes() -> int:
+    """Return the peak resident set size of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def arrival_schedule(
+    requests: int, rate: float, deck_sizes: dict[int, float], seed: int = 0
+) -> list[tuple[float, int]]:
+    """Draw arrival offsets (Poisson process at ``rate``/s) and deck sizes."""
+    rng = random.Random(seed)
+    counts, weights = list(deck_sizes), list(deck_sizes.values())
+    schedule = []
+    offset = 0.0
+    for _ in range(requests):
+        schedule.append((offset, rng.choices(counts, weights)[0]))
+        offset += rng.expovariate(rate)
+    return schedule
+
+
+async def run_load_test(
+    requests: int = 20,
+    rate: float = 2.0,
+    concurrency: int = 4,
+    deck_sizes: dict[int, float] | None = None,
+    mode: str = "async",
+    seed: int = 0,
+    trace_memory: bool = False,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Generate ``requests`` decks arriving at ``rate`` per second and report.
+
+    Arrivals are open-loop: requests arrive on schedule whether or not
+    earlier ones have finished, and queue for one of ``concurrency`` slots.
+    In ``async`` mode the slots are concurrent ``run_agent_async`` runs on
+    this event loop; in ``threads`` mode they are worker threads calling
+    ``run_agent``, each with its own event loop. Latency is measured from
+    arrival, so it includes the time spent queueing.
+
+    The LLM is whatever the settings select; load tests normally use the
+    fake provider with ``llm.fake_latency`` and ``llm.fake_error_rate``.
+    """
+    from slide_agent.agent_graph import run_agent, run_agent_async
+
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+    deck_sizes = deck_sizes or {10: 1.0}
+    schedule = arrival_schedule(requests, rate, deck_sizes, seed)
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    pool = ThreadPoolExecutor(concurrency, thread_name_prefix="loadtest")
+
+    started_tracemalloc = trace_memory and not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+
+    async def generate(
+        index: int, offset: float, slide_count: int, tmp: Path
+    ) -> dict[str, Any]:
+        await asyncio.sleep(max(0.0, start + offset - time.perf_counter()))
+        arrived = time.perf_counter()
+        result: dict[str, Any] = {"index": index, "slide_count": slide_count}
+        request = TopicRequest(topic=f"Load test {index}", slide_count=slide_count)
+        output_dir = str(tmp / f"deck-{index}")
+        async with semaphore:
+            began = time.perf_counter()
+            try:
+                if mode == "threads":
+                    state = await loop.run_in_executor(
+                        pool, run_agent, request, output_dir
+                    )
+                else:
+                    state = await run_agent_async(request, output_dir)
+                error = state.error or (None if state.deck else "No deck generated")
+                # Errors without an exception, e.g. an empty outline, are their cause
+                cause = state.metadata.get("error_cause", error) if error else None
+            except Exception as e:
+                state, error, cause = None, str(e), type(e).__name__
+        finished = time.perf_counter()
+        result.update(
+            ok=error is None,
+            latency_seconds=finished - arrived,
+            queue_seconds=began - arrived,
+            slides=len(state.deck.slides) if state and state.deck else 0,
+        )
+        if error is not None:
+            result.update(error=error, cause=cause)
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="slidev-load-") as tmp:
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(
+                    generate(index, offset, slide_count, Path(tmp))
+                    for index, (offset, slide_count) in enumerate(schedule)
+                )
+            )
+            duration = time.perf_counter() - start
+        peak_traced = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        pool.shutdown()
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+    succeeded = [result for result in results if result["ok"]]
+    by_size: dict[str, Any] = {}
+    for slide_count in sorted(deck_sizes):
+        latencies = [
+            result["latency_seconds"]
+            for result in succeeded
+            if result["slide_count"] == slide_count
+        ]
+        by_size[str(slide_count)] = {"requests": len(latencies), **_summary(latencies)}
+
+    llm = get_settings().llm
+    return {
+        "config": {
+            "mode": mode,
+            "requests": requests,
+            "rate": rate,
+            "concurrency": concurrency,
+            "deck_sizes": {str(count): w for count, w in deck_sizes.items()},
+            "seed": seed,
+            "llm_provider": llm.provider,
+            "fake_latency": llm.fake_latency,
+            "fake_latency_jitter": llm.fake_latency_jitter,
+            "fake_error_rate": llm.fake_error_rate,
+        },
+        "requests": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "error_rate": (
+            (len(results) - len(succeeded)) / len(results) if results else 0.0
+        ),
+        "errors": dict(Counter(r["cause"] for r in results if not r["ok"])),
+        "duration_seconds": duration,
+        "throughput_rps": len(succeeded) / duration if duration else 0.0,
+        "slides_per_second": (
+            sum(result["slides"] for result in succeeded) / duration
+            if duration
+            else 0.0
+        ),
+        "latency_seconds": _summary([r["latency_seconds"] for r in succeeded]),
+        "queue_seconds": _summary([r["queue_seconds"] for r in results]),
+        "latency_by_slide_count": by_size,
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "peak_traced_bytes": peak_traced,
+    }
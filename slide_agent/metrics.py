@@ -0,0 +1,315 @@
+"""In-process metrics registry with Prometheus text and JSON exporters."""
+
+import bisect
+import json
+import math
+import os
+import threading
+from collections.abc import Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, TypeVar
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SLIDE_COUNT_BUCKETS = (1, 3, 5, 8, 10, 15, 20, 30, 50)
+RETRIEVAL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+M = TypeVar("M", bound="_Metric")
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+
+    type_name = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        """Order label values like the declared label names."""
+        unknown = labels.keys() - set(self.labels)
+        if unknown:
+            raise ValueError(f"Unknown labels for {self.name}: {sorted(unknown)}")
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def _label_dict(self, key: tuple[str, ...]) -> dict[str, str]:
+        """Map label names to the values of ``key``."""
+        return dict(zip(self.labels, key))
+
+    def _format_labels(self, key: tuple[str, ...], **extra: str) -> str:
+        """Format the label set of ``key`` as ``{name="value",...}``."""
+        pairs = [*zip(self.labels, key), *extra.items()]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def prometheus_lines(self) -> list[str]:
+        """Return the sample lines of the Prometheus text format."""
+        raise NotImplementedError
+
+    def samples(self) -> list[dict[str, Any]]:
+        """Return the samples for the JSON snapshot."""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. decks generated or bytes written."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Increase the counter for the given label values."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Return the current count for the given label values."""
+        return self._values.get(self._key(labels), 0)
+
+    def prometheus_lines(self) -> list[str]:
+        """Return the sample lines of the Prometheus text format."""
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._format_labels(k)} {_number(v)}" for k, v in items]
+
+    def samples(self) -> list[dict[str, Any]]:
+        """Return the samples for the JSON snapshot."""
+        with self._lock:
+            items = sorted(self._values.items())
+        return [{"labels": self._label_dict(k), "value": v} for k, v in items]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (+Inf last), sum, count]
+        self._values: dict[tuple[str, ...], list[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record one observation for the given label values."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels: Any) -> int:
+        """Return the number of observations for the given label values."""
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def _cumulative(self) -> list[tuple[tuple[str, ...], list[int], float, int]]:
+        """Return label key, cumulative bucket counts, sum and count per series."""
+        with self._lock:
+            items = sorted(
+                (key, list(state[0]), state[1], state[2])
+                for key, state in self._values.items()
+            )
+        result = []
+        for key, counts, total, count in items:
+            cumulative, running = [], 0
+            for bucket_count in counts:
+                running += bucket_count
+                cumulative.append(running)
+            result.append((key, cumulative, total, count))
+        return result
+
+    def prometheus_lines(self) -> list[str]:
+        """Return the sample lines of the Prometheus text format."""
+        lines = []
+        for key, cumulative, total, count in self._cumulative():
+            bounds = [*map(_number, self.buckets), "+Inf"]
+            for bound, running in zip(bounds, cumulative):
+                labels = self._format_labels(key, le=bound)
+                lines.append(f"{self.name}_bucket{labels} {running}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_number(total)}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {count}")
+        return lines
+
+    def samples(self) -> list[dict[str, Any]]:
+        """Return the samples for the JSON snapshot."""
+        return [
+            {
+                "labels": self._label_dict(key),
+                "count": count,
+                "sum": total,
+                "buckets": dict(zip([*map(_number, self.buckets), "+Inf"], cumulative)),
+            }
+            for key, cumulative, total, count in self._cumulative()
+        ]
+
+
+class MetricsRegistry:
+    """Collection of metrics exported together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        """Register (or return the existing) counter ``name``."""
+        return self._register(Counter(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Register (or return the existing) histogram ``name``."""
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def _register(self, metric: M) -> M:
+        """Add ``metric`` unless a metric with its name already exists."""
+        with self._lock:
+            existing = self._metrics.setdefault(metric.name, metric)
+        if not isinstance(existing, type(metric)):
+            raise ValueError(f"{metric.name} is already a {existing.type_name}")
+        return existing
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in sorted(self._metrics.values(), key=lambda m: m.name):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.prometheus_lines())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return all metrics as a JSON-serializable dict."""
+        return {
+            metric.name: {
+                "type": metric.type_name,
+                "help": metric.help,
+                "samples": metric.samples(),
+            }
+            for metric in sorted(self._metrics.values(), key=lambda m: m.name)
+        }
+
+    def write_prometheus(self, path: str | Path) -> None:
+        """Write the Prometheus text format, e.g. for node_exporter's textfile."""
+        _write_atomic(Path(path), self.to_prometheus())
+
+    def write_json(self, path: str | Path) -> None:
+        """Write a JSON snapshot of all metrics."""
+        _write_atomic(Path(path), json.dumps(self.snapshot(), indent=2))
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve ``/metrics`` from a background thread; call ``shutdown()`` to stop."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server naming
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    """Format a number the way Prometheus expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """Replace ``path`` so scrapers never read a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+# Default registry the agent, generator and writers report to
+REGISTRY = MetricsRegistry()
+
+DECKS_GENERATED = REGISTRY.counter(
+    "slidev_decks_generated_total", "Agent runs by outcome", ["status"]
+)
+SLIDES_PER_DECK = REGISTRY.histogram(
+    "slidev_slides_per_deck", "Slides in generated decks", buckets=SLIDE_COUNT_BUCKETS
+)
+LLM_LATENCY = REGISTRY.histogram(
+    "slidev_llm_latency_seconds",
+    "LLM call latency by graph node, slide type and model",
+    ["node", "slide_type", "model"],
+)
+LLM_COST = REGISTRY.counter(
+    "slidev_llm_cost_usd_total",
+    "Estimated LLM cost by graph node and model",
+    ["node", "model"],
+)
+LLM_TOKENS = REGISTRY.counter(
+    "slidev_llm_tokens_total",
+    "LLM tokens by graph node and direction",
+    ["node", "kind"],
+)
+RENDER_LATENCY = REGISTRY.histogram(
+    "slidev_render_seconds", "Template rendering time per slide", ["slide_type"]
+)
+RETRIEVAL_LATENCY = REGISTRY.histogram(
+    "slidev_retrieval_seconds",
+    "BM25 passage retrieval time per query",
+    buckets=RETRIEVAL_BUCKETS,
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "slidev_cache_lookups_total",
+    "Cache lookups by cache and result",
+    ["cache", "result"],
+)
+INCREMENTAL_ITEMS = REGISTRY.counter(
+    "slidev_incremental_items_total",
+    "Items of incremental steps, skipped as unchanged or processed",
+    ["step", "result"],
+)
+WRITE_BYTES = REGISTRY.counter(
+    "slidev_write_bytes_total", "Bytes written to deck files", ["file"]
+)
+FAILURES = REGISTRY.counter(
+    "slidev_failures_total", "Failures by pipeline stage and cause", ["stage", "cause"]
+)
@@ -1,9 +1,8 @@
 """Domain models for Slidev Agent."""
 
 from enum import Enum
-from typing import Any
+from typing import Annotated, Any
 
-from langchain_core.tools import tool
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
@@ -101,7 +100,7 @@ class SlideDeck(BaseModel):
     )
 
     @model_validator(mode="after")
-    def validate_slides(self):
+    def validate_slides(self) -> "SlideDeck":
         """Validate that the slide deck has proper structure."""
         if not self.slides:
             raise ValueError("Slide deck must contain at least one slide")
@@ -115,17 +114,36 @@ class SlideDeck(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
 
 
+def merge_metadata(left: dict[str, Any], right: dict[str, Any]) -> dict[str, Any]:
+    """State reducer: nodes return only the metadata keys they add."""
+    return {**left, **right} if right else left
+
+
+def append_slides(
+    left: list["SlideSpec"], right: list["SlideSpec"]
+) -> list["SlideSpec"]:
+    """State reducer: nodes return only the slides they wrote."""
+    return [*left, *right] if right else left
+
+
 class AgentState(BaseModel):
-    """State model for the LangGraph agent."""
+    """State model for the LangGraph agent.
+
+    Nodes return partial updates that are merged by the reducers of
+    ``slides`` and ``metadata``. The graph never stores ``deck``, which
+    would duplicate the slides; it is only set on the result of a run.
+    """
 
     request: TopicRequest = Field(..., description="Original request")
     outline: list[dict[str, Any]] | None = Field(
         default=None, description="Generated outline"
     )
-    slides: list[SlideSpec] | None = Field(default=None, description="Generated slides")
+    slides: Annotated[list[SlideSpec], append_slides] = Field(
+        default_factory=list, description="Generated slides"
+    )
     deck: SlideDeck | None = Field(default=None, description="Final slide deck")
     error: str | None = Field(default=None, description="Error message if any")
-    metadata: dict[str, Any] = Field(
+    metadata: Annotated[dict[str, Any], merge_metadata] = Field(
         default_factory=dict, description="Processing metadata"
     )
 
@@ -163,33 +181,11 @@ class SlideOutlineItem(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True, validate_assignment=True)
 
 
-@tool
-def create_slide_outline(slides: list[dict]) -> dict:
-    """Create a detailed outline for a slide presentation.
+def __getattr__(name: str) -> Any:
+    # create_slide_outline moved to slide_agent.tools so that importing the
+    # models does not pull in langchain_core; keep the old import path working.
+    if name == "create_slide_outline":
+        from slide_agent.tools import create_slide_outline
 
-    Args:
-        slides: List of slide dictionaries, each containing:
-            - title: str - Compelling slide title
-            - slide_type: str - Type: 'title', 'bullets', 'code', 'comparison', 'quote'
-            - content_summary: str - Brief description of slide content
-            - key_points: list[str] - List of specific key points (1-5 items)
-            - notes: str (optional) - Speaker notes or additional context
-
-    Returns:
-        Dictionary containing the validated slide outline
-    """
-    # Validate and return the structured outline
-    validated_slides = []
-
-    for slide in slides:
-        # Ensure required fields are present
-        validated_slide = {
-            "title": slide.get("title", "Untitled Slide"),
-            "slide_type": slide.get("slide_type", "bullets"),
-            "content_summary": slide.get("content_summary", "No description"),
-            "key_points": slide.get("key_points", []),
-            "notes": slide.get("notes", ""),
-        }
-        validated_slides.append(validated_slide)
-
-    return {"slides": validated_slides}
+        return create_slide_outline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,170 @@
+"""CPU and memory profiling of a run: cProfile, collapsed stacks, tracemalloc."""
+
+import contextlib
+import cProfile
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from pathlib import Path
+from types import FrameType
+
+# Sampling rate of the collapsed-stack profiler
+DEFAULT_SAMPLE_INTERVAL = 0.005
+TOP_ALLOCATIONS = 30
+
+
+class StackSampler(threading.Thread):
+    """Samples the stacks of all threads into flamegraph-ready counts.
+
+    cProfile only records caller/callee pairs, so full stacks for the
+    collapsed format (``frame;frame;frame count``) are sampled separately.
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        super().__init__(name="stack-sampler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        names = {}
+        while not self._stop_event.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, top in sys._current_frames().items():
+                if ident == self.ident:
+                    continue
+                frames = []
+                frame: FrameType | None = top
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(
+                        f"{code.co_name} ({Path(code.co_filename).name}:"
+                        f"{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                frames.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the thread to finish."""
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        """Return the samples in collapsed-stack format."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in sorted(self.stacks.items())
+        )
+
+
+class ProfileResult:
+    """Paths of the profile files, filled in when profiling ends."""
+
+    def __init__(self) -> None:
+        self.files: dict[str, str] = {}
+        self.wall_time = 0.0
+        self.peak_memory = 0
+
+
+@contextlib.contextmanager
+def profiled(
+    output_dir: str | Path,
+    name: str = "profile",
+    sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+) -> Iterator[ProfileResult]:
+    """Profile the enclosed code and write the reports to ``output_dir``.
+
+    Writes ``<name>.pstats`` (load with ``pstats`` or snakeviz), a readable
+    ``<name>.cprofile.txt``, ``<name>.collapsed.txt`` for flamegraph.pl or
+    speedscope, and ``<name>.alloc.txt`` with the top tracemalloc allocations.
+    Only the calling thread is profiled by cProfile; the stack sampler sees
+    all threads. Work in child processes is not covered.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    result = ProfileResult()
+
+    started_tracemalloc = not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start(10)
+    tracemalloc.reset_peak()
+    sampler = StackSampler(sample_interval)
+    profiler = cProfile.Profile()
+
+    start = time.perf_counter()
+    sampler.start()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        sampler.stop()
+        result.wall_time = time.perf_counter() - start
+        snapshot = tracemalloc.take_snapshot()
+        result.peak_memory = tracemalloc.get_traced_memory()[1]
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+        result.files = _write_reports(
+            output_dir, name, profiler, sampler, snapshot, result
+        )
+
+
+def _write_reports(
+    output_dir: Path,
+    name: str,
+    profiler: cProfile.Profile,
+    sampler: StackSampler,
+    snapshot: tracemalloc.Snapshot,
+    result: ProfileResult,
+) -> dict[str, str]:
+    """Write all profile reports and return their paths."""
+    files = {
+        "pstats": output_dir / f"{name}.pstats",
+        "cprofile": output_dir / f"{name}.cprofile.txt",
+        "collapsed": output_dir / f"{name}.collapsed.txt",
+        "alloc": output_dir / f"{name}.alloc.txt",
+    }
+
+    profiler.dump_stats(files["pstats"])
+    with open(files["cprofile"], "w") as f:
+        stats = pstats.Stats(profiler, stream=f)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+
+    files["collapsed"].write_text(sampler.collapsed())
+    files["alloc"].write_text(_allocation_report(snapshot, result))
+
+    return {kind: str(path) for kind, path in files.items()}
+
+
+def _allocation_report(snapshot: tracemalloc.Snapshot, result: ProfileResult) -> str:
+    """Format the top allocations of a tracemalloc snapshot."""
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            # Leave out the stack sampler's own bookkeeping
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ]
+    )
+    statistics = snapshot.statistics("lineno")
+
+    lines = [
+        f"Wall time: {result.wall_time:.3f} s",
+        f"Peak traced memory: {result.peak_memory / 1024:.1f} KiB",
+        f"Live traced memory: {sum(s.size for s in statistics) / 1024:.1f} KiB",
+        "",
+        f"Top {TOP_ALLOCATIONS} allocation sites:",
+    ]
+    for index, stat in enumerate(statistics[:TOP_ALLOCATIONS], 1):
+        frame = stat.traceback[0]
+        lines.append(
+            f"{index:3}. {frame.filename}:{frame.lineno}: "
+            f"{stat.size / 1024:.1f} KiB in {stat.count} blocks"
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,460 @@
+"""Local BM25 retrieval over a directory of markdown and text files.
+
+Source files are split into passages whose term counts are kept in SQLite,
+so an update only reads files whose mtime or size changed. The passages are
+compiled into one compact segment file that is memory-mapped for queries:
+
+    header    magic, passage and term counts, average passage length and
+              the offsets of the sections below
+    lexicon   one ``<QQII`` entry per term, sorted by term: term offset,
+              postings offset, document frequency, term length
+    terms     the UTF-8 terms
+    postings  per term ``df`` passage ids (uint32), then ``df`` BM25
+              impacts (float32), ordered by impact
+    passages  one ``<QIII`` entry per passage: text offset, text length,
+              heading length, source number
+    texts     the UTF-8 heading and text of each passage
+    sources   JSON list of the source paths
+
+Impacts are precomputed BM25 term scores, so a query only sums impacts.
+Postings are read from the highest impact down and cut off after
+``max_postings`` per term, which bounds the work per query regardless of
+corpus size; the cut only drops the weakest matches of common terms.
+"""
+
+import functools
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from slide_agent import metrics
+from slide_agent.spans import span
+
+INDEX_FILE = "index.bin"
+SOURCES_DB = "sources.sqlite"
+SOURCE_SUFFIXES = (".md", ".markdown", ".txt")
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_MAGIC = b"SLBM25\x00\x01"
+_HEADER = struct.Struct("<8sIId6Q")
+_LEXICON_ENTRY = struct.Struct("<QQII")
+_PASSAGE_ENTRY = struct.Struct("<QIII")
+_TOKEN = re.compile(r"\w+")
+_HEADING = re.compile(r"^#{1,6}\s+(.*)$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS passages (
+    path TEXT NOT NULL REFERENCES files (path) ON DELETE CASCADE,
+    ordinal INTEGER NOT NULL,
+    heading TEXT NOT NULL,
+    text TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    terms TEXT NOT NULL,
+    PRIMARY KEY (path, ordinal)
+);
+"""
+
+
+class Passage(NamedTuple):
+    """A retrieved passage and where it comes from."""
+
+    source: str
+    heading: str
+    text: str
+    score: float
+
+    @property
+    def citation(self) -> str:
+        """Short reference to the passage for speaker notes."""
+        return f"{self.source} ({self.heading})" if self.heading else self.source
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase terms, dropping single characters."""
+    return [token for token in _TOKEN.findall(text.lower()) if len(token) > 1]
+
+
+def split_passages(text: str, passage_words: int = 120) -> list[tuple[str, str]]:
+    """Split a markdown document into ``(heading, text)`` passages.
+
+    Paragraphs below the same heading are joined until a passage has about
+    ``passage_words`` words; every heading starts a new passage and longer
+    paragraphs are cut into chunks of ``passage_words`` words.
+    """
+    passages: list[tuple[str, str]] = []
+    heading = ""
+    blocks: list[str] = []
+    lines: list[str] = []
+    words = 0
+
+    def flush() -> None:
+        nonlocal blocks, words
+        if blocks:
+            passages.append((heading, "\n\n".join(blocks)))
+        blocks, words = [], 0
+
+    def end_paragraph() -> None:
+        nonlocal words
+        paragraph = " ".join(lines).split()
+        lines.clear()
+        for start in range(0, len(paragraph), passage_words):
+            chunk = paragraph[start : start + passage_words]
+            if words and words + len(chunk) > passage_words:
+                flush()
+            blocks.append(" ".join(chunk))
+            words += len(chunk)
+
+    for line in text.splitlines():
+        if match := _HEADING.match(line.strip()):
+            end_paragraph()
+            flush()
+            heading = match.group(1).strip()
+        elif line.strip():
+            lines.append(line.strip())
+        else:
+            end_paragraph()
+    end_paragraph()
+    flush()
+    return passages
+
+
+class _Segment(NamedTuple):
+    """A mapped segment and its header, read together for one query."""
+
+    view: memoryview
+    passage_count: int
+    term_count: int
+    offsets: tuple[int, ...]
+    sources: tuple[str, ...]
+
+
+class RetrievalIndex:
+    """BM25 index over the text files below ``source_dir``.
+
+    ``update`` brings the index in sync with the files, ``search`` returns
+    the best passages for a query from the memory-mapped segment.
+    """
+
+    def __init__(
+        self,
+        source_dir: str | Path,
+        index_dir: str | Path,
+        passage_words: int = 120,
+        max_postings: int = 1000,
+    ) -> None:
+        self.source_dir = Path(source_dir)
+        self.index_dir = Path(index_dir)
+        self.passage_words = passage_words
+        self.max_postings = max_postings
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(
+            self.index_dir / SOURCES_DB, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(_SCHEMA)
+        self._mmap: mmap.mmap | None = None
+        self._segment: _Segment | None = None
+
+    def close(self) -> None:
+        """Unmap the segment and close the database connection."""
+        self._unmap()
+        self.conn.close()
+
+    def __enter__(self) -> "RetrievalIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def segment_path(self) -> Path:
+        return self.index_dir / INDEX_FILE
+
+    def update(self) -> dict[str, int]:
+        """Re-read changed source files and rebuild the segment if needed.
+
+        Files are compared by mtime and size; unchanged files are neither
+        read nor tokenized again. The segment is rewritten atomically, so
+        readers mapping the old one are not disturbed.
+        """
+        with self._lock:
+            return self._update()
+
+    def _update(self) -> dict[str, int]:
+        known = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in self.conn.execute(
+                "SELECT path, mtime_ns, size FROM files"
+            )
+        }
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+        seen = set()
+
+        with self.conn:
+            for file in sorted(self._source_files()):
+                path = file.relative_to(self.source_dir).as_posix()
+                seen.add(path)
+                stat = file.stat()
+                if known.get(path) == (stat.st_mtime_ns, stat.st_size):
+                    stats["unchanged"] += 1
+                    continue
+                stats["updated" if path in known else "added"] += 1
+                self._store_file(path, file, stat)
+            for path in known.keys() - seen:
+                self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                stats["removed"] += 1
+
+        changed = stats["added"] + stats["updated"] + stats["removed"]
+        if changed or not self.segment_path.exists():
+            self._compile()
+        return stats
+
+    def _source_files(self) -> list[Path]:
+        """List the markdown and text files below the source directory."""
+        if not self.source_dir.is_dir():
+            return []
+        return [
+            file
+            for file in self.source_dir.rglob("*")
+            if file.suffix.lower() in SOURCE_SUFFIXES and file.is_file()
+        ]
+
+    def _store_file(self, path: str, file: Path, stat: os.stat_result) -> None:
+        """Split a source file into passages and store their term counts."""
+        text = file.read_text(encoding="utf-8", errors="replace")
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files (path, mtime_ns, size) VALUES (?, ?, ?)",
+            (path, stat.st_mtime_ns, stat.st_size),
+        )
+        self.conn.execute("DELETE FROM passages WHERE path = ?", (path,))
+        rows = []
+        for ordinal, (heading, body) in enumerate(
+            split_passages(text, self.passage_words)
+        ):
+            terms = Counter(tokenize(f"{heading}\n{body}"))
+            if terms:
+                rows.append(
+                    (
+                        path,
+                        ordinal,
+                        heading,
+                        body,
+                        sum(terms.values()),
+                        json.dumps(terms, ensure_ascii=False),
+                    )
+                )
+        self.conn.executemany(
+            "INSERT INTO passages (path, ordinal, heading, text, length, terms) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def _compile(self) -> None:
+        """Write the memory-mapped segment from the stored passages."""
+        with span("retrieval.compile"):
+            sources: list[str] = []
+            source_numbers: dict[str, int] = {}
+            passages = bytearray()
+            texts = bytearray()
+            lengths: list[int] = []
+            postings: dict[str, list[tuple[int, int]]] = defaultdict(list)
+
+            rows = self.conn.execute(
+                "SELECT path, heading, text, length, terms FROM passages "
+                "ORDER BY path, ordinal"
+            )
+            for pid, (path, heading, body, length, terms) in enumerate(rows):
+                if path not in source_numbers:
+                    source_numbers[path] = len(sources)
+                    sources.append(path)
+                heading_bytes = heading.encode()
+                text_bytes = heading_bytes + body.encode()
+                passages += _PASSAGE_ENTRY.pack(
+                    len(texts),
+                    len(text_bytes),
+                    len(heading_bytes),
+                    source_numbers[path],
+                )
+                texts += text_bytes
+                lengths.append(length)
+                for term, tf in json.loads(terms).items():
+                    postings[term].append((pid, tf))
+
+            count = len(lengths)
+            avgdl = sum(lengths) / count if count else 0.0
+            lexicon = bytearray()
+            term_blob = bytearray()
+            posting_blob = bytearray()
+            for term in sorted(postings, key=str.encode):
+                entries = postings[term]
+                df = len(entries)
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                scored = sorted(
+                    (
+                        (
+                            idf
+                            * tf
+                            * (K1 + 1)
+                            / (tf + K1 * (1 - B + B * lengths[pid] / avgdl)),
+                            pid,
+                        )
+                        for pid, tf in entries
+                    ),
+                    reverse=True,
+                )
+                term_bytes = term.encode()
+                lexicon += _LEXICON_ENTRY.pack(
+                    len(term_blob), len(posting_blob), df, len(term_bytes)
+                )
+                term_blob += term_bytes
+                posting_blob += struct.pack(f"<{df}I", *(pid for _, pid in scored))
+                posting_blob += struct.pack(
+                    f"<{df}f", *(impact for impact, _ in scored)
+                )
+
+            sections = [lexicon, term_blob, posting_blob, passages, texts]
+            offsets = []
+            position = _HEADER.size
+            for section in sections:
+                # Keep every section 8-byte aligned for the typed views
+                section += b"\0" * (-len(section) % 8)
+                offsets.append(position)
+                position += len(section)
+            offsets.append(position)
+            header = _HEADER.pack(_MAGIC, count, len(postings), avgdl, *offsets)
+
+            # Unique, so processes compiling the same index never share it
+            tmp = self.segment_path.with_name(f".{INDEX_FILE}.{uuid.uuid4().hex}.tmp")
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(header)
+                    for section in sections:
+                        f.write(section)
+                    f.write(json.dumps(sources, ensure_ascii=False).encode())
+                os.replace(tmp, self.segment_path)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+        # Searches still running on the old snapshot keep it alive until done
+        self._segment = None
+        self._mmap = None
+
+    def _unmap(self) -> None:
+        """Release the current segment mapping."""
+        if self._segment is not None:
+            self._segment.view.release()
+            self._segment = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _map(self) -> _Segment:
+        """Map the segment file, compiling it first if it does not exist.
+
+        The returned snapshot stays valid for a query even if another thread
+        recompiles the index meanwhile.
+        """
+        with self._lock:
+            if self._segment is None:
+                self._segment = self._map_segment()
+            return self._segment
+
+    def _map_segment(self) -> _Segment:
+        if not self.segment_path.exists():
+            self._update()
+        with open(self.segment_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, count, terms, _, *offsets = _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            view.release()
+            self._mmap.close()
+            self._mmap = None
+            raise ValueError(f"Not a retrieval index: {self.segment_path}")
+        sources = json.loads(bytes(view[offsets[5] :]))
+        return _Segment(view, count, terms, tuple(offsets), tuple(sources))
+
+    @staticmethod
+    def _lookup(segment: _Segment, term: bytes) -> tuple[int, int] | None:
+        """Binary-search the lexicon for ``term``: (postings offset, df)."""
+        view = segment.view
+        lexicon, terms_start = segment.offsets[0], segment.offsets[1]
+        low, high = 0, segment.term_count
+        while low < high:
+            middle = (low + high) // 2
+            offset, postings, df, length = _LEXICON_ENTRY.unpack_from(
+                view, lexicon + middle * _LEXICON_ENTRY.size
+            )
+            candidate = view[terms_start + offset : terms_start + offset + length]
+            if candidate == term:
+                return segment.offsets[2] + postings, df
+            if bytes(candidate) < term:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def search(self, query: str, k: int = 3) -> list[Passage]:
+        """Return the ``k`` best passages for ``query`` by BM25."""
+        start_time = time.perf_counter()
+        segment = self._map()
+        view = segment.view
+        if not segment.passage_count:
+            return []
+        scores: dict[int, float] = defaultdict(float)
+        for term, weight in Counter(tokenize(query)).items():
+            found = self._lookup(segment, term.encode())
+            if found is None:
+                continue
+            start, df = found
+            limit = min(df, self.max_postings)
+            pids = view[start : start + 4 * limit].cast("I")
+            impacts = view[start + 4 * df : start + 4 * (df + limit)].cast("f")
+            for pid, impact in zip(pids, impacts):
+                scores[pid] += impact * weight
+            pids.release()
+            impacts.release()
+
+        results = []
+        passages, texts = segment.offsets[3], segment.offsets[4]
+        for pid, score in heapq.nlargest(k, scores.items(), key=lambda item: item[1]):
+            offset, length, heading_length, source = _PASSAGE_ENTRY.unpack_from(
+                view, passages + pid * _PASSAGE_ENTRY.size
+            )
+            raw = bytes(view[texts + offset : texts + offset + length])
+            results.append(
+                Passage(
+                    source=segment.sources[source],
+                    heading=raw[:heading_length].decode(),
+                    text=raw[heading_length:].decode(),
+                    score=score,
+                )
+            )
+        metrics.RETRIEVAL_LATENCY.observe(time.perf_counter() - start_time)
+        return results
+
+
+@functools.cache
+def get_retrieval_index(source_dir: str, index_dir: str) -> RetrievalIndex:
+    """Return the shared index for ``source_dir``, opened once per process."""
+    return RetrievalIndex(source_dir, index_dir)
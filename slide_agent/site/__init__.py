@@ -0,0 +1,14 @@
+"""Static site assembly for built decks."""
+
+from .builder import SiteBuilder
+from .catalog import DeckCatalog
+from .index_page import render_site_index, write_site_index
+from .postprocess import SitePostprocessor
+
+__all__ = [
+    "DeckCatalog",
+    "SiteBuilder",
+    "SitePostprocessor",
+    "render_site_index",
+    "write_site_index",
+]
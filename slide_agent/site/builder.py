@@ -0,0 +1,292 @@
+"""Incremental, parallel Slidev builds for many deck directories."""
+
+import hashlib
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from slide_agent import metrics
+
+from .postprocess import is_generated
+
+DEFAULT_BUILD_COMMAND = "npm run build -- --base {base}"
+DEFAULT_INSTALL_COMMAND = "npm install"
+BUILD_STATE_NAME = ".build-state.json"
+
+# Deck names become URL path segments, so only plain ASCII names are built
+URL_SAFE_NAME = re.compile(r"^[a-z0-9._-]+$")
+
+
+class SiteBuilder:
+    """Builds Slidev decks and assembles them into one static site.
+
+    Each deck's inputs are hashed and decks whose hash matches the last
+    successful build are skipped. The remaining builds run in parallel and
+    their ``dist`` folders are synced into the site incrementally.
+    """
+
+    def __init__(
+        self,
+        decks_root: str | Path = "slides",
+        output_dir: str | Path = "dist",
+        base_url: str = "/",
+        build_command: str = DEFAULT_BUILD_COMMAND,
+        install_command: str | None = DEFAULT_INSTALL_COMMAND,
+        workers: int | None = None,
+        state_file: str | Path | None = None,
+    ):
+        """Initialize the site builder.
+
+        ``build_command`` runs inside each deck directory; ``{base}``,
+        ``{name}`` and ``{deck}`` are replaced with the deck's base URL, site
+        name and path. ``install_command`` runs once in a workspace root, or
+        in each deck without ``node_modules``; ``None`` disables installs.
+        """
+        self.decks_root = Path(decks_root)
+        self.output_dir = Path(output_dir)
+        self.base_url = "/" + base_url.strip("/") + "/" if base_url.strip("/") else "/"
+        self.build_command = build_command
+        self.install_command = install_command
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.state_file = (
+            Path(state_file) if state_file else self.decks_root / BUILD_STATE_NAME
+        )
+
+    @staticmethod
+    def site_name(deck_dir: Path) -> str:
+        """Return the site path segment for a deck directory."""
+        return deck_dir.name.removeprefix("presentation-")
+
+    def discover_decks(self) -> list[Path]:
+        """Find deck directories containing slides.md and package.json."""
+        decks = []
+        for path in sorted(self.decks_root.iterdir()):
+            if (path / "slides.md").is_file() and (path / "package.json").is_file():
+                decks.append(path)
+        return decks
+
+    def hash_inputs(self, deck_dir: Path) -> str:
+        """Hash everything that influences a deck's build output."""
+        digest = hashlib.sha256()
+        digest.update(self.build_command.encode())
+        digest.update(self.base_url.encode())
+
+        inputs = [deck_dir / "slides.md", deck_dir / "package.json"]
+        assets_dir = deck_dir / "assets"
+        if assets_dir.is_dir():
+            inputs.extend(sorted(p for p in assets_dir.rglob("*") if p.is_file()))
+        lockfile = deck_dir.parent / "package-lock.json"
+        if lockfile.is_file():
+            inputs.append(lockfile)
+
+        for path in inputs:
+            digest.update(str(path.relative_to(deck_dir.parent)).encode())
+            digest.update(b"\0")
+            digest.update(path.read_bytes())
+            digest.update(b"\0")
+
+        digest.update(self._deck_theme(deck_dir).encode())
+        digest.update(self._workspace_dependencies(deck_dir.parent).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _workspace_dependencies(root: Path) -> str:
+        """Return the shared dependencies of a workspace root, if any.
+
+        Only the dependency sections count, so registering another deck in the
+        workspace does not invalidate every other deck.
+        """
+        try:
+            manifest = json.loads((root / "package.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return ""
+        if not isinstance(manifest, dict) or "workspaces" not in manifest:
+            return ""
+        sections = {
+            key: manifest.get(key) for key in ("dependencies", "devDependencies")
+        }
+        return json.dumps(sections, sort_keys=True)
+
+    @staticmethod
+    def _deck_theme(deck_dir: Path) -> str:
+        """Read the deck theme from meta.json, if available."""
+        try:
+            meta = json.loads((deck_dir / "meta.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return ""
+        return str(meta.get("theme", ""))
+
+    def load_state(self) -> dict[str, str]:
+        """Load input hashes of the last successful builds."""
+        try:
+            state: dict[str, str] = json.loads(
+                self.state_file.read_text(encoding="utf-8")
+            )
+        except (OSError, ValueError):
+            return {}
+        return state
+
+    def save_state(self, state: dict[str, str]) -> None:
+        """Persist input hashes of successful builds."""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(state, indent=2, sort_keys=True))
+        os.replace(tmp_file, self.state_file)
+
+    def build(
+        self, only: list[str] | None = None, force: bool = False
+    ) -> dict[str, Any]:
+        """Build changed decks in parallel and sync all outputs into the site.
+
+        ``only`` restricts the build to the given deck directory or site names.
+        """
+        decks = []
+        skipped_names = []
+        for deck_dir in self.discover_decks():
+            name = self.site_name(deck_dir)
+            if only and deck_dir.name not in only and name not in only:
+                continue
+            if not URL_SAFE_NAME.match(name):
+                skipped_names.append(name)
+                continue
+            decks.append(deck_dir)
+
+        state = self.load_state()
+        hashes = {deck_dir: self.hash_inputs(deck_dir) for deck_dir in decks}
+        to_build = [
+            deck_dir
+            for deck_dir in decks
+            if force
+            or state.get(deck_dir.name) != hashes[deck_dir]
+            or not (deck_dir / "dist").is_dir()
+        ]
+
+        metrics.INCREMENTAL_ITEMS.inc(
+            len(decks) - len(to_build), step="build", result="skipped"
+        )
+        metrics.INCREMENTAL_ITEMS.inc(len(to_build), step="build", result="processed")
+
+        failed: dict[str, str] = {}
+        if to_build:
+            self._install(to_build)
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for deck_dir, error in zip(
+                    to_build, pool.map(self._build_deck, to_build)
+                ):
+                    if error is None:
+                        state[deck_dir.name] = hashes[deck_dir]
+                    else:
+                        state.pop(deck_dir.name, None)
+                        failed[deck_dir.name] = error
+                        metrics.FAILURES.inc(stage="build", cause="build_command")
+            self.save_state(state)
+
+        copied = 0
+        for deck_dir in decks:
+            if deck_dir.name in failed or not (deck_dir / "dist").is_dir():
+                continue
+            copied += self.sync_tree(
+                deck_dir / "dist",
+                self.output_dir / self.site_name(deck_dir),
+                keep=is_generated,
+            )
+
+        return {
+            "decks": [deck_dir.name for deck_dir in decks],
+            "built": [d.name for d in to_build if d.name not in failed],
+            "unchanged": [d.name for d in decks if d not in to_build],
+            "failed": failed,
+            "skipped_names": skipped_names,
+            "files_copied": copied,
+            "output_dir": str(self.output_dir),
+        }
+
+    def _install(self, decks: list[Path]) -> None:
+        """Install npm dependencies once per workspace, or per deck otherwise."""
+        if not self.install_command:
+            return
+
+        if self._workspace_dependencies(self.decks_root):
+            self._run(self.install_command, self.decks_root)
+            return
+
+        for deck_dir in decks:
+            if not (deck_dir / "node_modules").is_dir():
+                self._run(self.install_command, deck_dir)
+
+    def _build_deck(self, deck_dir: Path) -> str | None:
+        """Build one deck; return an error message on failure."""
+        command = self.build_command.format(
+            base=f"{self.base_url}{self.site_name(deck_dir)}/",
+            name=self.site_name(deck_dir),
+            deck=str(deck_dir),
+        )
+        try:
+            self._run(command, deck_dir)
+        except subprocess.CalledProcessError as e:
+            output = (e.stderr or e.stdout or "").strip().splitlines()
+            return f"exit code {e.returncode}: " + "\n".join(output[-5:])
+        return None
+
+    @staticmethod
+    def _run(command: str, cwd: Path) -> None:
+        """Run a shell-free command and raise on failure."""
+        subprocess.run(
+            shlex.split(command), cwd=cwd, check=True, capture_output=True, text=True
+        )
+
+    @staticmethod
+    def sync_tree(
+        source: Path, target: Path, keep: Callable[[Path], bool] | None = None
+    ) -> int:
+        """Mirror ``source`` into ``target``, touching only changed files.
+
+        Files are hardlinked where possible and copied otherwise. Files that
+        no longer exist in ``source`` are removed unless ``keep`` accepts
+        them. Returns the number of files linked or copied.
+        """
+        changed = 0
+        expected = set()
+
+        for src in source.rglob("*"):
+            if not src.is_file():
+                continue
+            relative = src.relative_to(source)
+            expected.add(relative)
+            dst = target / relative
+
+            if dst.exists():
+                if os.path.samefile(src, dst):
+                    continue
+                src_stat, dst_stat = src.stat(), dst.stat()
+                if (
+                    src_stat.st_size == dst_stat.st_size
+                    and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+                ):
+                    continue
+                dst.unlink()
+
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+            changed += 1
+
+        if target.is_dir():
+            for dst in sorted(target.rglob("*"), reverse=True):
+                relative = dst.relative_to(target)
+                if dst.is_file() and relative not in expected:
+                    if keep is None or not keep(dst):
+                        dst.unlink()
+                elif dst.is_dir() and not any(dst.iterdir()):
+                    dst.rmdir()
+
+        return changed
@@ -0,0 +1,230 @@
+"""SQLite catalog of generated decks, refreshed incrementally from meta.json."""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+from slide_agent import metrics
+
+CATALOG_NAME = ".catalog.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    name TEXT NOT NULL,
+    title TEXT NOT NULL,
+    subtitle TEXT,
+    topic TEXT COLLATE NOCASE,
+    language TEXT COLLATE NOCASE,
+    audience TEXT COLLATE NOCASE,
+    theme TEXT COLLATE NOCASE,
+    slide_count INTEGER NOT NULL DEFAULT 0,
+    generated_at TEXT,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS decks_root ON decks (root);
+CREATE INDEX IF NOT EXISTS decks_topic ON decks (topic);
+CREATE INDEX IF NOT EXISTS decks_language ON decks (language);
+CREATE INDEX IF NOT EXISTS decks_theme ON decks (theme);
+"""
+
+_COLUMNS = [
+    "path",
+    "root",
+    "name",
+    "title",
+    "subtitle",
+    "topic",
+    "language",
+    "audience",
+    "theme",
+    "slide_count",
+    "generated_at",
+    "mtime_ns",
+    "size",
+    "content_hash",
+]
+
+# Decks generated before the audience was stored only carry it in the subtitle
+_AUDIENCE_SUBTITLE = re.compile(r"^For (.+) audience$")
+
+
+class DeckCatalog:
+    """Indexed catalog of deck metadata for fast listing and filtering.
+
+    ``refresh`` only stats each ``meta.json``; files are read and parsed again
+    only when their mtime or size changed, and rows are rewritten only when
+    the content hash differs.
+    """
+
+    def __init__(self, db_path: str | Path):
+        """Open (and create if needed) the catalog database."""
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> "DeckCatalog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def refresh(self, decks_root: str | Path) -> dict[str, int]:
+        """Bring the catalog in sync with the decks below ``decks_root``."""
+        root = str(Path(decks_root).resolve())
+        known = {
+            row["path"]: row
+            for row in self.conn.execute(
+                "SELECT path, mtime_ns, size, content_hash FROM decks WHERE root = ?",
+                (root,),
+            )
+        }
+        stats = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+        seen = set()
+
+        with self.conn:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        continue
+                    meta_path = os.path.join(entry.path, "meta.json")
+                    try:
+                        stat = os.stat(meta_path)
+                    except FileNotFoundError:
+                        continue
+
+                    seen.add(entry.path)
+                    row = known.get(entry.path)
+                    if (
+                        row is not None
+                        and row["mtime_ns"] == stat.st_mtime_ns
+                        and row["size"] == stat.st_size
+                    ):
+                        stats["unchanged"] += 1
+                        continue
+
+                    data = Path(meta_path).read_bytes()
+                    content_hash = hashlib.sha256(data).hexdigest()
+                    if row is not None and row["content_hash"] == content_hash:
+                        # Touched but not changed: only remember the new stat
+                        self.conn.execute(
+                            "UPDATE decks SET mtime_ns = ?, size = ? WHERE path = ?",
+                            (stat.st_mtime_ns, stat.st_size, entry.path),
+                        )
+                        stats["unchanged"] += 1
+                        continue
+
+                    try:
+                        meta = json.loads(data)
+                    except ValueError:
+                        continue
+                    values = self._row_values(entry, root, meta, stat, content_hash)
+                    self.conn.execute(
+                        f"INSERT OR REPLACE INTO decks ({', '.join(_COLUMNS)}) "
+                        f"VALUES ({', '.join('?' for _ in _COLUMNS)})",
+                        values,
+                    )
+                    stats["added" if row is None else "updated"] += 1
+
+            for path in known.keys() - seen:
+                self.conn.execute("DELETE FROM decks WHERE path = ?", (path,))
+                stats["removed"] += 1
+
+        metrics.INCREMENTAL_ITEMS.inc(
+            stats["unchanged"], step="catalog", result="skipped"
+        )
+        metrics.INCREMENTAL_ITEMS.inc(
+            stats["added"] + stats["updated"], step="catalog", result="processed"
+        )
+        return stats
+
+    @staticmethod
+    def _row_values(
+        entry: os.DirEntry[str],
+        root: str,
+        meta: dict[str, Any],
+        stat: os.stat_result,
+        content_hash: str,
+    ) -> list[Any]:
+        """Extract the catalog columns from a parsed meta.json."""
+        deck_metadata = meta.get("metadata") or {}
+        subtitle = meta.get("subtitle")
+
+        audience = deck_metadata.get("audience")
+        if audience is None and subtitle:
+            match = _AUDIENCE_SUBTITLE.match(subtitle)
+            audience = match.group(1) if match else None
+
+        return [
+            entry.path,
+            root,
+            entry.name,
+            meta.get("title") or entry.name,
+            subtitle,
+            deck_metadata.get("topic"),
+            deck_metadata.get("language"),
+            audience,
+            meta.get("theme"),
+            meta.get("slide_count") or len(meta.get("slides", [])),
+            meta.get("generated_at"),
+            stat.st_mtime_ns,
+            stat.st_size,
+            content_hash,
+        ]
+
+    def search(
+        self,
+        topic: str | None = None,
+        language: str | None = None,
+        theme: str | None = None,
+        audience: str | None = None,
+        query: str | None = None,
+        decks_root: str | Path | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """List decks matching all given filters, newest first.
+
+        ``topic``, ``language``, ``theme`` and ``audience`` match exactly
+        (case-insensitive) using the indexes; ``query`` is a substring search
+        over title, subtitle and topic.
+        """
+        clauses = []
+        params: list[Any] = []
+        for column, value in (
+            ("topic", topic),
+            ("language", language),
+            ("theme", theme),
+            ("audience", audience),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if decks_root is not None:
+            clauses.append("root = ?")
+            params.append(str(Path(decks_root).resolve()))
+        if query:
+            clauses.append("(title LIKE ? OR subtitle LIKE ? OR topic LIKE ?)")
+            params.extend([f"%{query}%"] * 3)
+
+        sql = "SELECT * FROM decks"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY generated_at DESC, name"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [dict(row) for row in self.conn.execute(sql, params)]
@@ -0,0 +1,117 @@
+"""Site index page generated from the deck catalog."""
+
+import os
+from pathlib import Path
+from typing import Any
+
+from jinja2 import Environment, FileSystemLoader
+
+from .builder import URL_SAFE_NAME, SiteBuilder
+from .catalog import CATALOG_NAME, DeckCatalog
+
+_LANGUAGE_LABELS = {
+    "de": "🇩🇪 Deutsch",
+    "en": "🇺🇸 English",
+    "fr": "🇫🇷 Français",
+    "es": "🇪🇸 Español",
+}
+
+_VIEW_TEXT = {
+    "de": "Präsentation anzeigen →",
+    "fr": "Voir la présentation →",
+}
+
+# Later entries win, mirroring the keyword order of the old showcase script
+_TOPIC_EMOJIS = [
+    (("python", "function"), "🐍"),
+    (("machine", "learning", "ml"), "🤖"),
+    (("web", "development"), "🌐"),
+    (("data", "science"), "📈"),
+    (("neural", "network"), "🧠"),
+    (("deep",), "🔥"),
+]
+
+
+def _card(deck: dict[str, Any]) -> dict[str, Any]:
+    """Add display fields for a catalog row."""
+    language = (deck.get("language") or "en").lower()
+    title = deck["title"].lower()
+
+    emoji = "📊"
+    for keywords, candidate in _TOPIC_EMOJIS:
+        if any(keyword in title for keyword in keywords):
+            emoji = candidate
+
+    audience = deck.get("audience")
+    return {
+        **deck,
+        "site_name": SiteBuilder.site_name(Path(deck["path"])),
+        "emoji": emoji,
+        "language_label": _LANGUAGE_LABELS.get(language, language.upper()),
+        "audience_label": f"🎓 {audience}" if audience else "🎯 General",
+        "view_text": _VIEW_TEXT.get(language, "View Presentation →"),
+    }
+
+
+def render_site_index(
+    decks: list[dict[str, Any]],
+    title: str = "Slidev Agent - AI-Powered Slide Generation",
+    templates_dir: Path | None = None,
+) -> str:
+    """Render the site index HTML for catalog rows."""
+    if templates_dir is None:
+        templates_dir = Path(__file__).parent.parent / "templates"
+
+    env = Environment(loader=FileSystemLoader(str(templates_dir)), autoescape=True)
+    template = env.get_template("site_index.html.j2")
+    return template.render(title=title, decks=[_card(deck) for deck in decks])
+
+
+def write_site_index(
+    decks_root: str | Path,
+    output_file: str | Path,
+    site_dir: str | Path | None = None,
+    catalog_path: str | Path | None = None,
+    **filters: Any,
+) -> dict[str, Any]:
+    """Refresh the catalog and write the site index if it changed.
+
+    Decks are listed if their site name is URL-safe and, when ``site_dir`` is
+    given, if they were built into it. ``filters`` are passed to
+    ``DeckCatalog.search``.
+    """
+    decks_root = Path(decks_root)
+    output_file = Path(output_file)
+    catalog_path = Path(catalog_path) if catalog_path else decks_root / CATALOG_NAME
+
+    with DeckCatalog(catalog_path) as catalog:
+        refresh_stats = catalog.refresh(decks_root)
+        rows = catalog.search(decks_root=decks_root, **filters)
+
+    decks = []
+    for row in rows:
+        name = SiteBuilder.site_name(Path(row["path"]))
+        if not URL_SAFE_NAME.match(name):
+            continue
+        if site_dir is not None and not (Path(site_dir) / name).is_dir():
+            continue
+        decks.append(row)
+
+    html = render_site_index(decks)
+
+    try:
+        changed = output_file.read_text(encoding="utf-8") != html
+    except FileNotFoundError:
+        changed = True
+    if changed:
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = output_file.with_name(f".{output_file.name}.tmp")
+        tmp_file.write_text(html, encoding="utf-8")
+        os.replace(tmp_file, output_file)
+
+    return {
+        "index_file": str(output_file),
+        "deck_count": len(decks),
+        "written": changed,
+        "catalog": refresh_stats,
+    }
@@ -0,0 +1,432 @@
+"""Post-build optimization of the static site for long-lived caching.
+
+After the decks are built and the index page is written, every file in the
+site is processed once:
+
+- Vite already emits content-hashed names below ``assets/``; these files are
+  served as immutable. Other static files get a content-hashed hardlink
+  (``logo.png`` → ``logo.1a2b3c4d5e.png``) and references to them in HTML
+  and CSS are rewritten to the hashed name.
+- Text files get gzip and, if the ``brotli`` package is installed, brotli
+  precompressed siblings (``app.js.gz``, ``app.js.br``) for servers and CDNs
+  that serve precompressed files.
+- ``asset-manifest.json`` maps every file to its cache-busted path, digest and
+  encodings; ``_headers`` carries the ``Cache-Control`` of each file in the
+  format of Netlify and Cloudflare Pages.
+
+Files whose size and mtime match the last run are skipped, the rest are
+processed in parallel.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote, unquote, urlsplit
+
+from slide_agent import metrics
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+MANIFEST_NAME = "asset-manifest.json"
+HEADERS_NAME = "_headers"
+POSTPROCESS_STATE_NAME = ".postprocess-state.json"
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, max-age=0, must-revalidate"
+SHORT_LIVED = "public, max-age=3600"
+
+# Smaller files gain less from compression than the extra lookup costs
+MIN_COMPRESS_SIZE = 1024
+COMPRESSIBLE_SUFFIXES = {
+    ".css",
+    ".html",
+    ".js",
+    ".json",
+    ".map",
+    ".mjs",
+    ".svg",
+    ".txt",
+    ".wasm",
+    ".webmanifest",
+    ".xml",
+}
+ENCODINGS = {"gzip": ".gz", "br": ".br"}
+
+# Vite's default output name is [name]-[hash].[ext] inside assets/
+_VITE_HASHED = re.compile(r"-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$")
+_HASHED_COPY = re.compile(r"^(.+)\.[0-9a-f]{10}(\.[^./]+)$")
+_HTML_REFERENCE = re.compile(r"""(\b(?:src|href)\s*=\s*)(["'])([^"']+)(\2)""")
+_CSS_REFERENCE = re.compile(r"""(url\(\s*)(["']?)([^"')\s]+)(\2\s*\))""")
+
+
+def is_generated(path: Path) -> bool:
+    """Tell whether a site file was written by the post-processing step."""
+    return path.suffix in ENCODINGS.values() or bool(_HASHED_COPY.match(path.name))
+
+
+def _is_vite_hashed(path: str) -> bool:
+    return "assets" in path.split("/")[:-1] and bool(_VITE_HASHED.search(path))
+
+
+def _hashed_name(path: str, digest: str) -> str:
+    """Return the content-hashed sibling of ``path``."""
+    stem, suffix = posixpath.splitext(path)
+    return f"{stem}.{digest[:10]}{suffix}"
+
+
+def _outputs(path: str, entry: dict[str, Any]) -> set[str]:
+    """List the files the post-processing wrote for ``path``."""
+    names = {path, entry["file"]}
+    outputs = names - {path}
+    for encoding, suffix in ENCODINGS.items():
+        if entry.get(encoding):
+            outputs.update(name + suffix for name in names)
+    return outputs
+
+
+def _cache_control(path: str) -> str:
+    """Pick the caching policy of an unfingerprinted path."""
+    if path.endswith(".html") or path in (MANIFEST_NAME, HEADERS_NAME):
+        return REVALIDATE
+    if _is_vite_hashed(path):
+        return IMMUTABLE
+    return SHORT_LIVED
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Replace ``path`` without touching other hardlinks to its inode."""
+    tmp_file = path.with_name(f".{path.name}.tmp")
+    tmp_file.write_bytes(data)
+    os.replace(tmp_file, path)
+
+
+def _link(source: Path, target: Path) -> None:
+    """Hardlink ``source`` to ``target``, copying where links are unsupported."""
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class SitePostprocessor:
+    """Fingerprints and precompresses the files of a built static site.
+
+    The state of the last run is kept next to the site, so repeated runs
+    after an incremental ``build`` only touch files that changed.
+    """
+
+    def __init__(
+        self,
+        site_dir: str | Path = "dist",
+        base_url: str = "/",
+        workers: int | None = None,
+        state_file: str | Path | None = None,
+        use_brotli: bool = True,
+    ):
+        """Initialize the post-processor.
+
+        ``base_url`` is the URL the site is served from; it resolves absolute
+        references and prefixes the paths in ``_headers``.
+        """
+        self.site_dir = Path(site_dir)
+        self.base_url = "/" + base_url.strip("/") + "/" if base_url.strip("/") else "/"
+        self.workers = workers or os.cpu_count() or 1
+        self.state_file = (
+            Path(state_file) if state_file else self.site_dir / POSTPROCESS_STATE_NAME
+        )
+        self.brotli = use_brotli and brotli is not None
+
+    def load_state(self) -> dict[str, dict[str, Any]]:
+        """Load the file entries of the last run."""
+        try:
+            state: dict[str, dict[str, Any]] = json.loads(
+                self.state_file.read_text(encoding="utf-8")
+            )
+        except (OSError, ValueError):
+            return {}
+        return state
+
+    def save_state(self, state: dict[str, dict[str, Any]]) -> None:
+        """Persist the file entries of this run."""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(
+            self.state_file, json.dumps(state, indent=2, sort_keys=True).encode()
+        )
+
+    def discover_files(self) -> list[str]:
+        """List the site files to process, relative to the site directory."""
+        reserved = {MANIFEST_NAME, HEADERS_NAME}
+        files = []
+        for path in self.site_dir.rglob("*"):
+            relative = path.relative_to(self.site_dir).as_posix()
+            if (
+                path.is_file()
+                and relative not in reserved
+                and path != self.state_file
+                and not path.name.endswith(".tmp")
+                and not is_generated(path)
+            ):
+                files.append(relative)
+        return sorted(files)
+
+    def run(self, force: bool = False) -> dict[str, Any]:
+        """Process changed files and rewrite the manifest and headers.
+
+        Plain assets come first, then CSS and finally HTML, so references
+        are rewritten to the hashed names of the files they point to.
+        """
+        if not self.site_dir.is_dir():
+            raise FileNotFoundError(f"Site directory not found: {self.site_dir}")
+
+        old_state = self.load_state()
+        files = self.discover_files()
+        groups: list[tuple[list[str], re.Pattern[str] | None]] = [
+            ([p for p in files if not p.endswith((".css", ".html"))], None),
+            ([p for p in files if p.endswith(".css")], _CSS_REFERENCE),
+            ([p for p in files if p.endswith(".html")], _HTML_REFERENCE),
+        ]
+
+        state: dict[str, dict[str, Any]] = {}
+        processed: list[str] = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for group, rewrite in groups:
+                self._process_group(
+                    pool, group, rewrite, old_state, state, processed, force
+                )
+
+        removed = 0
+        current = set().union(*(_outputs(p, e) for p, e in state.items()))
+        for path, entry in old_state.items():
+            for output in _outputs(path, entry) - current:
+                if (self.site_dir / output).is_file() and output not in state:
+                    (self.site_dir / output).unlink()
+                    removed += 1
+
+        self.save_state(state)
+        self._write_manifest(state)
+        self._write_headers(state)
+
+        metrics.INCREMENTAL_ITEMS.inc(
+            len(files) - len(processed), step="postprocess", result="skipped"
+        )
+        metrics.INCREMENTAL_ITEMS.inc(
+            len(processed), step="postprocess", result="processed"
+        )
+
+        compressed = [entry for entry in state.values() if entry.get("gzip")]
+        return {
+            "files": len(files),
+            "processed": len(processed),
+            "unchanged": len(files) - len(processed),
+            "fingerprinted": sum(
+                entry["file"] != path for path, entry in state.items()
+            ),
+            "compressed": len(compressed),
+            "bytes": sum(entry["size"] for entry in compressed),
+            "gzip_bytes": sum(entry["gzip"] for entry in compressed),
+            "br_bytes": sum(entry.get("br") or entry["size"] for entry in compressed),
+            "brotli": self.brotli,
+            "removed": removed,
+            "manifest": str(self.site_dir / MANIFEST_NAME),
+            "output_dir": str(self.site_dir),
+        }
+
+    def _process_group(
+        self,
+        pool: ThreadPoolExecutor,
+        paths: list[str],
+        rewrite: re.Pattern[str] | None,
+        old_state: dict[str, dict[str, Any]],
+        state: dict[str, dict[str, Any]],
+        processed: list[str],
+        force: bool,
+    ) -> None:
+        """Process the changed files of one group in parallel."""
+        fingerprints = {path: entry["file"] for path, entry in state.items()}
+        if rewrite is not None:
+            # Unchanged pages still need new hashed names of what they reference
+            force = force or fingerprints != {
+                path: entry["file"]
+                for path, entry in old_state.items()
+                if path in fingerprints
+            }
+        todo = []
+        for path in paths:
+            entry = old_state.get(path)
+            if not force and entry is not None and self._is_current(path, entry):
+                state[path] = entry
+            else:
+                todo.append(path)
+
+        def process(path: str) -> dict[str, Any]:
+            return self._process_file(path, rewrite, fingerprints)
+
+        for path, entry in zip(todo, pool.map(process, todo)):
+            state[path] = entry
+            processed.append(path)
+
+    def _is_current(self, path: str, entry: dict[str, Any]) -> bool:
+        """Check a file against its entry from the last run."""
+        stat = (self.site_dir / path).stat()
+        if (stat.st_size, stat.st_mtime_ns) != (entry["size"], entry["mtime_ns"]):
+            return False
+        if self.brotli and entry.get("gzip") and not entry.get("br"):
+            return False
+        return all(
+            (self.site_dir / output).is_file() for output in _outputs(path, entry)
+        )
+
+    def _process_file(
+        self,
+        path: str,
+        rewrite: re.Pattern[str] | None,
+        fingerprints: dict[str, str],
+    ) -> dict[str, Any]:
+        """Rewrite references, fingerprint and precompress one file."""
+        source = self.site_dir / path
+        data = source.read_bytes()
+
+        if rewrite is not None:
+            text = data.decode("utf-8", errors="surrogateescape")
+            new_text = self._rewrite_references(text, path, rewrite, fingerprints)
+            if new_text != text:
+                data = new_text.encode("utf-8", errors="surrogateescape")
+                _write_atomic(source, data)
+
+        digest = hashlib.sha256(data).hexdigest()
+        hashed = path
+        if not path.endswith(".html") and not _is_vite_hashed(path):
+            hashed = _hashed_name(path, digest)
+            _link(source, self.site_dir / hashed)
+
+        stat = source.stat()
+        entry: dict[str, Any] = {
+            "file": hashed,
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        if (
+            posixpath.splitext(path)[1].lower() in COMPRESSIBLE_SUFFIXES
+            and len(data) >= MIN_COMPRESS_SIZE
+        ):
+            encoded = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+            if self.brotli:
+                encoded["br"] = brotli.compress(data, quality=11)
+            for encoding, compressed in encoded.items():
+                if len(compressed) >= len(data):
+                    continue
+                target = self.site_dir / (path + ENCODINGS[encoding])
+                _write_atomic(target, compressed)
+                if hashed != path:
+                    _link(target, self.site_dir / (hashed + ENCODINGS[encoding]))
+                entry[encoding] = len(compressed)
+        return entry
+
+    def _rewrite_references(
+        self,
+        text: str,
+        path: str,
+        pattern: re.Pattern[str],
+        fingerprints: dict[str, str],
+    ) -> str:
+        """Point references to fingerprinted files at their hashed names."""
+        page_dir = posixpath.dirname(path)
+
+        def replace(match: re.Match[str]) -> str:
+            url = match.group(3)
+            target = self._resolve(url, page_dir)
+            if target is None:
+                return match.group(0)
+            name_match = _HASHED_COPY.match(target)
+            if target not in fingerprints and name_match:
+                # Already rewritten by an earlier run, map back to the source
+                target = name_match.group(1) + name_match.group(2)
+            hashed = fingerprints.get(target)
+            if hashed is None:
+                return match.group(0)
+            url_path = urlsplit(url).path
+            directory = url_path[: url_path.rfind("/") + 1]
+            new_url = (
+                directory + quote(posixpath.basename(hashed)) + url[len(url_path) :]
+            )
+            return match.group(1) + match.group(2) + new_url + match.group(4)
+
+        return pattern.sub(replace, text)
+
+    def _resolve(self, url: str, page_dir: str) -> str | None:
+        """Resolve a reference to a path in the site, if it points into it."""
+        parts = urlsplit(url)
+        if (
+            parts.scheme
+            or parts.netloc
+            or not parts.path
+            or not url.startswith(parts.path)
+        ):
+            return None
+        path = unquote(parts.path)
+        if path.startswith("/"):
+            if not path.startswith(self.base_url):
+                return None
+            path = path[len(self.base_url) :]
+        else:
+            path = posixpath.join(page_dir, path)
+        path = posixpath.normpath(path)
+        return None if path.startswith("..") else path
+
+    def _write_manifest(self, state: dict[str, dict[str, Any]]) -> None:
+        """Write the map from file paths to cache-busted paths."""
+        manifest = {
+            "base": self.base_url,
+            "files": {
+                path: {
+                    "file": entry["file"],
+                    "sha256": entry["sha256"],
+                    "size": entry["size"],
+                    "immutable": entry["file"] != path or _is_vite_hashed(path),
+                    "encodings": {
+                        encoding: entry[encoding]
+                        for encoding in ENCODINGS
+                        if entry.get(encoding)
+                    },
+                }
+                for path, entry in sorted(state.items())
+            },
+        }
+        _write_atomic(
+            self.site_dir / MANIFEST_NAME,
+            json.dumps(manifest, indent=2, sort_keys=True).encode(),
+        )
+
+    def _write_headers(self, state: dict[str, dict[str, Any]]) -> None:
+        """Write one ``Cache-Control`` rule per served file."""
+        rules: dict[str, str] = {
+            MANIFEST_NAME: REVALIDATE,
+            HEADERS_NAME: REVALIDATE,
+        }
+        for path, entry in state.items():
+            rules[path] = _cache_control(path)
+            if entry["file"] != path:
+                rules[entry["file"]] = IMMUTABLE
+        for path in list(rules):
+            if posixpath.basename(path) == "index.html":
+                # Directory URLs serve the same page
+                rules[path[: -len("index.html")]] = REVALIDATE
+        lines = []
+        for path, cache_control in sorted(rules.items()):
+            lines += [
+                f"{self.base_url}{quote(path)}",
+                f"  Cache-Control: {cache_control}",
+            ]
+        _write_atomic(self.site_dir / HEADERS_NAME, ("\n".join(lines) + "\n").encode())
@@ -0,0 +1,250 @@
+"""Local span recorder with Chrome trace and OpenTelemetry JSON export."""
+
+import asyncio
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Recorder of the current run and the innermost open span, if recording
+_recorder: ContextVar["SpanRecorder | None"] = ContextVar(
+    "slide_agent_span_recorder", default=None
+)
+_current_span: ContextVar["Span | None"] = ContextVar(
+    "slide_agent_current_span", default=None
+)
+
+# Returned by span() while nothing is recorded, so disabled spans cost one lookup
+_NO_SPAN = contextlib.nullcontext()
+
+
+class Span:
+    """A timed operation with attributes and an optional parent span."""
+
+    __slots__ = (
+        "name",
+        "span_id",
+        "parent_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "lane",
+        "error",
+    )
+
+    def __init__(
+        self, name: str, span_id: int, parent_id: int | None, lane: str
+    ) -> None:
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes: dict[str, Any] = {}
+        self.lane = lane
+        self.error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        """Attach attributes, e.g. token counts known only at the end."""
+        self.attributes.update(attributes)
+
+
+class SpanRecorder:
+    """Collects the spans of one or more runs in memory."""
+
+    def __init__(self, service_name: str = "slidev-agent") -> None:
+        self.service_name = service_name
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Record a span nested in the current one."""
+        with self._lock:
+            span_id = self._next_id
+            self._next_id += 1
+        parent = _current_span.get()
+        current = Span(name, span_id, parent.span_id if parent else None, _lane())
+        current.attributes.update(attributes)
+
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            current.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self.spans.append(current)
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Export the spans in Chrome trace-event format.
+
+        Every thread and asyncio task gets its own track, so concurrent slide
+        writes show up side by side in ``chrome://tracing`` or Perfetto.
+        """
+        lanes: dict[str, int] = {}
+        events = []
+        start = min((span.start_ns for span in self.spans), default=0)
+        for span in sorted(self.spans, key=lambda s: s.start_ns):
+            tid = lanes.setdefault(span.lane, len(lanes) + 1)
+            args = dict(span.attributes)
+            if span.error:
+                args["error"] = span.error
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": (span.start_ns - start) / 1000,
+                    "dur": ((span.end_ns or span.start_ns) - span.start_ns) / 1000,
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+        for lane, tid in lanes.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": {"name": lane},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_otel(self) -> dict[str, Any]:
+        """Export the spans as OTLP/JSON, as accepted by OpenTelemetry tools."""
+        spans = []
+        for span in self.spans:
+            otel_span: dict[str, Any] = {
+                "traceId": self.trace_id,
+                "spanId": f"{span.span_id:016x}",
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                "attributes": [
+                    {"key": key, "value": _otel_value(value)}
+                    for key, value in span.attributes.items()
+                ],
+                "status": (
+                    {"code": 2, "message": span.error} if span.error else {"code": 1}
+                ),
+            }
+            if span.parent_id is not None:
+                otel_span["parentSpanId"] = f"{span.parent_id:016x}"
+            spans.append(otel_span)
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": self.service_name},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [{"scope": {"name": "slide_agent"}, "spans": spans}],
+                }
+            ]
+        }
+
+    def write(self, directory: str | Path, name: str = "trace") -> dict[str, str]:
+        """Write ``<name>.chrome.json`` and ``<name>.otel.json`` to ``directory``."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        files = {
+            "chrome": directory / f"{name}.chrome.json",
+            "otel": directory / f"{name}.otel.json",
+        }
+        files["chrome"].write_text(json.dumps(self.to_chrome_trace()))
+        files["otel"].write_text(json.dumps(self.to_otel()))
+        return {kind: str(path) for kind, path in files.items()}
+
+
+def _lane() -> str:
+    """Name the track a span is drawn on: the asyncio task or the thread."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        return f"task {task.get_name()}"
+    return f"thread {threading.current_thread().name}"
+
+
+def _otel_value(value: Any) -> dict[str, Any]:
+    """Convert an attribute value to an OTLP ``AnyValue``."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def span(name: str, **attributes: Any) -> contextlib.AbstractContextManager[Any]:
+    """Record a span if a recorder is active; otherwise do nothing.
+
+    The yielded object is a ``Span`` while recording and ``None`` otherwise.
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        return _NO_SPAN
+    return recorder.span(name, **attributes)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorate a sync or async function to run inside a span."""
+
+    def decorator(func: F) -> F:
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@contextlib.contextmanager
+def recording(recorder: SpanRecorder | None = None) -> Iterator[SpanRecorder]:
+    """Record all spans opened in this context (including child tasks)."""
+    recorder = recorder or SpanRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+def active_recorder() -> SpanRecorder | None:
+    """Return the recorder of the current context, if any."""
+    return _recorder.get()
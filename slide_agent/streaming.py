@@ -0,0 +1,75 @@
+"""Incremental parsing of the planner's streamed outline tool call."""
+
+import json
+from typing import Any
+
+
+class OutlineStreamParser:
+    """Extracts slide objects from partial ``{"slides": [...]}`` JSON.
+
+    Arguments arrive in arbitrary chunks. ``feed`` scans each character once,
+    tracking strings and nesting, and returns every slide object that was
+    completed by the new chunk, so its content can be generated while the
+    rest of the outline is still streaming.
+    """
+
+    def __init__(self) -> None:
+        # Unconsumed text and the absolute position of its first character
+        self._text = ""
+        self._offset = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._slide_start: int | None = None
+        self._position = 0
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        """Consume a chunk of arguments and return newly completed slides."""
+        completed = []
+        self._text += chunk
+
+        for char in chunk:
+            position = self._position
+            self._position += 1
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                # Slide objects are the objects directly inside the top-level array
+                if char == "{" and self._stack == ["{", "["]:
+                    self._slide_start = position
+                self._stack.append(char)
+            elif char in "}]" and self._stack:
+                self._stack.pop()
+                if (
+                    char == "}"
+                    and self._stack == ["{", "["]
+                    and self._slide_start is not None
+                ):
+                    slide = self._parse(self._slide_start, position + 1)
+                    if slide is not None:
+                        completed.append(slide)
+                    self._slide_start = None
+
+        return completed
+
+    def _parse(self, start: int, end: int) -> dict[str, Any] | None:
+        """Parse the slide object between two absolute positions."""
+        text = self._text[start - self._offset : end - self._offset]
+        # Everything up to the end of a complete slide is no longer needed
+        self._text = self._text[end - self._offset :]
+        self._offset = end
+        try:
+            slide = json.loads(text)
+        except ValueError:
+            return None
+        return slide if isinstance(slide, dict) else None
@@ -0,0 +1,68 @@
+"""LangChain tools used by the agent workflow."""
+
+from typing import Any
+
+from langchain_core.tools import tool
+
+
+@tool
+def create_slide_outline(slides: list[dict[str, Any]]) -> dict[str, Any]:
+    """Create a detailed outline for a slide presentation.
+
+    Args:
+        slides: List of slide dictionaries, each containing:
+            - title: str - Compelling slide title
+            - slide_type: str - Type: 'title', 'bullets', 'code', 'comparison', 'quote'
+            - content_summary: str - Brief description of slide content
+            - key_points: list[str] - List of specific key points (1-5 items)
+            - notes: str (optional) - Speaker notes or additional context
+
+    Returns:
+        Dictionary containing the validated slide outline
+    """
+    # Validate and return the structured outline
+    validated_slides = []
+
+    for slide in slides:
+        # Ensure required fields are present
+        validated_slide = {
+            "title": slide.get("title", "Untitled Slide"),
+            "slide_type": slide.get("slide_type", "bullets"),
+            "content_summary": slide.get("content_summary", "No description"),
+            "key_points": slide.get("key_points", []),
+            "notes": slide.get("notes", ""),
+        }
+        validated_slides.append(validated_slide)
+
+    return {"slides": validated_slides}
+
+
+@tool
+def create_section_skeleton(sections: list[dict[str, Any]]) -> dict[str, Any]:
+    """Split a large presentation into sections before outlining their slides.
+
+    Args:
+        sections: List of section dictionaries, in presentation order, each containing:
+            - title: str - Section title
+            - summary: str - What the section covers
+            - slide_count: int - Number of slides in the section
+
+    Returns:
+        Dictionary containing the validated sections
+    """
+    validated_sections = []
+
+    for section in sections:
+        try:
+            slide_count = int(section.get("slide_count", 1))
+        except (TypeError, ValueError):
+            slide_count = 1
+        validated_sections.append(
+            {
+                "title": section.get("title", "Untitled Section"),
+                "summary": section.get("summary", ""),
+                "slide_count": max(slide_count, 1),
+            }
+        )
+
+    return {"sections": validated_sections}
@@ -0,0 +1,173 @@
+"""Translation of structured slide decks with protected code blocks."""
+
+import json
+import re
+from typing import Any, TypeVar
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel, ValidationError
+
+from slide_agent.models import SlideDeck, SlideSpec
+
+# Fenced blocks and inline code are never sent to the translator
+_CODE = re.compile(r"```.*?```|`[^`\n]+`", re.DOTALL)
+_PLACEHOLDER = "[[CODE{}]]"
+_PLACEHOLDERS = re.compile(r"\[\[CODE\d+\]\]")
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+_DECK_FIELDS = ("title", "subtitle")
+_SLIDE_FIELDS = ("title", "content", "notes")
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def protect_code(text: str) -> tuple[str, list[str]]:
+    """Replace code in ``text`` by numbered placeholders."""
+    blocks: list[str] = []
+
+    def replace(match: re.Match[str]) -> str:
+        blocks.append(match.group(0))
+        return _PLACEHOLDER.format(len(blocks) - 1)
+
+    return _CODE.sub(replace, text), blocks
+
+
+def restore_code(text: str, blocks: list[str]) -> str | None:
+    """Put the code back; ``None`` if the translation lost a placeholder."""
+    placeholders = [_PLACEHOLDER.format(i) for i in range(len(blocks))]
+    if sorted(_PLACEHOLDERS.findall(text)) != sorted(placeholders):
+        return None
+    for placeholder, block in zip(placeholders, blocks):
+        text = text.replace(placeholder, block, 1)
+    return text
+
+
+class DeckTranslation:
+    """The translatable texts of a deck, keyed like ``slides.3.content``.
+
+    Code is replaced by placeholders before the texts are batched into
+    translation requests and restored when the translations are applied.
+    Texts that consist of code only are left out of the requests.
+    """
+
+    def __init__(self, deck: SlideDeck) -> None:
+        self.deck = deck
+        self.segments: dict[str, str] = {}
+        self._code: dict[str, list[str]] = {}
+
+        for field in _DECK_FIELDS:
+            self._add(field, getattr(deck, field))
+        for index, slide in enumerate(deck.slides):
+            for field in _SLIDE_FIELDS:
+                self._add(f"slides.{index}.{field}", getattr(slide, field))
+
+    def _add(self, key: str, text: str | None) -> None:
+        """Register a text unless there is nothing to translate in it."""
+        if not text:
+            return
+        protected, blocks = protect_code(text)
+        if not any(c.isalpha() for c in _PLACEHOLDERS.sub("", protected)):
+            return
+        self.segments[key] = protected
+        self._code[key] = blocks
+
+    def batches(self, slides_per_batch: int) -> list[dict[str, str]]:
+        """Group the texts into requests of ``slides_per_batch`` slides.
+
+        Deck-level texts go with the first batch.
+        """
+        batches: dict[int, dict[str, str]] = {}
+        for key, text in self.segments.items():
+            parts = key.split(".")
+            slide_index = int(parts[1]) if parts[0] == "slides" else 0
+            batches.setdefault(slide_index // slides_per_batch, {})[key] = text
+        return [batches[index] for index in sorted(batches)]
+
+    def apply(self, translations: dict[str, str], language: str) -> SlideDeck:
+        """Build the translated deck; untranslatable texts stay as they were."""
+        texts: dict[str, str] = {}
+        for key, text in translations.items():
+            if key not in self.segments:
+                continue
+            restored = restore_code(text, self._code[key])
+            if restored is not None and restored.strip():
+                texts[key] = restored
+
+        slides = []
+        for index, slide in enumerate(self.deck.slides):
+            slide_updates = {
+                field: texts[f"slides.{index}.{field}"]
+                for field in _SLIDE_FIELDS
+                if f"slides.{index}.{field}" in texts
+            }
+            slides.append(_validated(SlideSpec, slide, slide_updates))
+
+        updates: dict[str, Any] = {
+            field: texts[field] for field in _DECK_FIELDS if field in texts
+        }
+        updates["slides"] = slides
+        updates["metadata"] = {
+            **self.deck.metadata,
+            "language": language,
+            "translated_from": self.deck.metadata.get("language"),
+            "translated_segments": len(texts),
+        }
+        return _validated(SlideDeck, self.deck, updates)
+
+
+def _validated(model: type[M], original: M, updates: dict[str, Any]) -> M:
+    """Apply ``updates`` to a copy of ``original``, keeping only valid ones."""
+    data = original.model_dump()
+    try:
+        return model.model_validate({**data, **updates})
+    except ValidationError:
+        # E.g. a translated title over the length limit: keep that text
+        valid: dict[str, Any] = {}
+        for field, value in updates.items():
+            try:
+                model.model_validate({**data, **valid, field: value})
+            except ValidationError:
+                continue
+            valid[field] = value
+        return model.model_validate({**data, **valid})
+
+
+def translation_messages(
+    batch: dict[str, str], source_language: str, target_language: str
+) -> list[BaseMessage]:
+    """Build the prompt translating one batch of texts."""
+    system_prompt = f"""
+    You translate slide deck texts from {source_language} to {target_language}.
+
+    RULES:
+    - Answer with a single JSON object with exactly the keys of the input
+    - Translate only the values
+    - Keep markdown formatting, line breaks and list markers
+    - Keep placeholders like [[CODE0]] exactly as they are
+    """
+
+    return [
+        SystemMessage(content=system_prompt),
+        HumanMessage(
+            content="Translate this JSON object:\n"
+            + json.dumps(batch, ensure_ascii=False, indent=2)
+        ),
+    ]
+
+
+def parse_translation(text: str, batch: dict[str, str]) -> dict[str, str]:
+    """Extract the translated texts of ``batch`` from a model answer."""
+    match = _JSON_OBJECT.search(text)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        key: value
+        for key, value in data.items()
+        if key in batch and isinstance(value, str)
+    }
@@ -0,0 +1,139 @@
+"""Cache warming: generate known requests ahead of time into the LLM cache."""
+
+import asyncio
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from slide_agent.config import get_settings
+from slide_agent.models import TopicRequest
+
+_LIST_KEYS = ("topics", "languages", "audiences")
+
+
+def load_warm_requests(path: str | Path) -> list[TopicRequest]:
+    """Expand a topics file into one request per topic, language and audience.
+
+    Top-level ``languages`` and ``audiences`` lists are crossed with every
+    topic; other top-level keys (e.g. ``slide_count``) are defaults for all
+    topics. A topic is a string or a mapping of ``TopicRequest`` fields that
+    may override ``languages`` and ``audiences``::
+
+        languages: [de, en]
+        audiences: [students]
+        slide_count: 10
+        topics:
+          - Python Funktionen
+          - topic: Datenbanken
+            languages: [de]
+    """
+    data = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    if isinstance(data, list):
+        data = {"topics": data}
+    defaults = {key: value for key, value in data.items() if key not in _LIST_KEYS}
+
+    requests: dict[str, TopicRequest] = {}
+    for entry in data.get("topics") or []:
+        fields = {"topic": entry} if isinstance(entry, str) else dict(entry)
+        languages = fields.pop("languages", data.get("languages")) or [None]
+        audiences = fields.pop("audiences", data.get("audiences")) or [None]
+        for language in languages:
+            for audience in audiences:
+                variant = {**defaults, **fields}
+                if language:
+                    variant["language"] = language
+                if audience:
+                    variant["audience"] = audience
+                request = TopicRequest(**variant)
+                requests.setdefault(request.model_dump_json(), request)
+    return list(requests.values())
+
+
+async def warm_cache(
+    requests: Sequence[TopicRequest],
+    concurrency: int = 2,
+    spend_cap: float | None = None,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Run every request once so its outline and slides land in the LLM cache.
+
+    At most ``concurrency`` runs are in flight. Once the estimated spend
+    (from the route prices) reaches ``spend_cap``, no further runs start;
+    runs already in flight finish. Decks are written to a temporary
+    directory and discarded, only the cache entries are kept.
+    """
+    from slide_agent.agent_graph import run_agent_async
+
+    if not get_settings().cache.enabled:
+        raise ValueError("The LLM cache is disabled; set CACHE__ENABLED=true")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    spent = 0.0
+
+    async def warm(index: int, request: TopicRequest, tmp: Path) -> dict[str, Any]:
+        nonlocal spent
+        result: dict[str, Any] = {
+            "topic": request.topic,
+            "language": request.language,
+            "audience": request.audience,
+            "slide_count": request.slide_count,
+        }
+        async with semaphore:
+            if spend_cap is not None and spent >= spend_cap:
+                result["status"] = "skipped"
+            else:
+                start = time.perf_counter()
+                try:
+                    state = await run_agent_async(request, str(tmp / f"deck-{index}"))
+                except Exception as e:
+                    state = None
+                    result.update(status="failed", error=str(e))
+                if state is not None:
+                    routes = state.metadata.get("llm_routes", {}).values()
+                    calls = sum(route["calls"] for route in routes)
+                    hits = sum(route["cache_hits"] for route in routes)
+                    cost = sum(route["cost_usd"] for route in routes)
+                    spent += cost
+                    if state.error:
+                        status = "failed"
+                    elif calls and hits == calls:
+                        status = "cached"
+                    else:
+                        status = "warmed"
+                    result.update(
+                        status=status,
+                        llm_calls=calls,
+                        cache_hits=hits,
+                        cost_usd=cost,
+                        seconds=time.perf_counter() - start,
+                    )
+                    if state.error:
+                        result["error"] = state.error
+
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    with tempfile.TemporaryDirectory(prefix="slidev-warm-") as tmp:
+        results = await asyncio.gather(
+            *(warm(i, request, Path(tmp)) for i, request in enumerate(requests))
+        )
+
+    counts = {
+        status: sum(result["status"] == status for result in results)
+        for status in ("warmed", "cached", "skipped", "failed")
+    }
+    covered = counts["warmed"] + counts["cached"]
+    return {
+        "requests": len(results),
+        **counts,
+        "coverage": covered / len(results) if results else 1.0,
+        "spend_usd": spent,
+        "llm_calls": sum(result.get("llm_calls", 0) for result in results),
+        "cache_hits": sum(result.get("cache_hits", 0) for result in results),
+        "results": results,
+    }
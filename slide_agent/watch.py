@@ -0,0 +1,186 @@
+"""Watch mode: re-render decks when their specs or the slide templates change."""
+
+import os
+import threading
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+import jinja2
+
+from slide_agent import metrics
+from slide_agent.generators.slide_generator import (
+    FRONTMATTER_TEMPLATE,
+    SLIDE_TEMPLATES,
+    TEMPLATES_DIR,
+    SlideGenerator,
+)
+from slide_agent.models import SlideDeck
+from slide_agent.writers import DECK_ARTIFACT_NAME, FilesystemWriter, load_deck_artifact
+
+DEFAULT_POLL_INTERVAL = 0.05
+_TEMPLATE_SUFFIX = ".md.j2"
+
+# (st_mtime_ns, st_size) of a watched file
+Signature = tuple[int, int]
+
+
+class DeckWatcher:
+    """Re-renders the ``slides.md`` of decks affected by a change.
+
+    Each poll stats every ``deck.json`` below the watched paths and every
+    Markdown template and compares ``st_mtime_ns`` and size with the previous
+    poll, like the catalog does. A changed deck spec re-renders that deck; a
+    changed slide template re-renders only the decks with slides of a type
+    using it. Changes to the frontmatter or other templates (e.g. partials)
+    re-render every deck.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str | Path],
+        templates_dir: str | Path | None = None,
+        writer: FilesystemWriter | None = None,
+    ) -> None:
+        self.paths = [Path(path) for path in paths]
+        self.templates_dir = Path(templates_dir or TEMPLATES_DIR)
+        self.writer = writer or FilesystemWriter()
+        if templates_dir is not None:
+            self.writer.slide_generator = SlideGenerator(self.templates_dir)
+
+        self._decks: dict[Path, Signature] = {}
+        self._templates: dict[str, Signature] = {}
+        # Templates each deck was rendered with at the last load
+        self._deck_templates: dict[Path, set[str]] = {}
+        # Decks whose last render failed, retried on the next template change
+        self._failed: set[Path] = set()
+
+    def start(self) -> int:
+        """Take the initial snapshot and return the number of watched decks."""
+        self._templates = self._scan_templates()
+        self._decks = self._scan_decks()
+        for deck_dir in self._decks:
+            try:
+                deck, _ = load_deck_artifact(deck_dir)
+            except (OSError, ValueError):
+                continue
+            self._deck_templates[deck_dir] = _templates_of(deck)
+        return len(self._decks)
+
+    def poll(self) -> list[dict[str, Any]]:
+        """Re-render the decks affected since the last poll."""
+        templates = self._scan_templates()
+        decks = self._scan_decks()
+
+        changed_templates = {
+            name
+            for name in templates.keys() | self._templates.keys()
+            if templates.get(name) != self._templates.get(name)
+        }
+        affected = {
+            deck_dir
+            for deck_dir, signature in decks.items()
+            if self._decks.get(deck_dir) != signature
+        }
+        if changed_templates:
+            slide_templates = set(SLIDE_TEMPLATES.values())
+            render_all = bool(changed_templates - slide_templates)
+            affected.update(
+                deck_dir
+                for deck_dir in decks
+                if render_all
+                or deck_dir not in self._deck_templates
+                or deck_dir in self._failed
+                or self._deck_templates[deck_dir] & changed_templates
+            )
+
+        self._templates = templates
+        self._decks = decks
+        for deck_dir in self._deck_templates.keys() - decks.keys():
+            del self._deck_templates[deck_dir]
+        self._failed &= decks.keys()
+
+        return [self._render(deck_dir) for deck_dir in sorted(affected)]
+
+    def watch(
+        self,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        on_render: Callable[[dict[str, Any]], None] | None = None,
+        stop: threading.Event | None = None,
+    ) -> None:
+        """Poll every ``interval`` seconds until ``stop`` is set (after ``start``)."""
+        stop = stop or threading.Event()
+        while not stop.wait(interval):
+            for result in self.poll():
+                if on_render is not None:
+                    on_render(result)
+
+    def _render(self, deck_dir: Path) -> dict[str, Any]:
+        """Re-render one deck and time it."""
+        start = time.perf_counter()
+        try:
+            deck, _ = load_deck_artifact(deck_dir)
+            result = self.writer.write_slides_file(deck, deck_dir)
+        except (OSError, ValueError, jinja2.TemplateError) as e:
+            # E.g. a spec or template saved half-way by an editor; the next
+            # save of the spec or of any template retries
+            metrics.FAILURES.inc(stage="watch", cause=type(e).__name__)
+            self._failed.add(deck_dir)
+            return {"deck_dir": str(deck_dir), "error": str(e)}
+
+        self._failed.discard(deck_dir)
+        self._deck_templates[deck_dir] = _templates_of(deck)
+        result["deck_dir"] = str(deck_dir)
+        result["seconds"] = time.perf_counter() - start
+        return result
+
+    def _scan_decks(self) -> dict[Path, Signature]:
+        """Stat the artifacts of all decks below the watched paths."""
+        signatures = {}
+        for path in self.paths:
+            signature = _signature(path / DECK_ARTIFACT_NAME)
+            if signature is not None:
+                signatures[path] = signature
+                continue
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir() and not entry.name.startswith("."):
+                    deck_dir = Path(entry.path)
+                    signature = _signature(deck_dir / DECK_ARTIFACT_NAME)
+                    if signature is not None:
+                        signatures[deck_dir] = signature
+        return signatures
+
+    def _scan_templates(self) -> dict[str, Signature]:
+        """Stat the Markdown templates."""
+        try:
+            entries = list(os.scandir(self.templates_dir))
+        except OSError:
+            return {}
+        signatures = {}
+        for entry in entries:
+            if entry.name.endswith(_TEMPLATE_SUFFIX):
+                stat = entry.stat()
+                signatures[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+
+def _signature(path: Path) -> Signature | None:
+    """Return the change signature of a file, ``None`` if it is missing."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _templates_of(deck: SlideDeck) -> set[str]:
+    """Return the templates rendering a deck."""
+    return {FRONTMATTER_TEMPLATE} | {
+        SLIDE_TEMPLATES.get(slide.slide_type, "bullets_slide.md.j2")
+        for slide in deck.slides
+    }
@@ -1,5 +1,27 @@
 """Writers module for file output."""
 
+from .archive_writer import ARCHIVE_FORMATS, ArchiveWriter, deck_assets, export_decks
+from .asset_store import ASSET_STORE_NAME, AssetStore
+from .deck_artifact import (
+    DECK_ARTIFACT_NAME,
+    DECK_ARTIFACT_VERSION,
+    dump_deck_artifact,
+    load_deck_artifact,
+    parse_deck_artifact,
+)
 from .filesystem_writer import FilesystemWriter
 
-__all__ = ["FilesystemWriter"]
+__all__ = [
+    "ARCHIVE_FORMATS",
+    "ArchiveWriter",
+    "ASSET_STORE_NAME",
+    "AssetStore",
+    "DECK_ARTIFACT_NAME",
+    "DECK_ARTIFACT_VERSION",
+    "FilesystemWriter",
+    "deck_assets",
+    "dump_deck_artifact",
+    "export_decks",
+    "load_deck_artifact",
+    "parse_deck_artifact",
+]
@@ -0,0 +1,192 @@
+"""Archive sink that streams rendered decks into zip or tar.gz files."""
+
+import io
+import tarfile
+import time
+import zipfile
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from slide_agent.models import SlideDeck
+from slide_agent.spans import traced
+
+from .filesystem_writer import FilesystemWriter
+
+ARCHIVE_FORMATS = ("zip", "tar.gz")
+
+
+class ArchiveWriter:
+    """Writes slide decks into a single zip or tar.gz archive.
+
+    Rendered files go into the archive straight from memory and assets are
+    streamed from their source files, so no deck directory is written first.
+    Every deck gets its own folder, which allows exporting many decks into
+    one archive.
+    """
+
+    def __init__(self, target: str | Path | BinaryIO, format: str | None = None):
+        """Open the archive.
+
+        ``target`` is a path or a writable binary stream; streams need not be
+        seekable. ``format`` is inferred from the file name if not given.
+        """
+        self.format = format or self._infer_format(target)
+        if self.format not in ARCHIVE_FORMATS:
+            raise ValueError(
+                f"Unsupported archive format {self.format!r} "
+                f"(expected one of {', '.join(ARCHIVE_FORMATS)})"
+            )
+
+        self.target = target
+        self.renderer = FilesystemWriter()
+        self.deck_names: list[str] = []
+        self.file_count = 0
+
+        self._zip: zipfile.ZipFile | None = None
+        self._tar: tarfile.TarFile | None = None
+        if self.format == "zip":
+            self._zip = zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED)
+        elif isinstance(target, str | Path):
+            self._tar = tarfile.open(target, "w:gz")
+        else:
+            self._tar = tarfile.open(fileobj=target, mode="w|gz")
+
+    @staticmethod
+    def _infer_format(target: str | Path | BinaryIO) -> str:
+        """Guess the archive format from the target file name."""
+        name = str(target if isinstance(target, str | Path) else "").lower()
+        if name.endswith((".tar.gz", ".tgz")):
+            return "tar.gz"
+        return "zip"
+
+    def close(self) -> None:
+        """Finish and close the archive."""
+        if self._zip is not None:
+            self._zip.close()
+        if self._tar is not None:
+            self._tar.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @traced("write.archive_deck")
+    def add_deck(
+        self,
+        deck: SlideDeck,
+        name: str | None = None,
+        markdown_content: str | None = None,
+        outline: list[dict[str, Any]] | None = None,
+        assets: dict[str, str | Path | bytes] | None = None,
+    ) -> dict[str, Any]:
+        """Add a deck below the folder ``name`` (default: slug of the title)."""
+        name = self._unique_name(name or self.renderer.create_slug(deck.title))
+        files = self.renderer.render_files(
+            deck, Path(name), markdown_content=markdown_content, outline=outline
+        )
+
+        for file_name, text in files.items():
+            self._add_bytes(f"{name}/{file_name}", text.encode("utf-8"))
+        for asset_name, source in (assets or {}).items():
+            arcname = f"{name}/assets/{asset_name}"
+            if isinstance(source, bytes):
+                self._add_bytes(arcname, source)
+            else:
+                self._add_file(arcname, Path(source))
+
+        self.deck_names.append(name)
+        return {
+            "name": name,
+            "slide_count": len(deck.slides),
+            "files": [f"{name}/{file_name}" for file_name in files]
+            + [f"{name}/assets/{asset_name}" for asset_name in assets or {}],
+        }
+
+    def _unique_name(self, name: str) -> str:
+        """Suffix ``name`` if another deck in the archive already uses it."""
+        candidate = name or "deck"
+        counter = 2
+        while candidate in self.deck_names:
+            candidate = f"{name}-{counter}"
+            counter += 1
+        return candidate
+
+    def _add_bytes(self, arcname: str, data: bytes) -> None:
+        """Add an in-memory file to the archive."""
+        if self._zip is not None:
+            info = zipfile.ZipInfo(arcname, time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            self._zip.writestr(info, data)
+        else:
+            assert self._tar is not None
+            tar_info = tarfile.TarInfo(arcname)
+            tar_info.size = len(data)
+            tar_info.mtime = int(time.time())
+            tar_info.mode = 0o644
+            self._tar.addfile(tar_info, io.BytesIO(data))
+        self.file_count += 1
+
+    def _add_file(self, arcname: str, path: Path) -> None:
+        """Stream a file from disk into the archive, following symlinks."""
+        if self._zip is not None:
+            self._zip.write(path, arcname)
+        else:
+            assert self._tar is not None
+            with open(path, "rb") as f:
+                tar_info = self._tar.gettarinfo(arcname=arcname, fileobj=f)
+                self._tar.addfile(tar_info, f)
+        self.file_count += 1
+
+
+def deck_assets(deck_dir: str | Path) -> dict[str, Path]:
+    """List the files below a deck's ``assets/`` by their relative names.
+
+    Symlinked and hardlinked asset store entries resolve to their blobs.
+    """
+    assets_dir = Path(deck_dir) / "assets"
+    if not assets_dir.is_dir():
+        return {}
+    return {
+        path.relative_to(assets_dir).as_posix(): path
+        for path in sorted(assets_dir.rglob("*"))
+        if path.is_file()
+    }
+
+
+def export_decks(
+    decks: Sequence[SlideDeck],
+    target: str | Path | BinaryIO,
+    format: str | None = None,
+    outlines: Sequence[list[dict[str, Any]] | None] | None = None,
+    names: Sequence[str | None] | None = None,
+    workers: int | None = None,
+    assets: Sequence[dict[str, str | Path | bytes] | None] | None = None,
+) -> dict[str, Any]:
+    """Render many decks in parallel and export them into one archive.
+
+    Decks are rendered with ``render_many`` and added to the archive in
+    completion order while the remaining decks are still rendering.
+    ``assets`` holds the asset files of each deck, e.g. from ``deck_assets``.
+    """
+    from slide_agent.generators import render_many
+
+    with ArchiveWriter(target, format) as archive:
+        for index, markdown in render_many(decks, workers=workers):
+            archive.add_deck(
+                decks[index],
+                name=names[index] if names else None,
+                markdown_content=markdown,
+                outline=outlines[index] if outlines else None,
+                assets=assets[index] if assets else None,
+            )
+
+    return {
+        "archive": str(target) if isinstance(target, str | Path) else None,
+        "format": archive.format,
+        "decks": archive.deck_names,
+        "file_count": archive.file_count,
+    }
@@ -0,0 +1,226 @@
+"""Content-addressed blob store for deck assets shared across decks."""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import stat
+import threading
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+ASSET_STORE_NAME = ".assets"
+
+
+class AssetStore:
+    """Stores each asset once, keyed by its SHA-256, and links it into decks.
+
+    Deck ``assets/`` entries are hardlinks to the blobs, or relative symlinks
+    where hardlinks are not possible (e.g. across filesystems). Every link is
+    recorded in ``refs.json`` so orphaned blobs can be garbage collected.
+    Blobs are read-only, because editing a hardlink in place would change the
+    asset in every deck.
+    """
+
+    def __init__(self, root: str | Path):
+        """Initialize the store rooted at ``root``."""
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.refs_file = self.root / "refs.json"
+        self._held = threading.local()
+
+    def blob_path(self, digest: str) -> Path:
+        """Return the path of the blob with the given digest."""
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def add_bytes(self, data: bytes) -> str:
+        """Store ``data`` and return its digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        self._store(digest, data)
+        return digest
+
+    def add_file(self, path: str | Path) -> str:
+        """Store the content of ``path`` and return its digest."""
+        digest = self._file_digest(path)
+        self._store(digest, Path(path))
+        return digest
+
+    @staticmethod
+    def _file_digest(path: str | Path) -> str:
+        """Hash a file in chunks."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _store(self, digest: str, source: bytes | Path) -> None:
+        """Write a blob atomically and make it read-only, unless it exists."""
+        blob = self.blob_path(digest)
+        if blob.exists():
+            return
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per writer, so threads storing the same blob never share it
+        tmp_path = blob.with_name(f".{blob.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, "xb") as f:
+                if isinstance(source, bytes):
+                    f.write(source)
+                else:
+                    with open(source, "rb") as src:
+                        shutil.copyfileobj(src, f)
+            os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(tmp_path, blob)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def link(self, digest: str, target: str | Path) -> str:
+        """Link the blob into ``target``; return ``"hardlink"`` or ``"symlink"``."""
+        blob = self.blob_path(digest)
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        if target.is_symlink() or target.exists():
+            if os.path.samefile(target, blob):
+                mode = "symlink" if target.is_symlink() else "hardlink"
+                self._add_ref(digest, target)
+                return mode
+            target.unlink()
+
+        try:
+            os.link(blob, target)
+            mode = "hardlink"
+        except OSError:
+            os.symlink(os.path.relpath(blob, target.parent), target)
+            mode = "symlink"
+
+        self._add_ref(digest, target)
+        return mode
+
+    def add_to_deck(
+        self, source: str | Path | bytes, target: str | Path
+    ) -> dict[str, Any]:
+        """Store ``source`` (a file path or raw bytes) and link it to ``target``.
+
+        Storing and linking happen under the store lock, so a concurrent
+        ``gc`` cannot delete the blob before it is referenced.
+        """
+        if isinstance(source, bytes):
+            digest = hashlib.sha256(source).hexdigest()
+            blob_source: bytes | Path = source
+        else:
+            digest = self._file_digest(source)
+            blob_source = Path(source)
+        with self._lock():
+            self._store(digest, blob_source)
+            mode = self.link(digest, target)
+        return {"digest": digest, "mode": mode, "path": str(target)}
+
+    def refcount(self, digest: str) -> int:
+        """Return how many deck entries reference a blob."""
+        return len(self._load_refs().get(digest, []))
+
+    def gc(self) -> dict[str, int]:
+        """Drop stale references and delete blobs nobody references anymore."""
+        removed_blobs = 0
+        freed_bytes = 0
+        stale_refs = 0
+
+        with self._lock():
+            refs = self._load_refs()
+            for digest, targets in list(refs.items()):
+                blob = self.blob_path(digest)
+                alive = [t for t in targets if self._points_to(Path(t), blob)]
+                stale_refs += len(targets) - len(alive)
+                if alive:
+                    refs[digest] = alive
+                else:
+                    del refs[digest]
+
+            if self.objects_dir.is_dir():
+                for blob in self.objects_dir.glob("*/*"):
+                    digest = blob.parent.name + blob.name
+                    if digest in refs or blob.name.startswith("."):
+                        continue
+                    freed_bytes += blob.stat().st_size
+                    blob.unlink()
+                    removed_blobs += 1
+
+            self._save_refs(refs)
+
+        return {
+            "removed_blobs": removed_blobs,
+            "freed_bytes": freed_bytes,
+            "stale_refs": stale_refs,
+            "live_blobs": len(refs),
+        }
+
+    @staticmethod
+    def _points_to(target: Path, blob: Path) -> bool:
+        """Check whether a deck entry still links to the blob."""
+        try:
+            return os.path.samefile(target, blob)
+        except OSError:
+            return False
+
+    def _add_ref(self, digest: str, target: Path) -> None:
+        """Record that ``target`` references the blob."""
+        with self._lock():
+            refs = self._load_refs()
+            targets = refs.setdefault(digest, [])
+            path = str(target.parent.resolve() / target.name)
+            if path not in targets:
+                targets.append(path)
+                self._save_refs(refs)
+
+    def _load_refs(self) -> dict[str, list[str]]:
+        """Load the reference index."""
+        try:
+            refs: dict[str, list[str]] = json.loads(
+                self.refs_file.read_text(encoding="utf-8")
+            )
+        except (OSError, ValueError):
+            return {}
+        return refs
+
+    def _save_refs(self, refs: dict[str, list[str]]) -> None:
+        """Atomically write the reference index."""
+        tmp_file = self.refs_file.with_name(f".refs.{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(refs, indent=1, sort_keys=True))
+        os.replace(tmp_file, self.refs_file)
+
+    @contextlib.contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Serialize store updates across threads and processes.
+
+        The lock is re-entrant per thread, so ``link`` can record its
+        reference while ``add_to_deck`` holds it.
+        """
+        depth = getattr(self._held, "depth", 0)
+        if depth:
+            self._held.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._held.depth = depth
+            return
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.root, os.O_RDONLY)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            self._held.depth = 1
+            yield
+        finally:
+            self._held.depth = 0
+            os.close(fd)
@@ -0,0 +1,49 @@
+"""Versioned on-disk artifact holding the complete validated slide deck."""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from slide_agent.models import SlideDeck
+
+DECK_ARTIFACT_NAME = "deck.json"
+DECK_ARTIFACT_VERSION = 1
+
+
+def dump_deck_artifact(
+    deck: SlideDeck, outline: list[dict[str, Any]] | None = None
+) -> str:
+    """Serialize a deck and its outline to compact artifact JSON."""
+    artifact = {
+        "version": DECK_ARTIFACT_VERSION,
+        "deck": deck.model_dump(mode="json", exclude_defaults=True),
+        "outline": outline,
+    }
+    return json.dumps(artifact, ensure_ascii=False, separators=(",", ":"))
+
+
+def parse_deck_artifact(
+    data: str,
+) -> tuple[SlideDeck, list[dict[str, Any]] | None]:
+    """Parse artifact JSON back into a validated deck and its outline."""
+    artifact = json.loads(data)
+
+    version = artifact.get("version")
+    if version != DECK_ARTIFACT_VERSION:
+        raise ValueError(
+            f"Unsupported deck artifact version {version!r} "
+            f"(expected {DECK_ARTIFACT_VERSION})"
+        )
+
+    return SlideDeck.model_validate(artifact["deck"]), artifact.get("outline")
+
+
+def load_deck_artifact(
+    path: Path,
+) -> tuple[SlideDeck, list[dict[str, Any]] | None]:
+    """Load a deck artifact from a deck directory or an artifact file."""
+    path = Path(path)
+    if path.is_dir():
+        path = path / DECK_ARTIFACT_NAME
+
+    return parse_deck_artifact(path.read_text(encoding="utf-8"))
@@ -1,23 +1,90 @@
 """Filesystem writer for slide decks."""
 
+import asyncio
+import contextlib
+import hashlib
 import json
+import os
 import re
+import threading
+import uuid
+import weakref
+from collections.abc import AsyncIterator
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-import aiofiles
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
 
+from slide_agent import metrics
 from slide_agent.generators import SlideGenerator
 from slide_agent.models import SlideDeck
+from slide_agent.spans import span, traced
+
+from .asset_store import ASSET_STORE_NAME, AssetStore
+from .deck_artifact import DECK_ARTIFACT_NAME, dump_deck_artifact, load_deck_artifact
+
+# Slidev dependencies shared by every deck
+SLIDEV_DEPENDENCIES = {
+    "@slidev/cli": "^51.8.1",
+    "@slidev/theme-default": "latest",
+    "vue": "^3.5.16",
+}
+SLIDEV_DEV_DEPENDENCIES = {"playwright-chromium": "^1.53.0"}
+
+# Polling interval bounds while another process holds a directory lock
+LOCK_RETRY_MIN = 0.001
+LOCK_RETRY_MAX = 0.05
+
+# In-process directory locks, per event loop since asyncio locks bind to one
+_PathLocks = weakref.WeakValueDictionary[str, asyncio.Lock]
+_directory_locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _PathLocks] = (
+    weakref.WeakKeyDictionary()
+)
+_directory_locks_guard = threading.Lock()
+
+
+def _in_process_lock(path: Path) -> asyncio.Lock:
+    """Return the asyncio lock for ``path`` on the running event loop."""
+    loop = asyncio.get_running_loop()
+    key = str(path.resolve())
+    with _directory_locks_guard:
+        locks = _directory_locks.get(loop)
+        if locks is None:
+            locks = _directory_locks[loop] = weakref.WeakValueDictionary()
+        lock = locks.get(key)
+        if lock is None:
+            lock = locks[key] = asyncio.Lock()
+    return lock
 
 
 class FilesystemWriter:
     """Writes slide decks to the filesystem in Slidev format."""
 
-    def __init__(self, base_output_dir: str = "slides"):
-        """Initialize filesystem writer."""
+    def __init__(
+        self,
+        base_output_dir: str = "slides",
+        workspace: bool | None = None,
+        asset_store: AssetStore | None = None,
+    ):
+        """Initialize filesystem writer.
+
+        With ``workspace=True`` decks are written as members of an npm workspace
+        rooted in their parent directory: one root ``package.json`` holds the
+        shared dependencies, so ``npm install`` runs once for all decks. The
+        default ``None`` enables workspace mode only where such a root exists.
+
+        Deck assets are linked from ``asset_store``, which defaults to a
+        content-addressed store in ``<base_output_dir>/.assets``.
+        """
         self.base_output_dir = Path(base_output_dir)
+        self.workspace = workspace
+        self.asset_store = asset_store or AssetStore(
+            self.base_output_dir / ASSET_STORE_NAME
+        )
         self.slide_generator = SlideGenerator()
 
     @staticmethod
@@ -37,53 +104,252 @@ class FilesystemWriter:
         slug = self.create_slug(deck.title)
         return self.base_output_dir / slug
 
+    @traced("write.deck")
     async def write_deck(
         self,
         deck: SlideDeck,
         output_dir: str | None = None,
         create_assets_dir: bool = True,
+        markdown_content: str | None = None,
+        outline: list[dict[str, Any]] | None = None,
+        assets: dict[str, str | Path | bytes] | None = None,
     ) -> dict[str, Any]:
-        """Write slide deck to filesystem."""
+        """Write slide deck to filesystem.
+
+        ``markdown_content`` may be passed when the deck was already rendered,
+        e.g. by ``render_many``, to skip rendering it again. The complete deck
+        and its ``outline`` are stored in ``deck.json`` for offline re-rendering.
+        ``assets`` maps names below ``assets/`` to source files or raw bytes;
+        they are deduplicated through the asset store.
+        """
         output_path = self.get_output_path(deck, output_dir)
 
         # Create output directory
         output_path.mkdir(parents=True, exist_ok=True)
 
         # Create assets directory
-        if create_assets_dir:
+        if create_assets_dir or assets:
             assets_dir = output_path / "assets"
             assets_dir.mkdir(exist_ok=True)
 
-        # Generate markdown content
-        markdown_content = self.slide_generator.generate_deck_markdown(deck)
+        linked_assets = {}
+        for name, source in (assets or {}).items():
+            linked = await asyncio.to_thread(
+                self.asset_store.add_to_deck, source, assets_dir / name
+            )
+            linked_assets[name] = linked["digest"]
 
-        # Write main slides file
         slides_file = output_path / "slides.md"
-        async with aiofiles.open(slides_file, "w", encoding="utf-8") as f:
-            await f.write(markdown_content)
-
-        # Write metadata file
-        metadata = self._create_metadata(deck, output_path)
         meta_file = output_path / "meta.json"
-        async with aiofiles.open(meta_file, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(metadata, indent=2, ensure_ascii=False))
-
-        # Write package.json for Slidev
-        package_json = self._create_package_json(deck)
         package_file = output_path / "package.json"
-        async with aiofiles.open(package_file, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(package_json, indent=2))
+        artifact_file = output_path / DECK_ARTIFACT_NAME
+
+        workspace_root = self._get_workspace_root(output_path)
+        if workspace_root is not None:
+            await self._update_workspace_manifest(workspace_root, output_path, deck)
+
+        async with self._directory_lock(output_path):
+            contents = self.render_files(
+                deck,
+                output_path,
+                markdown_content=markdown_content,
+                outline=outline,
+                workspace=workspace_root is not None,
+                previous_meta_file=meta_file,
+            )
+            files = {output_path / name: text for name, text in contents.items()}
+            written = await asyncio.gather(
+                *(self._write_if_changed(path, text) for path, text in files.items())
+            )
 
         return {
             "output_path": str(output_path),
             "slides_file": str(slides_file),
             "meta_file": str(meta_file),
             "package_file": str(package_file),
-            "assets_dir": str(assets_dir) if create_assets_dir else None,
+            "artifact_file": str(artifact_file),
+            "assets_dir": str(assets_dir) if create_assets_dir or assets else None,
+            "assets": linked_assets,
+            "workspace_root": str(workspace_root) if workspace_root else None,
             "slide_count": len(deck.slides),
-            "size_bytes": len(markdown_content.encode("utf-8")),
+            "size_bytes": len(contents["slides.md"].encode("utf-8")),
+            "written_files": [str(p) for p, w in zip(files, written) if w],
+            "skipped_files": [str(p) for p, w in zip(files, written) if not w],
         }
 
+    def render_files(
+        self,
+        deck: SlideDeck,
+        output_path: Path,
+        markdown_content: str | None = None,
+        outline: list[dict[str, Any]] | None = None,
+        workspace: bool = False,
+        previous_meta_file: Path | None = None,
+    ) -> dict[str, str]:
+        """Render the files of a deck, keyed by their name inside the deck.
+
+        Shared by the directory and archive sinks. ``previous_meta_file`` is
+        consulted to keep ``generated_at`` stable when nothing changed.
+        """
+        # Serialize the deck before rendering, which cleans up slide content
+        artifact_content = dump_deck_artifact(deck, outline)
+
+        if markdown_content is None:
+            markdown_content = self.slide_generator.generate_deck_markdown(deck)
+
+        metadata = self._create_metadata(deck, output_path)
+        if previous_meta_file is not None:
+            self._keep_generated_at_if_unchanged(metadata, previous_meta_file)
+        package_json = self._create_package_json(deck, workspace=workspace)
+
+        return {
+            "slides.md": markdown_content,
+            "meta.json": json.dumps(metadata, indent=2, ensure_ascii=False),
+            "package.json": json.dumps(package_json, indent=2),
+            DECK_ARTIFACT_NAME: artifact_content,
+        }
+
+    def _get_workspace_root(self, output_path: Path) -> Path | None:
+        """Return the workspace root for a deck directory, if any."""
+        root = output_path.resolve().parent
+        if self.workspace:
+            return root
+        if self.workspace is None and self._is_workspace_root(root):
+            return root
+        return None
+
+    @staticmethod
+    def _is_workspace_root(path: Path) -> bool:
+        """Check whether ``path`` holds an npm workspace manifest."""
+        try:
+            manifest = json.loads((path / "package.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        return isinstance(manifest, dict) and "workspaces" in manifest
+
+    async def _update_workspace_manifest(
+        self, root: Path, output_path: Path, deck: SlideDeck
+    ) -> None:
+        """Register a deck and its theme in the workspace root manifest."""
+        root.mkdir(parents=True, exist_ok=True)
+        manifest_file = root / "package.json"
+
+        async with self._directory_lock(root):
+            try:
+                manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                manifest = {
+                    "name": f"slidev-{self.create_slug(root.name) or 'decks'}",
+                    "type": "module",
+                    "private": True,
+                }
+
+            members = set(manifest.get("workspaces", []))
+            members.add(output_path.resolve().name)
+            manifest["workspaces"] = sorted(members)
+
+            dependencies = manifest.setdefault("dependencies", {})
+            for name, version in SLIDEV_DEPENDENCIES.items():
+                dependencies.setdefault(name, version)
+            dependencies.setdefault(f"slidev-theme-{deck.theme}", "latest")
+            manifest["dependencies"] = dict(sorted(dependencies.items()))
+
+            dev_dependencies = manifest.setdefault("devDependencies", {})
+            for name, version in SLIDEV_DEV_DEPENDENCIES.items():
+                dev_dependencies.setdefault(name, version)
+
+            await self._write_if_changed(manifest_file, json.dumps(manifest, indent=2))
+
+    @staticmethod
+    @contextlib.asynccontextmanager
+    async def _directory_lock(path: Path) -> AsyncIterator[None]:
+        """Hold an exclusive lock on a deck directory.
+
+        Writers on the same event loop queue on an ``asyncio.Lock``; across
+        loops and processes a non-blocking ``flock`` on the directory itself
+        is polled, so waiting never occupies an executor thread that the
+        lock holder needs for its writes.
+        """
+        async with _in_process_lock(path):
+            if fcntl is None:
+                yield
+                return
+
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                delay = LOCK_RETRY_MIN
+                while True:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        await asyncio.sleep(delay)
+                        delay = min(delay * 2, LOCK_RETRY_MAX)
+                yield
+            finally:
+                os.close(fd)  # Closing the descriptor releases the lock
+
+    @staticmethod
+    async def _write_if_changed(path: Path, content: str) -> bool:
+        """Atomically replace ``path`` unless its content hash is unchanged.
+
+        Returns ``True`` if the file was written. Each file is handled by one
+        thread hop with plain buffered I/O, which bench_writes.py shows to be
+        considerably faster than aiofiles for small files.
+        """
+        data = content.encode("utf-8")
+        with span("write.file", file=path.name) as file_span:
+            written = await asyncio.to_thread(
+                FilesystemWriter._write_if_changed_sync, path, data
+            )
+            if file_span is not None:
+                file_span.set(written=written)
+
+        metrics.INCREMENTAL_ITEMS.inc(
+            step="deck_files", result="processed" if written else "skipped"
+        )
+        if written:
+            metrics.WRITE_BYTES.inc(len(data), file=path.name)
+        return written
+
+    @staticmethod
+    def _write_if_changed_sync(path: Path, data: bytes) -> bool:
+        """Blocking implementation of ``_write_if_changed``."""
+        try:
+            existing = path.read_bytes()
+        except FileNotFoundError:
+            pass
+        else:
+            if hashlib.sha256(existing).digest() == hashlib.sha256(data).digest():
+                return False
+
+        # Write next to the target and rename, so readers never see partial files
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        return True
+
+    @staticmethod
+    def _keep_generated_at_if_unchanged(
+        metadata: dict[str, Any], meta_file: Path
+    ) -> None:
+        """Reuse the old timestamp when nothing else in meta.json changed."""
+        try:
+            existing = json.loads(meta_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+
+        previous = existing.pop("generated_at", None)
+        current = {k: v for k, v in metadata.items() if k != "generated_at"}
+        if previous and existing == current:
+            metadata["generated_at"] = previous
+
     def _create_metadata(self, deck: SlideDeck, output_path: Path) -> dict[str, Any]:
         """Create metadata for the deck."""
         return {
@@ -110,11 +376,16 @@ class FilesystemWriter:
             "metadata": deck.metadata,
         }
 
-    def _create_package_json(self, deck: SlideDeck) -> dict[str, Any]:
-        """Create package.json for Slidev project."""
+    def _create_package_json(
+        self, deck: SlideDeck, workspace: bool = False
+    ) -> dict[str, Any]:
+        """Create package.json for Slidev project.
+
+        Workspace members leave the dependencies to the root manifest.
+        """
         slug = self.create_slug(deck.title)
 
-        return {
+        package_json: dict[str, Any] = {
             "name": f"slidev-{slug}",
             "type": "module",
             "private": True,
@@ -123,25 +394,66 @@ class FilesystemWriter:
                 "dev": "slidev --open",
                 "export": "slidev export",
             },
-            "dependencies": {
-                "@slidev/cli": "^51.8.1",
-                "@slidev/theme-default": "latest",
-                f"slidev-theme-{deck.theme}": "latest",
-                "vue": "^3.5.16",
-            },
-            "devDependencies": {"playwright-chromium": "^1.53.0"},
         }
+        if not workspace:
+            package_json["dependencies"] = {
+                "@slidev/cli": SLIDEV_DEPENDENCIES["@slidev/cli"],
+                "@slidev/theme-default": SLIDEV_DEPENDENCIES["@slidev/theme-default"],
+                f"slidev-theme-{deck.theme}": "latest",
+                "vue": SLIDEV_DEPENDENCIES["vue"],
+            }
+            package_json["devDependencies"] = dict(SLIDEV_DEV_DEPENDENCIES)
+
+        return package_json
 
     def write_deck_sync(
         self,
         deck: SlideDeck,
         output_dir: str | None = None,
         create_assets_dir: bool = True,
+        markdown_content: str | None = None,
+        outline: list[dict[str, Any]] | None = None,
+        assets: dict[str, str | Path | bytes] | None = None,
     ) -> dict[str, Any]:
         """Synchronous version of write_deck."""
-        import asyncio
+        return asyncio.run(
+            self.write_deck(
+                deck, output_dir, create_assets_dir, markdown_content, outline, assets
+            )
+        )
+
+    def render_deck_dir(
+        self, deck_dir: str | Path, theme: str | None = None
+    ) -> dict[str, Any]:
+        """Rebuild a deck directory from its stored artifact without the LLM."""
+        deck, outline = load_deck_artifact(Path(deck_dir))
+        if theme:
+            deck.theme = theme
+
+        return self.write_deck_sync(deck, str(deck_dir), outline=outline)
 
-        return asyncio.run(self.write_deck(deck, output_dir, create_assets_dir))
+    def write_slides_file(
+        self, deck: SlideDeck, deck_dir: str | Path
+    ) -> dict[str, Any]:
+        """Re-render only ``slides.md`` of an existing deck directory.
+
+        Used by watch mode: the other deck files stay untouched, so a running
+        Slidev dev server sees exactly one change.
+        """
+        slides_file = Path(deck_dir) / "slides.md"
+        data = self.slide_generator.generate_deck_markdown(deck).encode("utf-8")
+        written = self._write_if_changed_sync(slides_file, data)
+
+        metrics.INCREMENTAL_ITEMS.inc(
+            step="deck_files", result="processed" if written else "skipped"
+        )
+        if written:
+            metrics.WRITE_BYTES.inc(len(data), file=slides_file.name)
+        return {
+            "slides_file": str(slides_file),
+            "slide_count": len(deck.slides),
+            "written": written,
+        }
 
     def create_readme(self, deck: SlideDeck, output_path: Path) -> str:
         """Create README.md for the slide deck."""
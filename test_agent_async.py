@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Test the async agent workflow with a stubbed LLM."""
+
+import asyncio
+
+from slide_agent import agent_graph
+from slide_agent.models import TopicRequest
+
+
+def test_concurrent_runs_share_one_event_loop(tmp_path, stub_llm):
+    """Several runs complete concurrently inside a running event loop."""
+
+    async def run_all():
+        return await asyncio.gather(
+            *(
+                agent_graph.run_agent_async(
+                    TopicRequest(topic=f"Async topic {i}"), str(tmp_path / f"deck{i}")
+                )
+                for i in range(3)
+            )
+        )
+
+    results = asyncio.run(run_all())
+
+    for i, result in enumerate(results):
+        assert result.error is None
+        assert [slide.title for slide in result.deck.slides] == [
+            "Async Intro",
+            "Details",
+        ]
+        assert (tmp_path / f"deck{i}" / "slides.md").exists()
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    import pytest
+
+    from conftest import StubLLM
+
+    with tempfile.TemporaryDirectory() as tmp, pytest.MonkeyPatch.context() as mp:
+        mp.setattr(agent_graph, "get_llm", lambda *args, **kwargs: StubLLM())
+        test_concurrent_runs_share_one_event_loop(Path(tmp), None)
+    print("✅ Async agent runs work")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Test exporting decks into zip and tar.gz archives."""
+
+import io
+import json
+import os
+import tarfile
+import zipfile
+
+from slide_agent.models import SlideDeck, SlideSpec, SlideType
+from slide_agent.writers import (
+    ArchiveWriter,
+    FilesystemWriter,
+    deck_assets,
+    export_decks,
+    load_deck_artifact,
+    parse_deck_artifact,
+)
+
+
+def _make_deck(title: str) -> SlideDeck:
+    """Create a minimal two-slide deck."""
+    return SlideDeck(
+        title=title,
+        slides=[
+            SlideSpec(title=title, slide_type=SlideType.TITLE, content="Intro"),
+            SlideSpec(title="Points", slide_type=SlideType.BULLETS, content="- A\n- B"),
+        ],
+    )
+
+
+def test_zip_export_streams_files_and_assets(tmp_path):
+    """Deck files and assets end up in the archive, nothing on disk."""
+    logo = tmp_path / "logo.svg"
+    logo.write_text("<svg/>")
+
+    archive_file = tmp_path / "decks.zip"
+    with ArchiveWriter(archive_file) as archive:
+        archive.add_deck(_make_deck("Python Basics"), assets={"logo.svg": logo})
+        archive.add_deck(_make_deck("Python Basics"), assets={"data.bin": b"\0\1"})
+
+    with zipfile.ZipFile(archive_file) as zf:
+        names = set(zf.namelist())
+        meta = json.loads(zf.read("python-basics/meta.json"))
+        deck, _ = parse_deck_artifact(zf.read("python-basics-2/deck.json").decode())
+
+    assert {
+        "python-basics/slides.md",
+        "python-basics/package.json",
+        "python-basics/assets/logo.svg",
+        "python-basics-2/assets/data.bin",
+    } <= names
+    assert meta["output_path"] == "python-basics"
+    assert deck.title == "Python Basics"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["decks.zip", "logo.svg"]
+
+
+def test_bulk_export_to_tar_stream():
+    """Many decks are exported into one tar.gz, even to a non-seekable stream."""
+    buffer = io.BytesIO()
+    decks = [_make_deck(f"Deck {i}") for i in range(5)]
+
+    result = export_decks(decks, buffer, format="tar.gz", workers=2)
+
+    assert sorted(result["decks"]) == [f"deck-{i}" for i in range(5)]
+    buffer.seek(0)
+    with tarfile.open(fileobj=buffer, mode="r:gz") as tar:
+        slides = tar.extractfile("deck-3/slides.md").read().decode()
+    assert "Deck 3" in slides
+
+
+def test_export_includes_linked_deck_assets(tmp_path):
+    """Assets of a deck directory are exported as the files they link to."""
+    deck_dir = tmp_path / "slides" / "python-basics"
+    FilesystemWriter(str(tmp_path / "slides")).write_deck_sync(
+        _make_deck("Python Basics"), str(deck_dir), assets={"logo.svg": b"<svg/>"}
+    )
+    (tmp_path / "chart.png").write_bytes(b"PNG")
+    (deck_dir / "assets" / "img").mkdir()
+    os.symlink(tmp_path / "chart.png", deck_dir / "assets" / "img" / "chart.png")
+
+    deck, _ = load_deck_artifact(deck_dir)
+    buffer = io.BytesIO()
+    export_decks(
+        [deck],
+        buffer,
+        format="tar.gz",
+        names=["python-basics"],
+        assets=[deck_assets(deck_dir)],
+    )
+
+    buffer.seek(0)
+    with tarfile.open(fileobj=buffer, mode="r:gz") as tar:
+        logo = tar.getmember("python-basics/assets/logo.svg")
+        chart = tar.extractfile("python-basics/assets/img/chart.png").read()
+        assert logo.isfile()
+        assert tar.extractfile(logo).read() == b"<svg/>"
+    assert chart == b"PNG"
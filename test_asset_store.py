@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Test the content-addressed asset store."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from slide_agent.writers import AssetStore
+
+
+def test_identical_assets_are_stored_once(tmp_path):
+    """The same content in two decks shares one blob and one inode."""
+    store = AssetStore(tmp_path / ".assets")
+    logo = tmp_path / "logo.png"
+    logo.write_bytes(b"\x89PNG fake image")
+
+    first = store.add_to_deck(logo, tmp_path / "deck-a" / "assets" / "logo.png")
+    second = store.add_to_deck(
+        logo.read_bytes(), tmp_path / "deck-b" / "assets" / "brand.png"
+    )
+
+    assert first["digest"] == second["digest"]
+    assert os.path.samefile(first["path"], second["path"])
+    assert len(list((tmp_path / ".assets" / "objects").glob("*/*"))) == 1
+    assert store.refcount(first["digest"]) == 2
+
+    # Linking again is idempotent
+    store.add_to_deck(logo, tmp_path / "deck-a" / "assets" / "logo.png")
+    assert store.refcount(first["digest"]) == 2
+
+
+def test_gc_removes_only_unreferenced_blobs(tmp_path):
+    """Blobs survive while any deck links them and are collected afterwards."""
+    store = AssetStore(tmp_path / ".assets")
+    shared = store.add_to_deck(b"shared", tmp_path / "a" / "assets" / "x.svg")
+    store.add_to_deck(b"shared", tmp_path / "b" / "assets" / "x.svg")
+    single = store.add_to_deck(b"single", tmp_path / "b" / "assets" / "y.svg")
+
+    (tmp_path / "a" / "assets" / "x.svg").unlink()
+    (tmp_path / "b" / "assets" / "y.svg").unlink()
+    result = store.gc()
+
+    assert result["removed_blobs"] == 1
+    assert result["stale_refs"] == 2
+    assert store.blob_path(shared["digest"]).exists()
+    assert not store.blob_path(single["digest"]).exists()
+    assert store.refcount(shared["digest"]) == 1
+
+
+def test_concurrent_decks_share_a_new_blob(tmp_path):
+    """Threads adding the same new asset while gc runs all end up linked."""
+    store = AssetStore(tmp_path / ".assets")
+    data = b"shared asset " * 1000
+
+    def add(number: int) -> dict:
+        if number % 4 == 0:
+            store.gc()
+        return store.add_to_deck(data, tmp_path / f"deck-{number}" / "assets" / "a")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(add, range(16)))
+
+    assert store.refcount(results[0]["digest"]) == 16
+    assert all(Path(result["path"]).read_bytes() == data for result in results)
+    assert store.gc()["removed_blobs"] == 0
+    assert not list((tmp_path / ".assets" / "objects").glob("*/.*.tmp"))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Test the deck catalog and the generated site index."""
+
+import json
+
+from slide_agent.site import DeckCatalog, write_site_index
+
+
+def _write_meta(root, name, title, language, theme="the-unnamed"):
+    """Create a deck directory with a meta.json."""
+    deck_dir = root / name
+    deck_dir.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "title": title,
+        "subtitle": "For students audience",
+        "theme": theme,
+        "slide_count": 3,
+        "generated_at": "2025-01-01T00:00:00",
+        "metadata": {"topic": title, "language": language},
+    }
+    (deck_dir / "meta.json").write_text(json.dumps(meta))
+    return deck_dir
+
+
+def test_refresh_is_incremental(tmp_path):
+    """Only new, changed or removed decks touch the catalog rows."""
+    _write_meta(tmp_path, "presentation-a", "Python Basics", "en")
+    _write_meta(tmp_path, "presentation-b", "Datenbanken", "de", theme="seriph")
+    catalog = DeckCatalog(tmp_path / "catalog.sqlite")
+
+    assert catalog.refresh(tmp_path)["added"] == 2
+    assert catalog.refresh(tmp_path)["unchanged"] == 2
+
+    _write_meta(tmp_path, "presentation-a", "Python Advanced", "en")
+    (tmp_path / "presentation-b" / "meta.json").unlink()
+    stats = catalog.refresh(tmp_path)
+
+    assert stats["updated"] == 1
+    assert stats["removed"] == 1
+    assert [d["title"] for d in catalog.search()] == ["Python Advanced"]
+    catalog.close()
+
+
+def test_search_filters(tmp_path):
+    """Decks can be filtered by language, theme and free text."""
+    _write_meta(tmp_path, "presentation-a", "Python Basics", "en")
+    _write_meta(tmp_path, "presentation-b", "Datenbanken", "de", theme="seriph")
+
+    with DeckCatalog(tmp_path / "catalog.sqlite") as catalog:
+        catalog.refresh(tmp_path)
+
+        assert [d["name"] for d in catalog.search(language="DE")] == ["presentation-b"]
+        assert [d["name"] for d in catalog.search(theme="seriph")] == ["presentation-b"]
+        assert [d["name"] for d in catalog.search(query="python")] == ["presentation-a"]
+        assert catalog.search(language="de")[0]["audience"] == "students"
+
+
+def test_site_index_lists_built_decks(tmp_path):
+    """The index only links decks that exist in the site directory."""
+    decks_root = tmp_path / "slides"
+    _write_meta(decks_root, "presentation-a", "Python <Basics>", "en")
+    _write_meta(decks_root, "presentation-b", "Datenbanken", "de")
+    (tmp_path / "site" / "a").mkdir(parents=True)
+
+    result = write_site_index(
+        decks_root, tmp_path / "site" / "index.html", site_dir=tmp_path / "site"
+    )
+    html = (tmp_path / "site" / "index.html").read_text()
+
+    assert result["deck_count"] == 1
+    assert 'href="./a/"' in html
+    assert "Python &lt;Basics&gt;" in html
+    assert "Datenbanken" not in html
+    assert not write_site_index(
+        decks_root, tmp_path / "site" / "index.html", site_dir=tmp_path / "site"
+    )["written"]
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    for test in (
+        test_refresh_is_incremental,
+        test_search_filters,
+        test_site_index_lists_built_decks,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Deck catalog works")
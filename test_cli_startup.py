@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Test that the CLI starts fast and defers heavy imports."""
+
+import subprocess
+import sys
+import time
+
+# Cold `import slide_agent.cli` must stay well below the old ~1.5 s startup
+STARTUP_BUDGET_SECONDS = 0.5
+
+HEAVY_MODULES = [
+    "langgraph",
+    "langchain_core",
+    "langchain_openai",
+    "jinja2",
+    "aiofiles",
+    "rich.traceback",
+]
+
+
+def test_cli_import_does_not_load_heavy_modules():
+    """Importing the CLI must not pull in the agent or rendering stack."""
+    check = (
+        "import sys, slide_agent.cli; "
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", check], capture_output=True, text=True, check=True
+    )
+
+    assert proc.stdout.strip() == "[]"
+
+
+def test_cli_cold_startup_within_budget():
+    """The best of a few cold CLI imports fits into the startup budget."""
+    durations = []
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import slide_agent.cli"], check=True)
+        durations.append(time.perf_counter() - start)
+
+    assert min(durations) < STARTUP_BUDGET_SECONDS, durations
+
+
+if __name__ == "__main__":
+    test_cli_import_does_not_load_heavy_modules()
+    test_cli_cold_startup_within_budget()
+    print("✅ CLI startup is within budget")
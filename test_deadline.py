@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Test deadline-aware generation with placeholder slides and backfill."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from slide_agent import agent_graph
+from slide_agent.agent_graph import run_agent, run_agent_async, wait_for_backfill
+from slide_agent.models import TopicRequest
+
+
+@pytest.fixture
+def slow_code_slides(monkeypatch):
+    """Code slides take 0.5 s, the first attempt at slide "Part 2" fails."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    write_slide = agent_graph._write_slide
+    attempts = []
+
+    async def slow_write_slide(semaphore, slide_data, request):
+        attempts.append(slide_data["title"])
+        if slide_data["slide_type"] == "code":
+            await asyncio.sleep(0.5)
+        if (
+            slide_data["title"].endswith("Part 2")
+            and attempts.count(slide_data["title"]) == 1
+        ):
+            raise ValueError("content too long")
+        return await write_slide(semaphore, slide_data, request)
+
+    monkeypatch.setattr(agent_graph, "_write_slide", slow_write_slide)
+    return attempts
+
+
+def test_deadline_writes_placeholders_and_backfills(tmp_path, slow_code_slides):
+    """The deck is on disk by the deadline and complete after the backfill."""
+    request = TopicRequest(topic="Deadlines", slide_count=6)
+    output_dir = tmp_path / "deck"
+
+    async def run():
+        start = time.perf_counter()
+        state = await run_agent_async(request, str(output_dir), deadline=0.2)
+        elapsed = time.perf_counter() - start
+        written = json.loads((output_dir / "meta.json").read_text())
+        reports = await wait_for_backfill()
+        return state, elapsed, written, reports
+
+    state, elapsed, written, reports = asyncio.run(run())
+
+    # Slide 2 (code) missed the deadline, slide 3 failed
+    assert elapsed < 0.45
+    assert written["metadata"]["placeholder_slides"] == [2, 3]
+    assert state.metadata["review_skipped"] is True
+    assert reports[state.metadata["output_path"]] == {
+        "output_path": str(output_dir),
+        "filled": [2, 3],
+        "failed": [],
+    }
+    assert slow_code_slides.count("Deadlines: Part 2") == 2
+
+    # The rewritten deck holds the generated slides
+    assert state.metadata["placeholder_slides"] == []
+    assert "placeholder_slides" not in state.deck.metadata
+    slides_md = (output_dir / "slides.md").read_text()
+    assert "def example()" in slides_md
+    meta = json.loads((output_dir / "meta.json").read_text())
+    assert "placeholder_slides" not in meta["metadata"]
+
+
+def test_placeholders_come_from_the_outline(tmp_path, slow_code_slides):
+    """Placeholders keep title and type and list the outline's points."""
+    request = TopicRequest(topic="Deadlines", slide_count=6)
+    result = run_agent(request, str(tmp_path / "deck"), deadline=0.2)
+
+    assert result.metadata["backfill"]["filled"] == [2, 3]
+
+    placeholder = agent_graph._placeholder_slide(result.outline[1], request)
+    assert placeholder.title == "Deadlines: Part 1"
+    assert placeholder.slide_type.value == "code"
+    assert placeholder.content == "- Point 1.1\n- Point 1.2"
+
+
+def test_runs_without_deadline_are_unchanged(tmp_path, monkeypatch):
+    """Without a deadline every slide is generated before the deck is written."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    result = run_agent(TopicRequest(topic="No Deadline", slide_count=4), str(tmp_path))
+
+    assert "placeholder_slides" not in result.metadata
+    assert "backfill" not in result.metadata
+    assert "review_feedback" in result.metadata
+
+
+def test_failed_rewrite_is_reported(tmp_path, slow_code_slides, monkeypatch):
+    """A backfill that cannot rewrite the deck reports it instead of raising."""
+    write_deck = agent_graph.FilesystemWriter.write_deck
+    calls = []
+
+    async def failing_rewrite(self, deck, *args, **kwargs):
+        calls.append(deck.title)
+        if len(calls) > 1:
+            raise OSError("disk full")
+        return await write_deck(self, deck, *args, **kwargs)
+
+    monkeypatch.setattr(agent_graph.FilesystemWriter, "write_deck", failing_rewrite)
+    request = TopicRequest(topic="Deadlines", slide_count=6)
+
+    result = run_agent(request, str(tmp_path / "deck"), deadline=0.2)
+
+    assert result.metadata["backfill"]["failed"] == [2, 3]
+    assert result.metadata["backfill"]["error"] == "disk full"
+    assert result.metadata["placeholder_slides"] == [2, 3]
+    meta = json.loads((tmp_path / "deck" / "meta.json").read_text())
+    assert meta["metadata"]["placeholder_slides"] == [2, 3]
+
+
+def test_deck_is_reported_before_the_backfill(tmp_path, slow_code_slides):
+    """``on_written`` sees the deck with placeholders while slides still run."""
+    request = TopicRequest(topic="Deadlines", slide_count=6)
+    written = []
+
+    def on_written(state):
+        written.append(
+            (time.perf_counter(), list(state.metadata["placeholder_slides"]))
+        )
+
+    start = time.perf_counter()
+    result = run_agent(
+        request, str(tmp_path / "deck"), deadline=0.2, on_written=on_written
+    )
+
+    [(reported_at, placeholders)] = written
+    assert placeholders == [2, 3]
+    assert reported_at - start < 0.5
+    assert result.metadata["backfill"]["filled"] == [2, 3]
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Test the stored deck artifact and offline re-rendering."""
+
+from slide_agent.models import SlideDeck, SlideSpec, SlideType
+from slide_agent.writers import (
+    FilesystemWriter,
+    dump_deck_artifact,
+    load_deck_artifact,
+    parse_deck_artifact,
+)
+
+
+def _make_deck() -> SlideDeck:
+    """Create a deck with content that rendering cleans up."""
+    return SlideDeck(
+        title="Artifact Deck",
+        theme="seriph",
+        slides=[
+            SlideSpec(title="Artifact Deck", slide_type=SlideType.TITLE, content="Hi"),
+            SlideSpec(
+                title="Code",
+                slide_type=SlideType.CODE,
+                content="```python# comment\nprint(1)\n```",
+            ),
+        ],
+        metadata={"topic": "Artifacts", "language": "en"},
+    )
+
+
+def test_artifact_roundtrip():
+    """A dumped deck and outline load back unchanged."""
+    deck = _make_deck()
+    outline = [{"title": "Artifact Deck", "slide_type": "title"}]
+
+    loaded, loaded_outline = parse_deck_artifact(dump_deck_artifact(deck, outline))
+
+    assert loaded == deck
+    assert loaded_outline == outline
+
+
+def test_render_deck_dir_with_new_theme(tmp_path):
+    """A written deck can be re-rendered offline with another theme."""
+    writer = FilesystemWriter(str(tmp_path))
+    result = writer.write_deck_sync(_make_deck(), str(tmp_path / "deck"))
+
+    # The artifact keeps the raw content, not the cleaned rendering
+    deck, _ = load_deck_artifact(tmp_path / "deck")
+    assert deck.slides[1].content.startswith("```python#")
+
+    writer.render_deck_dir(tmp_path / "deck", theme="dracula")
+
+    slides_md = (tmp_path / "deck" / "slides.md").read_text()
+    assert "theme: dracula" in slides_md
+    assert "slidev-theme-dracula" in (tmp_path / "deck" / "package.json").read_text()
+    assert load_deck_artifact(tmp_path / "deck")[0].theme == "dracula"
+    assert result["artifact_file"].endswith("deck.json")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_artifact_roundtrip()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_render_deck_dir_with_new_theme(Path(tmp))
+    print("✅ Deck artifacts work")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Test atomic, skip-if-unchanged deck writes."""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from slide_agent.models import SlideDeck, SlideSpec, SlideType
+from slide_agent.writers import FilesystemWriter
+
+
+def _make_deck(title: str = "Writer Deck") -> SlideDeck:
+    """Create a minimal deck."""
+    return SlideDeck(
+        title=title,
+        slides=[SlideSpec(title=title, slide_type=SlideType.TITLE, content="Hello")],
+    )
+
+
+def test_unchanged_files_are_skipped(tmp_path):
+    """Writing the same deck twice leaves every file untouched."""
+    writer = FilesystemWriter(str(tmp_path))
+    first = writer.write_deck_sync(_make_deck(), str(tmp_path / "deck"))
+    mtimes = {p: p.stat().st_mtime_ns for p in (tmp_path / "deck").iterdir()}
+
+    second = writer.write_deck_sync(_make_deck(), str(tmp_path / "deck"))
+
+    assert len(first["written_files"]) == 4
+    assert second["written_files"] == []
+    assert len(second["skipped_files"]) == 4
+    assert {p: p.stat().st_mtime_ns for p in (tmp_path / "deck").iterdir()} == mtimes
+
+
+def test_changed_deck_rewrites_and_leaves_no_temp_files(tmp_path):
+    """A changed deck is rewritten atomically without leftover temp files."""
+    writer = FilesystemWriter(str(tmp_path))
+    writer.write_deck_sync(_make_deck(), str(tmp_path / "deck"))
+
+    deck = _make_deck()
+    deck.theme = "seriph"
+    result = writer.write_deck_sync(deck, str(tmp_path / "deck"))
+
+    assert any(f.endswith("slides.md") for f in result["written_files"])
+    assert not list((tmp_path / "deck").glob(".*.tmp"))
+
+
+def test_concurrent_writes_to_same_directory(tmp_path):
+    """Concurrent runs targeting one directory are serialized by the lock."""
+    writer = FilesystemWriter(str(tmp_path))
+
+    async def write_both():
+        return await asyncio.gather(
+            writer.write_deck(_make_deck("First Deck"), str(tmp_path / "deck")),
+            writer.write_deck(_make_deck("Second Deck"), str(tmp_path / "deck")),
+        )
+
+    asyncio.run(write_both())
+
+    slides_md = (tmp_path / "deck" / "slides.md").read_text()
+    meta = (tmp_path / "deck" / "meta.json").read_text()
+    # Both files must come from the same run, never a mix of the two
+    assert ("First Deck" in slides_md) == ("First Deck" in meta)
+
+
+def test_many_waiters_do_not_exhaust_the_executor(tmp_path):
+    """Writers queued on one directory do not starve the lock holder's writes."""
+    writer = FilesystemWriter(str(tmp_path))
+
+    async def write_many():
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(2))
+        return await asyncio.wait_for(
+            asyncio.gather(
+                *(
+                    writer.write_deck(_make_deck(f"Deck {n}"), str(tmp_path / "deck"))
+                    for n in range(8)
+                )
+            ),
+            timeout=30,
+        )
+
+    assert len(asyncio.run(write_many())) == 8
+
+
+def test_workspace_mode_shares_dependencies(tmp_path):
+    """Workspace decks are registered in one root manifest with all themes."""
+    writer = FilesystemWriter(str(tmp_path), workspace=True)
+    writer.write_deck_sync(_make_deck("First Deck"), str(tmp_path / "first"))
+
+    deck = _make_deck("Second Deck")
+    deck.theme = "seriph"
+    # Auto-detection picks up the existing workspace root
+    result = FilesystemWriter(str(tmp_path)).write_deck_sync(
+        deck, str(tmp_path / "second")
+    )
+
+    root = json.loads((tmp_path / "package.json").read_text())
+    member = json.loads((tmp_path / "second" / "package.json").read_text())
+    assert root["workspaces"] == ["first", "second"]
+    assert "slidev-theme-the-unnamed" in root["dependencies"]
+    assert "slidev-theme-seriph" in root["dependencies"]
+    assert "dependencies" not in member
+    assert result["workspace_root"] == str(tmp_path.resolve())
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    for test in (
+        test_unchanged_files_are_skipped,
+        test_changed_deck_rewrites_and_leaves_no_temp_files,
+        test_concurrent_writes_to_same_directory,
+        test_workspace_mode_shares_dependencies,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Filesystem writer works")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Test section-by-section planning of large decks."""
+
+from slide_agent.agent_graph import _balance_sections, planner_node, run_agent
+from slide_agent.models import AgentState, TopicRequest
+
+
+def test_section_counts_add_up_to_the_slide_count():
+    """Skeleton counts are rescaled; a missing skeleton splits evenly."""
+    request = TopicRequest(topic="Balance", slide_count=20)
+    skeleton = [
+        {"title": "A", "summary": "", "slide_count": 10},
+        {"title": "B", "summary": "", "slide_count": 10},
+        {"title": "C", "summary": "", "slide_count": 1},
+    ]
+
+    counts = [s["slide_count"] for s in _balance_sections(skeleton, request, 4)]
+    assert sum(counts) == 20
+    assert counts == [10, 9, 1]
+
+    fallback = _balance_sections([], request, 4)
+    assert [s["slide_count"] for s in fallback] == [5, 5, 5, 5]
+
+
+def test_large_deck_is_planned_per_section(tmp_path, monkeypatch):
+    """A 30-slide deck gets a full, consistently numbered outline."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    monkeypatch.setenv("AGENT__HIERARCHICAL_PLANNING_FROM", "16")
+
+    result = run_agent(TopicRequest(topic="Sections", slide_count=30), str(tmp_path))
+
+    outline = result.outline
+    assert len(outline) == len(result.deck.slides) == 30
+    assert [entry["number"] for entry in outline] == list(range(1, 31))
+    assert [entry["slide_type"] for entry in outline].count("title") == 1
+    assert outline[0]["slide_type"] == "title"
+    assert outline[-1]["section"] == "Sections: Section 5"
+
+    sections = result.metadata["planned_sections"]
+    assert [section["slide_count"] for section in sections] == [6] * 5
+    # One skeleton call plus one call per section
+    assert result.metadata["llm_routes"]["planner"]["calls"] == 6
+
+
+def test_sync_planner_node_plans_per_section(monkeypatch):
+    """The synchronous node runs the async planner, sections included."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    monkeypatch.setenv("AGENT__HIERARCHICAL_PLANNING_FROM", "16")
+    request = TopicRequest(topic="Sections", slide_count=20)
+
+    result = planner_node(AgentState(request=request))
+
+    assert len(result["outline"]) == 20
+    assert "planned_sections" in result["metadata"]
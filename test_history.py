@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Test the run history and the estimates derived from it."""
+
+import pytest
+
+from slide_agent.agent_graph import run_agent
+from slide_agent.history import get_run_history
+from slide_agent.models import TopicRequest
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    monkeypatch.setenv("LLM__FAKE_LATENCY", "0.02")
+
+
+def test_runs_are_recorded(tmp_path, fake_llm, run_history):
+    """Each run stores its request, node timings and LLM routes."""
+    result = run_agent(TopicRequest(topic="History", slide_count=5), str(tmp_path))
+
+    history = get_run_history(str(run_history))
+    [run] = history.runs()
+    assert run["topic"] == "History"
+    assert run["slide_count"] == 5
+    assert run["provider"] == "fake"
+    assert run["status"] == "ok"
+    assert run["slides"] == 5
+    assert set(result.metadata["node_seconds"]) == {
+        "planner",
+        "slide_writer",
+        "reviewer",
+        "filesystem_writer",
+    }
+
+
+def test_estimate_scales_with_slide_count(tmp_path, fake_llm, run_history):
+    """Estimates interpolate tokens and time and split slides by type."""
+    for count in (4, 8, 12):
+        run_agent(TopicRequest(topic="History", slide_count=count), str(tmp_path))
+
+    history = get_run_history(str(run_history))
+    small = history.estimate(TopicRequest(topic="Plan", slide_count=6))
+    large = history.estimate(TopicRequest(topic="Plan", slide_count=14))
+
+    assert small["runs"] == 3
+    assert small["planning"] == "flat"
+    assert 0 < small["latency_seconds"] < large["latency_seconds"]
+    assert small["latency_p90_seconds"] >= small["latency_seconds"]
+    assert small["output_tokens"] < large["output_tokens"]
+
+    writer_calls = sum(
+        route["calls"]
+        for key, route in large["routes"].items()
+        if key.startswith("slide_writer:")
+    )
+    assert writer_calls == pytest.approx(14)
+    assert large["routes"]["slide_writer:title"]["calls"] == pytest.approx(1)
+    assert large["routes"]["planner"]["calls"] == pytest.approx(1)
+    assert large["models"]["gpt-4o"]["input_tokens"] == pytest.approx(
+        large["input_tokens"]
+    )
+
+
+def test_estimate_uses_current_routes(tmp_path, fake_llm, run_history, monkeypatch):
+    """Models and prices of the estimate follow the configured routing."""
+    run_agent(TopicRequest(topic="History", slide_count=6), str(tmp_path))
+    monkeypatch.setenv(
+        "WORKFLOW__SLIDE_GENERATION__SLIDE_TYPE_ROUTES",
+        '{"code": {"model": "gpt-4o-mini", "input_cost_per_1k": 1.0}}',
+    )
+
+    estimate = get_run_history(str(run_history)).estimate(
+        TopicRequest(topic="Plan", slide_count=6)
+    )
+
+    code = estimate["routes"]["slide_writer:code"]
+    assert code["model"] == "gpt-4o-mini"
+    assert code["cost_usd"] == pytest.approx(code["input_tokens"] / 1000)
+
+
+def test_estimate_skips_fully_cached_runs(tmp_path, fake_llm, run_history, monkeypatch):
+    """Runs answered entirely from the LLM cache do not drag the estimate down."""
+    monkeypatch.setenv("CACHE__ENABLED", "true")
+    monkeypatch.setenv("CACHE__PATH", str(tmp_path / "cache.sqlite"))
+    request = TopicRequest(topic="History", slide_count=6)
+    for _ in range(4):
+        run_agent(request, str(tmp_path))
+
+    estimate = get_run_history(str(run_history)).estimate(request)
+
+    assert estimate["runs"] == 1
+    assert estimate["nodes"]["planner"] >= 0.02
+
+
+def test_estimate_needs_history(run_history, monkeypatch):
+    """Without successful runs of the provider there is nothing to estimate."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    with pytest.raises(ValueError, match="No successful"):
+        get_run_history(str(run_history)).estimate(
+            TopicRequest(topic="Plan", slide_count=6)
+        )
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Test the reducer-based agent state."""
+
+import asyncio
+
+from slide_agent import agent_graph
+from slide_agent.models import AgentState, TopicRequest, append_slides, merge_metadata
+
+
+def test_reducers_merge_partial_updates():
+    """Updates only carry new keys and slides; empty updates keep the value."""
+    metadata = {"session_id": "s"}
+    assert merge_metadata(metadata, {}) is metadata
+    assert merge_metadata(metadata, {"a": 1}) == {"session_id": "s", "a": 1}
+    assert append_slides([], []) == []
+
+
+def test_graph_state_holds_no_deck_or_raw_responses(tmp_path, monkeypatch):
+    """The graph keeps slides once; the deck is only built for the result."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    request = TopicRequest(topic="Lean", slide_count=5)
+    initial = AgentState(request=request, metadata={"output_dir": str(tmp_path)})
+
+    graph_result = asyncio.run(agent_graph._get_agent_graph().ainvoke(initial))
+    assert graph_result.get("deck") is None
+    assert len(graph_result["slides"]) == 5
+    assert "planner_response" not in graph_result["metadata"]
+    assert graph_result["metadata"]["output_dir"] == str(tmp_path)
+
+    result = agent_graph.run_agent(request, str(tmp_path))
+    assert [s.title for s in result.deck.slides] == [s.title for s in result.slides]
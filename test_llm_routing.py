@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Test per-slide-type model routing and per-route reporting."""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from slide_agent import llm
+from slide_agent.agent_graph import run_agent
+from slide_agent.config_schemas import SlideGenerationConfig
+from slide_agent.llm import resolve_route
+from slide_agent.models import SlideType, TopicRequest
+
+ROUTES = {
+    "title": {"model": "gpt-4o-mini", "max_tokens": 300},
+    "code": {"temperature": 0.1, "input_cost_per_1k": 2.5, "output_cost_per_1k": 10},
+}
+
+
+def test_routes_fall_back_to_role_and_llm_settings(monkeypatch):
+    """Routes override only what they set; roles use their own temperature."""
+    monkeypatch.setenv("LLM__MODEL", "gpt-4o")
+    monkeypatch.setenv(
+        "WORKFLOW__SLIDE_GENERATION__SLIDE_TYPE_ROUTES", json.dumps(ROUTES)
+    )
+    monkeypatch.setenv("WORKFLOW__SLIDE_GENERATION__WRITER_TEMPERATURE", "0.9")
+
+    title = resolve_route("slide_writer", SlideType.TITLE)
+    assert (title.model, title.temperature, title.max_tokens) == (
+        "gpt-4o-mini",
+        0.9,
+        300,
+    )
+
+    code = resolve_route("slide_writer", "code")
+    assert (code.model, code.temperature) == ("gpt-4o", 0.1)
+
+    assert resolve_route("reviewer").temperature == 0.3
+    assert resolve_route("reviewer", "title").model == "gpt-4o"
+
+
+def test_run_reports_latency_and_cost_per_route(tmp_path, monkeypatch):
+    """Each route's calls, tokens and cost end up in the run metadata."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    monkeypatch.setenv(
+        "WORKFLOW__SLIDE_GENERATION__SLIDE_TYPE_ROUTES", json.dumps(ROUTES)
+    )
+
+    result = run_agent(TopicRequest(topic="Routing", slide_count=6), str(tmp_path))
+    routes = result.metadata["llm_routes"]
+
+    assert routes["slide_writer:title"]["model"] == "gpt-4o-mini"
+    assert routes["slide_writer:code"]["calls"] == 1
+    assert routes["slide_writer:code"]["cost_usd"] > 0
+    assert routes["slide_writer:title"]["cost_usd"] == 0
+    assert routes["planner"]["calls"] == routes["reviewer"]["calls"] == 1
+
+
+def test_misspelled_slide_type_routes_are_rejected():
+    """A route key that is no slide type fails validation instead of being ignored."""
+    with pytest.raises(ValidationError, match="Unknown slide types codee"):
+        SlideGenerationConfig(slide_type_routes={"codee": {"model": "gpt-4o-mini"}})
+
+
+def test_settings_are_read_once_per_run(tmp_path, monkeypatch):
+    """LLM calls of a run reuse its settings instead of re-reading the environment."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    reads = []
+    get_settings = llm.get_settings
+
+    def counting_get_settings():
+        reads.append(1)
+        return get_settings()
+
+    monkeypatch.setattr(llm, "get_settings", counting_get_settings)
+
+    run_agent(TopicRequest(topic="Routing", slide_count=4), str(tmp_path))
+
+    assert reads == []
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Test the load-testing harness against the fake LLM."""
+
+import asyncio
+
+import pytest
+
+from slide_agent.loadtest import (
+    arrival_schedule,
+    parse_deck_sizes,
+    percentile,
+    run_load_test,
+)
+from slide_agent.writers import FilesystemWriter
+
+
+def test_deck_sizes_and_percentiles():
+    """Size distributions parse with default weights; percentiles use nearest rank."""
+    assert parse_deck_sizes("6:3,12") == {6: 3.0, 12: 1.0}
+    with pytest.raises(ValueError):
+        parse_deck_sizes("0:1")
+
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) is None
+
+
+def test_arrivals_are_seeded_poisson():
+    """The schedule is reproducible and its mean gap matches the rate."""
+    schedule = arrival_schedule(2000, 10.0, {6: 1.0, 12: 1.0}, seed=1)
+    assert schedule == arrival_schedule(2000, 10.0, {6: 1.0, 12: 1.0}, seed=1)
+    assert schedule[0][0] == 0.0
+    assert 0.09 < schedule[-1][0] / 1999 < 0.11
+    assert {size for _, size in schedule} == {6, 12}
+
+
+@pytest.mark.parametrize("mode", ["async", "threads"])
+def test_load_test_report(monkeypatch, mode):
+    """A short load test reports throughput, latency percentiles and memory."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    monkeypatch.setenv("LLM__FAKE_LATENCY", "0.01")
+
+    report = asyncio.run(
+        run_load_test(6, rate=50.0, concurrency=3, deck_sizes={4: 1.0}, mode=mode)
+    )
+
+    assert report["succeeded"] == 6
+    assert report["error_rate"] == 0.0
+    assert report["throughput_rps"] > 0
+    latency = report["latency_seconds"]
+    assert 0 < latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+    assert report["latency_by_slide_count"]["4"]["requests"] == 6
+    assert report["peak_rss_bytes"] > 0
+
+
+def test_injected_errors_are_reported(monkeypatch):
+    """Failing fake LLM calls show up as failed requests by cause."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    monkeypatch.setenv("LLM__FAKE_ERROR_RATE", "1.0")
+
+    report = asyncio.run(run_load_test(3, rate=100.0, deck_sizes={4: 1.0}))
+
+    assert report["failed"] == 3
+    assert report["error_rate"] == 1.0
+    assert report["errors"] == {"FakeLLMError": 3}
+    assert report["latency_seconds"]["p50"] is None
+
+
+def test_failed_writes_are_reported_by_exception(monkeypatch):
+    """Runs ending in an error state report the exception that caused it."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+
+    async def failing_write(self, *args, **kwargs):
+        raise PermissionError("read-only output directory")
+
+    monkeypatch.setattr(FilesystemWriter, "write_deck", failing_write)
+
+    report = asyncio.run(run_load_test(2, rate=100.0, deck_sizes={4: 1.0}))
+
+    assert report["errors"] == {"PermissionError": 2}
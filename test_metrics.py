@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test the metrics registry, its exporters and the pipeline instrumentation."""
+
+import json
+import urllib.request
+
+import pytest
+
+from slide_agent import agent_graph, metrics
+from slide_agent.agent_graph import run_agent
+from slide_agent.llm import resolve_route
+from slide_agent.metrics import MetricsRegistry
+from slide_agent.models import AgentState, TopicRequest
+
+
+def test_prometheus_and_json_export(tmp_path):
+    """Counters and cumulative histogram buckets are exported in both formats."""
+    registry = MetricsRegistry()
+    decks = registry.counter("decks_total", "Decks", ["status"])
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+    decks.inc(status="ok")
+    decks.inc(2, status="ok")
+    for value in (0.05, 0.5, 5):
+        latency.observe(value)
+
+    text = registry.to_prometheus()
+    assert 'decks_total{status="ok"} 3' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_count 3" in text
+
+    registry.write_json(tmp_path / "metrics.json")
+    snapshot = json.loads((tmp_path / "metrics.json").read_text())
+    assert snapshot["latency_seconds"]["samples"][0]["sum"] == 5.55
+
+    server = registry.serve(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        assert urllib.request.urlopen(url).read().decode() == text
+    finally:
+        server.shutdown()
+
+
+def test_registering_a_name_twice_returns_the_same_metric():
+    """Re-registering returns the existing metric, a different type is an error."""
+    registry = MetricsRegistry()
+    decks = registry.counter("decks_total", "Decks")
+
+    assert registry.counter("decks_total", "Decks") is decks
+    with pytest.raises(ValueError, match="already a counter"):
+        registry.histogram("decks_total", "Decks")
+
+
+def test_agent_run_reports_metrics(tmp_path, monkeypatch):
+    """A run counts the deck, LLM latency per slide type and written bytes."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    decks_before = metrics.DECKS_GENERATED.value(status="ok")
+    code_route = {
+        "node": "slide_writer",
+        "slide_type": "code",
+        "model": resolve_route("slide_writer", "code").model,
+    }
+    code_calls_before = metrics.LLM_LATENCY.count(**code_route)
+    bytes_before = metrics.WRITE_BYTES.value(file="slides.md")
+
+    run_agent(TopicRequest(topic="Metrics", slide_count=5), str(tmp_path))
+
+    assert metrics.DECKS_GENERATED.value(status="ok") == decks_before + 1
+    assert metrics.LLM_LATENCY.count(**code_route) == code_calls_before + 1
+    assert metrics.WRITE_BYTES.value(file="slides.md") > bytes_before
+
+
+def test_failed_planner_call_is_counted_once(monkeypatch):
+    """An LLM error is an ``llm.planner`` failure, not also a ``planner`` one."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+
+    class FailingLLM:
+        def bind_tools(self, tools, tool_choice=None):
+            return self
+
+        async def ainvoke(self, messages):
+            raise TimeoutError("planner timed out")
+
+    monkeypatch.setattr(agent_graph, "get_llm", lambda *args, **kwargs: FailingLLM())
+    failures = {
+        stage: metrics.FAILURES.value(stage=stage, cause="TimeoutError")
+        for stage in ("llm.planner", "planner")
+    }
+
+    request = TopicRequest(topic="Failures", slide_count=3)
+    result = agent_graph.planner_node(AgentState(request=request))
+
+    assert len(result["outline"]) == 3
+    assert metrics.FAILURES.value(stage="llm.planner", cause="TimeoutError") == (
+        failures["llm.planner"] + 1
+    )
+    assert metrics.FAILURES.value(stage="planner", cause="TimeoutError") == (
+        failures["planner"]
+    )
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Test run profiling and the offline fake LLM."""
+
+import pstats
+import time
+
+from slide_agent.agent_graph import run_agent
+from slide_agent.models import TopicRequest
+from slide_agent.profiling import profiled
+
+
+def test_profiled_writes_all_reports(tmp_path):
+    """CPU stats, collapsed stacks and the allocation report are written."""
+    with profiled(tmp_path, "busy", sample_interval=0.001) as result:
+        deadline = time.perf_counter() + 0.05
+        data = []
+        while time.perf_counter() < deadline:
+            data.append("x" * 100)
+
+    assert set(result.files) == {"pstats", "cprofile", "collapsed", "alloc"}
+    assert pstats.Stats(result.files["pstats"]).total_calls > 0
+    assert "test_profiled_writes_all_reports" in open(result.files["collapsed"]).read()
+    assert "Top 30 allocation sites" in open(result.files["alloc"]).read()
+    assert result.peak_memory > 0
+
+
+def test_fake_llm_runs_offline(tmp_path, monkeypatch):
+    """The fake provider plans and writes the requested number of slides."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    monkeypatch.setenv("OPENAI_API_KEY", "")
+
+    result = run_agent(TopicRequest(topic="Offline", slide_count=7), str(tmp_path))
+
+    assert result.error is None
+    assert len(result.deck.slides) == 7
+    assert result.deck.slides[-1].title == "Summary"
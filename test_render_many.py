@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Test bulk rendering of decks across a process pool."""
+
+from slide_agent.generators import SlideGenerator, render_many
+from slide_agent.models import SlideDeck, SlideSpec, SlideType
+
+
+def _make_deck(index: int) -> SlideDeck:
+    """Create a small deck with a title, bullet and code slide."""
+    return SlideDeck(
+        title=f"Deck {index}",
+        slides=[
+            SlideSpec(
+                title=f"Deck {index}",
+                slide_type=SlideType.TITLE,
+                content="An introduction",
+            ),
+            SlideSpec(
+                title="Key points",
+                slide_type=SlideType.BULLETS,
+                content=f"- Point {index}\n- Another point",
+            ),
+            SlideSpec(
+                title="Example",
+                slide_type=SlideType.CODE,
+                content="```python\nprint('hello')\n```",
+            ),
+        ],
+    )
+
+
+def test_render_many_matches_sequential_rendering():
+    """Parallel rendering returns the same markdown as a single generator."""
+    decks = [_make_deck(i) for i in range(12)]
+    generator = SlideGenerator()
+    expected = [generator.generate_deck_markdown(_make_deck(i)) for i in range(12)]
+
+    results = dict(render_many(decks, workers=2, chunksize=3))
+
+    assert sorted(results) == list(range(12))
+    for index, markdown in results.items():
+        assert markdown == expected[index]
+
+
+def test_render_many_single_worker():
+    """A single worker renders inline and keeps input order."""
+    decks = [_make_deck(i) for i in range(3)]
+
+    results = list(render_many(decks, workers=1))
+
+    assert [index for index, _ in results] == [0, 1, 2]
+    assert "Deck 2" in results[2][1]
+
+
+if __name__ == "__main__":
+    test_render_many_matches_sequential_rendering()
+    test_render_many_single_worker()
+    print("✅ render_many works")
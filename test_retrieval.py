@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Test the local BM25 index used to ground slides in course material."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from slide_agent.agent_graph import run_agent
+from slide_agent.models import TopicRequest
+from slide_agent.retrieval import RetrievalIndex, split_passages
+
+
+def write_docs(source_dir):
+    source_dir.mkdir()
+    (source_dir / "python.md").write_text(
+        "# Generators\nA generator yields values lazily with the yield keyword.\n\n"
+        "# Decorators\nA decorator wraps a function to extend its behaviour.\n"
+    )
+    (source_dir / "rust.txt").write_text(
+        "Ownership and borrowing keep memory safe without a garbage collector.\n"
+    )
+
+
+def test_split_passages_keeps_headings():
+    """Passages follow headings and are capped at the configured word count."""
+    text = "Intro words\n# First\n" + "word " * 25 + "\n## Second\nshort"
+    passages = split_passages(text, passage_words=10)
+
+    assert passages[0] == ("", "Intro words")
+    assert [heading for heading, _ in passages[1:]] == ["First"] * 3 + ["Second"]
+    assert all(len(body.split()) <= 10 for _, body in passages)
+
+
+def test_search_ranks_matching_passage_first(tmp_path):
+    """The passage sharing the rare query terms wins and carries its citation."""
+    write_docs(tmp_path / "docs")
+    with RetrievalIndex(tmp_path / "docs", tmp_path / "index") as index:
+        assert index.update() == {
+            "added": 2,
+            "updated": 0,
+            "unchanged": 0,
+            "removed": 0,
+        }
+        [best, *_] = index.search("how does yield work in a generator", k=2)
+
+    assert best.source == "python.md"
+    assert best.citation == "python.md (Generators)"
+    assert "yield" in best.text
+
+
+def test_update_only_rereads_changed_files(tmp_path):
+    """Unchanged files are skipped, edits and deletions reach the segment."""
+    source_dir = tmp_path / "docs"
+    write_docs(source_dir)
+    with RetrievalIndex(source_dir, tmp_path / "index") as index:
+        index.update()
+        assert index.update()["unchanged"] == 2
+
+        rust = source_dir / "rust.txt"
+        rust.write_text("Lifetimes describe how long references stay valid.\n")
+        os.utime(rust, ns=(0, 10**9))
+        (source_dir / "python.md").unlink()
+        stats = index.update()
+
+        assert (stats["updated"], stats["removed"]) == (1, 1)
+        assert index.search("generator yield") == []
+        assert index.search("lifetimes")[0].source == "rust.txt"
+
+
+def test_search_during_recompiles(tmp_path):
+    """Queries use one consistent segment while another thread recompiles."""
+    source_dir = tmp_path / "docs"
+    write_docs(source_dir)
+    extra = source_dir / "extra.md"
+    errors = []
+    with RetrievalIndex(source_dir, tmp_path / "index") as index:
+        index.update()
+        done = threading.Event()
+
+        def search() -> None:
+            while not done.is_set():
+                try:
+                    [best] = index.search("generator yield", k=1)
+                    assert best.citation == "python.md (Generators)"
+                except Exception as e:  # pragma: no cover - reported below
+                    errors.append(e)
+
+        searchers = [threading.Thread(target=search) for _ in range(4)]
+        for thread in searchers:
+            thread.start()
+        for number in range(20):
+            extra.write_text("# Extra\n" + "filler words " * (number + 1))
+            os.utime(extra, ns=(0, number * 10**9))
+            index.update()
+        done.set()
+        for thread in searchers:
+            thread.join()
+
+    assert errors == []
+    assert not list((tmp_path / "index").glob("*.tmp"))
+
+
+def test_search_stays_within_latency_budget(tmp_path):
+    """Queries on a few thousand passages answer well below 10 ms."""
+    source_dir = tmp_path / "docs"
+    source_dir.mkdir()
+    vocabulary = [f"term{n}" for n in range(3000)]
+    for number in range(30):
+        sections = [
+            f"# Section {section}\n"
+            + " ".join(
+                vocabulary[(number * 7919 + section * 104729 + word * 31) % 3000]
+                for word in range(100)
+            )
+            for section in range(50)
+        ]
+        (source_dir / f"chapter{number}.md").write_text("\n".join(sections))
+
+    with RetrievalIndex(source_dir, tmp_path / "index") as index:
+        index.update()
+        queries = [" ".join(vocabulary[n : n + 6]) for n in range(0, 3000, 60)]
+        index.search(queries[0])
+        start_time = time.perf_counter()
+        for query in queries:
+            assert index.search(query)
+        per_query = (time.perf_counter() - start_time) / len(queries)
+
+    assert per_query < 0.01
+
+
+def test_slides_cite_retrieved_passages(tmp_path, monkeypatch):
+    """With RAG citations enabled the speaker notes name their sources."""
+    write_docs(tmp_path / "docs")
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    monkeypatch.setenv("WORKFLOW__ENABLE_RAG_CITATIONS", "true")
+    monkeypatch.setenv("WORKFLOW__RAG_SOURCE_DIR", str(tmp_path / "docs"))
+    monkeypatch.setenv("WORKFLOW__RAG_INDEX_DIR", str(tmp_path / "index"))
+
+    result = run_agent(
+        TopicRequest(topic="Python generators and decorators", slide_count=4),
+        str(tmp_path / "out"),
+    )
+
+    cited = [slide for slide in result.slides if "Sources:" in (slide.notes or "")]
+    assert cited
+    assert "python.md" in cited[0].notes
+
+
+@pytest.mark.parametrize("speculative", [False, True])
+def test_runs_update_the_index_once_off_the_loop(tmp_path, monkeypatch, speculative):
+    """Every run refreshes the index in a worker thread before writing slides."""
+    write_docs(tmp_path / "docs")
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    monkeypatch.setenv("AGENT__SPECULATIVE_WRITING", str(speculative).lower())
+    monkeypatch.setenv("WORKFLOW__ENABLE_RAG_CITATIONS", "true")
+    monkeypatch.setenv("WORKFLOW__RAG_SOURCE_DIR", str(tmp_path / "docs"))
+    monkeypatch.setenv("WORKFLOW__RAG_INDEX_DIR", str(tmp_path / "index"))
+    threads = []
+    update = RetrievalIndex.update
+
+    def recording_update(self):
+        threads.append(threading.current_thread())
+        return update(self)
+
+    monkeypatch.setattr(RetrievalIndex, "update", recording_update)
+    request = TopicRequest(topic="Python generators", slide_count=3)
+    run_agent(request, str(tmp_path / "first"))
+
+    (tmp_path / "docs" / "async.md").write_text(
+        "# Coroutines\nA coroutine awaits other coroutines with await.\n"
+    )
+    result = run_agent(
+        request.model_copy(update={"topic": "Coroutines and await"}),
+        str(tmp_path / "second"),
+    )
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+    assert any("async.md" in (slide.notes or "") for slide in result.slides)
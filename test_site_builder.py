@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Test the incremental site builder with a stub build command."""
+
+import shlex
+import sys
+
+from slide_agent.site import SiteBuilder
+
+# Stub for `npm run build`: copies slides.md into dist/index.html and logs a run
+STUB_BUILD = (
+    "import pathlib, sys; "
+    "pathlib.Path('dist').mkdir(exist_ok=True); "
+    "pathlib.Path('dist/index.html').write_text("
+    "sys.argv[1] + pathlib.Path('slides.md').read_text()); "
+    "open('builds.log', 'a').write('x')"
+)
+BUILD_COMMAND = f"{shlex.quote(sys.executable)} -c {shlex.quote(STUB_BUILD)} {{base}}"
+
+
+def _make_deck(root, name, content):
+    """Create a minimal deck directory."""
+    deck_dir = root / name
+    deck_dir.mkdir(parents=True)
+    (deck_dir / "slides.md").write_text(content)
+    (deck_dir / "package.json").write_text("{}")
+    return deck_dir
+
+
+def _builder(tmp_path):
+    return SiteBuilder(
+        tmp_path / "slides",
+        tmp_path / "site",
+        base_url="/demo",
+        build_command=BUILD_COMMAND,
+        install_command=None,
+        workers=2,
+    )
+
+
+def test_only_changed_decks_are_rebuilt(tmp_path):
+    """A second build skips unchanged decks and rebuilds edited ones."""
+    first = _make_deck(tmp_path / "slides", "presentation-first", "# First")
+    second = _make_deck(tmp_path / "slides", "presentation-second", "# Second")
+
+    result = _builder(tmp_path).build()
+    assert sorted(result["built"]) == ["presentation-first", "presentation-second"]
+    assert (tmp_path / "site" / "first" / "index.html").read_text() == (
+        "/demo/first/# First"
+    )
+
+    (second / "slides.md").write_text("# Second, edited")
+    result = _builder(tmp_path).build()
+
+    assert result["built"] == ["presentation-second"]
+    assert result["unchanged"] == ["presentation-first"]
+    assert (first / "builds.log").read_text() == "x"
+    assert "edited" in (tmp_path / "site" / "second" / "index.html").read_text()
+
+
+def test_failed_builds_are_reported_and_retried(tmp_path):
+    """A failing deck is reported and not recorded as built."""
+    _make_deck(tmp_path / "slides", "presentation-broken", "# Broken")
+    builder = _builder(tmp_path)
+    builder.build_command = f"{shlex.quote(sys.executable)} -c 'raise SystemExit(3)'"
+
+    result = builder.build()
+
+    assert "exit code 3" in result["failed"]["presentation-broken"]
+    assert "presentation-broken" not in builder.load_state()
+
+
+def test_sync_tree_removes_stale_files(tmp_path):
+    """Files missing from the source are removed from the target."""
+    source = tmp_path / "src"
+    (source / "assets").mkdir(parents=True)
+    (source / "index.html").write_text("new")
+    (source / "assets" / "app.js").write_text("js")
+    target = tmp_path / "dst"
+    (target / "old").mkdir(parents=True)
+    (target / "old" / "stale.js").write_text("stale")
+
+    assert SiteBuilder.sync_tree(source, target) == 2
+    assert SiteBuilder.sync_tree(source, target) == 0
+    assert not (target / "old").exists()
+    assert (target / "assets" / "app.js").read_text() == "js"
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    for test in (
+        test_only_changed_decks_are_rebuilt,
+        test_failed_builds_are_reported_and_retried,
+        test_sync_tree_removes_stale_files,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Site builder works")
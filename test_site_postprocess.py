@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Test fingerprinting, precompression and cache headers of the built site."""
+
+import gzip
+import json
+
+from slide_agent.site import SiteBuilder, SitePostprocessor
+from slide_agent.site.postprocess import is_generated
+
+
+def _make_site(root):
+    """Create a small site shaped like Slidev output."""
+    (root / "deck" / "assets").mkdir(parents=True)
+    (root / "index.html").write_text('<a href="deck/">Deck</a>' + "<p>x</p>" * 200)
+    (root / "deck" / "index.html").write_text(
+        '<script src="/demo/deck/assets/index-AbCd1234.js"></script>'
+        '<img src="/demo/deck/logo.svg?v=1"><link href="style.css">'
+    )
+    (root / "deck" / "assets" / "index-AbCd1234.js").write_text("run();" * 500)
+    (root / "deck" / "logo.svg").write_text("<svg>" + "<g/>" * 400 + "</svg>")
+    (root / "deck" / "style.css").write_text("h1{background:url(logo.svg)}" * 50)
+
+
+def test_assets_are_fingerprinted_and_precompressed(tmp_path):
+    """Unhashed assets get hashed names that HTML and CSS point to."""
+    site = tmp_path / "site"
+    _make_site(site)
+
+    result = SitePostprocessor(site, base_url="/demo", use_brotli=False).run()
+
+    manifest = json.loads((site / "asset-manifest.json").read_text())["files"]
+    logo = manifest["deck/logo.svg"]["file"]
+    style = manifest["deck/style.css"]["file"]
+    assert logo.startswith("deck/logo.") and logo != "deck/logo.svg"
+    assert manifest["deck/assets/index-AbCd1234.js"]["file"] == (
+        "deck/assets/index-AbCd1234.js"
+    )
+    assert manifest["deck/assets/index-AbCd1234.js"]["immutable"]
+    assert not manifest["deck/index.html"]["immutable"]
+
+    page = (site / "deck" / "index.html").read_text()
+    assert f'src="/demo/{logo}?v=1"' in page
+    assert f'href="{style.removeprefix("deck/")}"' in page
+    assert f"url({logo.removeprefix('deck/')})" in (site / style).read_text()
+
+    compressed = (site / "deck" / "assets" / "index-AbCd1234.js.gz").read_bytes()
+    assert gzip.decompress(compressed) == b"run();" * 500
+    assert (site / (logo + ".gz")).is_file()
+    assert not (site / "deck" / "index.html.gz").exists()  # below the minimum
+    assert result["fingerprinted"] == 2
+
+    headers = (site / "_headers").read_text()
+    assert f"/demo/{logo}\n  Cache-Control: public, max-age=31536000, immutable" in (
+        headers
+    )
+    assert "/demo/deck/\n  Cache-Control: public, max-age=0, must-revalidate" in (
+        headers
+    )
+
+
+def test_only_changed_files_are_processed(tmp_path):
+    """A second run skips unchanged files and replaces outdated hashed copies."""
+    site = tmp_path / "site"
+    _make_site(site)
+    postprocessor = SitePostprocessor(site, base_url="/demo", use_brotli=False)
+    postprocessor.run()
+    old_logo = postprocessor.load_state()["deck/logo.svg"]["file"]
+
+    assert postprocessor.run()["processed"] == 0
+
+    (site / "deck" / "logo.svg").write_text("<svg>" + "<rect/>" * 400 + "</svg>")
+    result = postprocessor.run()
+
+    new_logo = postprocessor.load_state()["deck/logo.svg"]["file"]
+    assert new_logo != old_logo
+    assert not (site / old_logo).exists()
+    assert not (site / (old_logo + ".gz")).exists()
+    assert result["unchanged"] == 1  # the Vite bundle
+    assert new_logo.removeprefix("deck/") in (site / "deck" / "index.html").read_text()
+
+
+def test_sync_tree_keeps_generated_files(tmp_path):
+    """Rebuilding a deck does not delete the precompressed copies in the site."""
+    source = tmp_path / "dist"
+    source.mkdir()
+    (source / "app.js").write_text("js")
+    target = tmp_path / "site"
+    target.mkdir()
+    (target / "app.js.gz").write_bytes(b"gz")
+    (target / "stale.js").write_text("stale")
+
+    SiteBuilder.sync_tree(source, target, keep=is_generated)
+
+    assert (target / "app.js.gz").exists()
+    assert not (target / "stale.js").exists()
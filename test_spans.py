@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Test the local span recorder and its trace exports."""
+
+import json
+
+from slide_agent import agent_graph
+from slide_agent.models import TopicRequest
+from slide_agent.spans import recording, span
+
+
+def test_spans_are_noops_without_recorder():
+    """Without an active recorder nothing is recorded."""
+    with span("idle") as current:
+        assert current is None
+
+
+def test_nested_spans_export_chrome_and_otel():
+    """Child spans point to their parent in both export formats."""
+    with recording() as recorder:
+        with span("outer", deck="demo"):
+            with span("inner") as inner:
+                inner.set(tokens=3)
+
+    inner, outer = recorder.spans
+    assert inner.parent_id == outer.span_id
+
+    events = recorder.to_chrome_trace()["traceEvents"]
+    assert [e["name"] for e in events if e["ph"] == "X"] == ["outer", "inner"]
+
+    otel_spans = recorder.to_otel()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    by_name = {s["name"]: s for s in otel_spans}
+    assert by_name["inner"]["parentSpanId"] == by_name["outer"]["spanId"]
+    assert by_name["inner"]["attributes"] == [
+        {"key": "tokens", "value": {"intValue": "3"}}
+    ]
+
+
+def test_agent_run_writes_trace_files(tmp_path, stub_llm):
+    """A traced run covers nodes, LLM calls, rendering and file writes."""
+
+    result = agent_graph.run_agent(
+        TopicRequest(topic="Tracing"),
+        str(tmp_path / "deck"),
+        trace_dir=str(tmp_path / "traces"),
+    )
+
+    trace = json.loads(open(result.metadata["trace_files"]["chrome"]).read())
+    names = {e["name"] for e in trace["traceEvents"] if e["ph"] == "X"}
+    assert {
+        "run",
+        "node.planner",
+        "node.slide_writer",
+        "llm.invoke",
+        "render.deck",
+        "write.file",
+    } <= names
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Test speculative slide writing from the streamed planner outline."""
+
+import asyncio
+import gc
+import json
+import time
+
+from slide_agent import agent_graph
+from slide_agent.agent_graph import run_agent
+from slide_agent.models import TopicRequest
+from slide_agent.streaming import OutlineStreamParser
+
+
+def test_parser_yields_slides_as_soon_as_they_complete():
+    """Slides are returned by the chunk that closes them, braces in strings ignored."""
+    slides = [
+        {"title": 'Sets {"a"}', "key_points": ["x]", "y"]},
+        {"title": "Second", "slide_type": "code"},
+    ]
+    text = json.dumps({"slides": slides})
+    first_end = text.index("}, {") + 1
+
+    parser = OutlineStreamParser()
+    assert parser.feed(text[: first_end - 1]) == []
+    assert parser.feed(text[first_end - 1 : first_end + 5]) == [slides[0]]
+    assert parser.feed(text[first_end + 5 :]) == [slides[1]]
+
+
+def test_speculative_writing_overlaps_planning(tmp_path, monkeypatch):
+    """With a slow streamed planner, slides are written before planning ends."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    monkeypatch.setenv("LLM__FAKE_LATENCY", "0.3")
+    request = TopicRequest(topic="Speculation", slide_count=6)
+
+    events: list[tuple[str, float]] = []
+    write_slide = agent_graph._write_slide
+    outline_from_response = agent_graph._outline_from_response
+
+    async def recording_write_slide(*args, **kwargs):
+        events.append(("write", time.perf_counter()))
+        return await write_slide(*args, **kwargs)
+
+    def recording_outline(*args, **kwargs):
+        events.append(("planned", time.perf_counter()))
+        return outline_from_response(*args, **kwargs)
+
+    monkeypatch.setattr(agent_graph, "_write_slide", recording_write_slide)
+    monkeypatch.setattr(agent_graph, "_outline_from_response", recording_outline)
+
+    def run(speculative: bool):
+        monkeypatch.setenv("AGENT__SPECULATIVE_WRITING", str(speculative).lower())
+        events.clear()
+        return run_agent(request, str(tmp_path / str(speculative)))
+
+    baseline = run(False)
+    planned = next(t for kind, t in events if kind == "planned")
+    assert all(t > planned for kind, t in events if kind == "write")
+
+    speculative = run(True)
+    planned = next(t for kind, t in events if kind == "planned")
+    writes = [t for kind, t in events if kind == "write"]
+
+    # Every slide was written from the stream and none had to be redone
+    assert speculative.metadata["speculative_slides"] == 6
+    assert len(writes) == 6
+    assert all(t < planned for t in writes)
+    assert [s.title for s in speculative.deck.slides] == [
+        s.title for s in baseline.deck.slides
+    ]
+
+
+def test_discarded_tasks_do_not_log_unretrieved_exceptions(caplog):
+    """A speculative task failing while it is cancelled has its exception retrieved."""
+
+    async def write():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            raise ValueError("closing the stream failed") from None
+
+    async def main():
+        task = asyncio.create_task(write())
+        await asyncio.sleep(0)
+        agent_graph._discard(task)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        del task
+        gc.collect()
+
+    asyncio.run(main())
+    assert "never retrieved" not in caplog.text
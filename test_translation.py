@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Test batched translation of generated decks."""
+
+import json
+from pathlib import Path
+
+from slide_agent import agent_graph
+from slide_agent.agent_graph import run_agent
+from slide_agent.models import SlideDeck, SlideSpec, SlideType, TopicRequest
+from slide_agent.translation import DeckTranslation, protect_code, restore_code
+
+CODE = "```python\nprint('hallo')\n```"
+
+
+def _deck() -> SlideDeck:
+    return SlideDeck(
+        title="Einführung",
+        slides=[
+            SlideSpec(title="Start", slide_type=SlideType.TITLE, content="Hallo"),
+            SlideSpec(
+                title="Code",
+                slide_type=SlideType.CODE,
+                content=f"Rufe `print` auf:\n\n{CODE}",
+            ),
+            SlideSpec(title="Nur Code", slide_type=SlideType.CODE, content=CODE),
+        ],
+        metadata={"language": "de"},
+    )
+
+
+def test_code_is_protected_and_lost_placeholders_are_detected():
+    """Code never reaches the translator; mangled placeholders are rejected."""
+    text, blocks = protect_code(f"Rufe `print` auf:\n\n{CODE}")
+    assert "print" not in text
+    assert restore_code(text.replace("Rufe", "Call"), blocks).endswith(CODE)
+    assert restore_code("Call it", blocks) is None
+
+
+def test_apply_keeps_originals_for_broken_translations():
+    """Code-only texts are not requested; failed texts stay untranslated."""
+    translation = DeckTranslation(_deck())
+    assert "slides.2.content" not in translation.segments
+    assert translation.batches(1) == [
+        {"title": "Einführung", "slides.0.title": "Start", "slides.0.content": "Hallo"},
+        {
+            "slides.1.title": "Code",
+            "slides.1.content": "Rufe [[CODE0]] auf:\n\n[[CODE1]]",
+        },
+        {"slides.2.title": "Nur Code"},
+    ]
+
+    deck = translation.apply(
+        {
+            "title": "Introduction",
+            "slides.0.title": "x" * 200,
+            "slides.1.content": "Call [[CODE0]]:\n\n[[CODE1]]",
+            "slides.2.content": "Only code",
+        },
+        "en",
+    )
+
+    assert deck.title == "Introduction"
+    assert deck.slides[0].title == "Start"
+    assert deck.slides[1].content == f"Call `print`:\n\n{CODE}"
+    assert deck.slides[2].content == CODE
+    assert deck.metadata["language"] == "en"
+    assert deck.metadata["translated_from"] == "de"
+
+
+def test_run_writes_one_directory_per_language(tmp_path, monkeypatch):
+    """The deck is generated once and translated with one call per batch."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    monkeypatch.setenv("WORKFLOW__TRANSLATION_BATCH_SLIDES", "4")
+    monkeypatch.setenv("WORKFLOW__ENABLE_MULTILANG", "true")
+    monkeypatch.setenv("WORKFLOW__LANGUAGES", '["en", "fr"]')
+    request = TopicRequest(topic="Übersetzung", slide_count=8, language="de")
+
+    result = run_agent(request, str(tmp_path / "deck"))
+
+    routes = result.metadata["llm_routes"]
+    assert routes["planner"]["calls"] == 1
+    assert routes["translator"]["calls"] == 4
+    assert set(result.metadata["translations"]) == {"en", "fr"}
+
+    french = json.loads((tmp_path / "deck-fr" / "deck.json").read_text())
+    original = result.deck.slides
+    assert french["deck"]["metadata"]["language"] == "fr"
+    for slide, translated in zip(original, french["deck"]["slides"]):
+        assert translated["title"] == f"[fr] {slide.title}"
+        for block in protect_code(slide.content)[1]:
+            assert block in translated["content"]
+    assert Path(result.metadata["translations"]["en"]) == tmp_path / "deck-en"
+
+
+def test_failed_translation_does_not_fail_the_run(tmp_path, monkeypatch):
+    """A failing language is reported while the other languages are written."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    translate = agent_graph.translate_deck_async
+
+    async def flaky_translate(deck, language):
+        if language == "fr":
+            raise RuntimeError("translator unavailable")
+        return await translate(deck, language)
+
+    monkeypatch.setattr(agent_graph, "translate_deck_async", flaky_translate)
+    request = TopicRequest(topic="Übersetzung", slide_count=4, language="de")
+
+    result = run_agent(request, str(tmp_path / "deck"), languages=["en", "fr"])
+
+    assert result.deck is not None
+    assert set(result.metadata["translations"]) == {"en"}
+    assert result.metadata["translation_errors"] == {"fr": "translator unavailable"}
+    assert not (tmp_path / "deck-fr").exists()
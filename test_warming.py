@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Test the LLM response cache and cache warming."""
+
+import asyncio
+import sqlite3
+import time
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from slide_agent import metrics
+from slide_agent.agent_graph import run_agent
+from slide_agent.llm_cache import ResponseCache
+from slide_agent.models import TopicRequest
+from slide_agent.warming import load_warm_requests, warm_cache
+
+TOPICS = """
+languages: [de, en]
+slide_count: 4
+topics:
+  - Caching
+  - topic: Warming
+    languages: [de]
+    audience: students
+"""
+
+
+def test_topics_file_expands_languages_and_audiences(tmp_path):
+    """Top-level lists are crossed with the topics, entries override them."""
+    topics_file = tmp_path / "topics.yaml"
+    topics_file.write_text(TOPICS)
+
+    requests = load_warm_requests(topics_file)
+
+    assert [(r.topic, r.language, r.audience) for r in requests] == [
+        ("Caching", "de", "general"),
+        ("Caching", "en", "general"),
+        ("Warming", "de", "students"),
+    ]
+    assert {r.slide_count for r in requests} == {4}
+
+
+def test_warmed_requests_are_served_from_cache(tmp_path, monkeypatch):
+    """After warming, the same request makes no model calls and costs nothing."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    monkeypatch.setenv("LLM__FAKE_LATENCY", "0.05")
+    monkeypatch.setenv("CACHE__ENABLED", "true")
+    monkeypatch.setenv("CACHE__PATH", str(tmp_path / "cache.sqlite"))
+    monkeypatch.setenv(
+        "WORKFLOW__SLIDE_GENERATION__SLIDE_TYPE_ROUTES",
+        '{"bullets": {"input_cost_per_1k": 1, "output_cost_per_1k": 1}}',
+    )
+    request = TopicRequest(topic="Warm Cache", slide_count=5)
+
+    summary = asyncio.run(warm_cache([request, request], concurrency=1))
+    assert [r["status"] for r in summary["results"]] == ["warmed", "cached"]
+    assert summary["results"][0]["cost_usd"] > 0
+
+    others = [TopicRequest(topic=f"Budget {i}", slide_count=5) for i in range(2)]
+    summary = asyncio.run(warm_cache(others, concurrency=1, spend_cap=0.0001))
+    assert [r["status"] for r in summary["results"]] == ["warmed", "skipped"]
+    assert summary["coverage"] == 0.5
+
+    hits = metrics.CACHE_LOOKUPS.value(cache="llm", result="hit")
+    start = time.perf_counter()
+    result = run_agent(request, str(tmp_path / "deck"))
+    elapsed = time.perf_counter() - start
+
+    routes = result.metadata["llm_routes"].values()
+    assert all(route["cache_hits"] == route["calls"] for route in routes)
+    assert sum(route["cost_usd"] for route in routes) == 0
+    assert metrics.CACHE_LOOKUPS.value(cache="llm", result="hit") > hits
+    assert elapsed < 0.05 * 3
+    assert len(result.deck.slides) == 5
+
+
+def test_speculative_writing_plans_through_the_cache(tmp_path, monkeypatch):
+    """With the cache enabled the planner is not streamed and its outline is cached."""
+    monkeypatch.setenv("LLM__PROVIDER", "fake")
+    monkeypatch.setenv("AGENT__SPECULATIVE_WRITING", "true")
+    monkeypatch.setenv("CACHE__ENABLED", "true")
+    monkeypatch.setenv("CACHE__PATH", str(tmp_path / "cache.sqlite"))
+    request = TopicRequest(topic="Speculative Cache", slide_count=4)
+
+    summary = asyncio.run(warm_cache([request, request], concurrency=1))
+
+    assert [r["status"] for r in summary["results"]] == ["warmed", "cached"]
+    result = run_agent(request, str(tmp_path / "deck"))
+    planner = result.metadata["llm_routes"]["planner"]
+    assert planner["cache_hits"] == planner["calls"] == 1
+
+
+def test_cache_writes_do_not_block_the_event_loop(tmp_path):
+    """A cache write waiting on another writer leaves the event loop running."""
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    other = sqlite3.connect(tmp_path / "cache.sqlite", isolation_level=None)
+    generations = [ChatGeneration(message=AIMessage(content="cached"))]
+
+    async def main():
+        other.execute("BEGIN IMMEDIATE")
+        update = asyncio.create_task(cache.aupdate("prompt", "llm", generations))
+        await asyncio.sleep(0.05)
+        assert not update.done()
+        other.execute("COMMIT")
+        await update
+        return await cache.alookup("prompt", "llm")
+
+    cached = asyncio.run(main())
+    assert cached[0].message.content == "cached"
+    other.close()
+    cache.close()
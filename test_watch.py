@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Test watch mode re-rendering of decks."""
+
+import json
+import shutil
+
+from slide_agent.generators.slide_generator import TEMPLATES_DIR
+from slide_agent.models import SlideDeck, SlideSpec, SlideType
+from slide_agent.watch import DeckWatcher
+from slide_agent.writers import DECK_ARTIFACT_NAME, FilesystemWriter
+
+
+def _make_deck(title: str, with_code: bool) -> SlideDeck:
+    slides = [SlideSpec(title=title, slide_type=SlideType.TITLE, content="Hi")]
+    if with_code:
+        slides.append(
+            SlideSpec(
+                title="Code", slide_type=SlideType.CODE, content="```python\nx = 1\n```"
+            )
+        )
+    else:
+        slides.append(
+            SlideSpec(title="Points", slide_type=SlideType.BULLETS, content="- One")
+        )
+    return SlideDeck(title=title, slides=slides)
+
+
+def test_only_affected_decks_are_rerendered(tmp_path):
+    """Template edits hit the decks using them; spec edits hit their deck."""
+    templates = tmp_path / "templates"
+    shutil.copytree(TEMPLATES_DIR, templates)
+    decks = tmp_path / "decks"
+    writer = FilesystemWriter(str(decks))
+    writer.write_deck_sync(_make_deck("Code Deck", True), str(decks / "code"))
+    writer.write_deck_sync(_make_deck("Text Deck", False), str(decks / "text"))
+
+    watcher = DeckWatcher([decks], templates_dir=templates)
+    assert watcher.start() == 2
+    assert watcher.poll() == []
+
+    code_template = templates / "code_slide.md.j2"
+    code_template.write_text(code_template.read_text() + "\n<!-- watched -->\n")
+    results = watcher.poll()
+    assert [r["deck_dir"] for r in results] == [str(decks / "code")]
+    assert results[0]["written"] and results[0]["seconds"] < 0.1
+    assert "<!-- watched -->" in (decks / "code" / "slides.md").read_text()
+    assert "<!-- watched -->" not in (decks / "text" / "slides.md").read_text()
+
+    artifact_file = decks / "text" / DECK_ARTIFACT_NAME
+    artifact = json.loads(artifact_file.read_text())
+    artifact["deck"]["slides"][1]["content"] = "- Edited by hand"
+    artifact_file.write_text(json.dumps(artifact))
+    results = watcher.poll()
+    assert [r["deck_dir"] for r in results] == [str(decks / "text")]
+    assert "Edited by hand" in (decks / "text" / "slides.md").read_text()
+
+    artifact_file.write_text("{broken")
+    assert "error" in watcher.poll()[0]
+
+
+def test_broken_template_is_reported_and_retried(tmp_path):
+    """A template with a syntax error yields an error result, not a crash."""
+    templates = tmp_path / "templates"
+    shutil.copytree(TEMPLATES_DIR, templates)
+    decks = tmp_path / "decks"
+    writer = FilesystemWriter(str(decks))
+    writer.write_deck_sync(_make_deck("Code Deck", True), str(decks / "code"))
+
+    watcher = DeckWatcher([decks], templates_dir=templates)
+    watcher.start()
+    code_template = templates / "code_slide.md.j2"
+    original = code_template.read_text()
+
+    code_template.write_text(original + "{% if %}")
+    [result] = watcher.poll()
+    assert "error" in result
+
+    code_template.write_text(original + "\n<!-- fixed -->\n")
+    [result] = watcher.poll()
+    assert "error" not in result
+    assert "<!-- fixed -->" in (decks / "code" / "slides.md").read_text()